@@ -9,6 +9,10 @@ class FavoriteInline(admin.TabularInline):
     extra = 0
     verbose_name = "Favori"
     verbose_name_plural = "Favoris"
+    autocomplete_fields = ("film",)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("film")
 
 
 @admin.register(Spectator)
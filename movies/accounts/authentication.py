@@ -0,0 +1,69 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from . import user_cache
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication without a user query on every request:
+    - safe requests to views declaring ``token_user_reads = True`` get a
+      TokenUser built from the signed claims (id, username, is_staff);
+    - other requests get the user from the cache, loaded at most once per
+      AUTH_USER_CACHE_TTL seconds.
+    Deactivating a user or changing their password or staff status evicts
+    them and revokes their outstanding access tokens (see accounts.user_cache).
+    Both need SHARED_CACHE, for every worker to see the revocations: without
+    it each request loads the user from the database. Staff-only views must
+    not declare ``token_user_reads``; use ``user_cache.is_staff`` for a
+    staff-only option of a claims-only view.
+    """
+
+    claims_only = False
+
+    def authenticate(self, request):
+        view = (getattr(request, "parser_context", None) or {}).get("view")
+        self.claims_only = (
+            request.method in SAFE_METHODS
+            and getattr(view, "token_user_reads", False)
+            and user_cache.shared_cache()
+        )
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        if user_cache.is_revoked(user_id, validated_token.get("iat", 0)):
+            raise AuthenticationFailed(
+                _("Token has been revoked"), code="token_revoked"
+            )
+
+        if self.claims_only:
+            return api_settings.TOKEN_USER_CLASS(validated_token)
+
+        user = user_cache.load_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
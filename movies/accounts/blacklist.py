@@ -0,0 +1,69 @@
+"""
+Cache-fronted lookups in simplejwt's refresh token blacklist, and a chunked
+purge of the expired outstanding and blacklisted tokens.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from .user_cache import shared_cache
+
+
+def _key(jti) -> str:
+    return f"accounts:blacklisted:{jti}"
+
+
+def remember(jti, exp, blacklisted: bool) -> None:
+    """
+    Cache the blacklist state of a token until it expires. "Not
+    blacklisted" is only cached with SHARED_CACHE, where a logout in any
+    process overwrites it, and for TOKEN_BLACKLIST_CACHE_TTL seconds at most.
+    """
+    timeout = int(exp - time.time())
+    if not blacklisted:
+        if not shared_cache():
+            return
+        timeout = min(timeout, getattr(settings, "TOKEN_BLACKLIST_CACHE_TTL", 300))
+    if timeout > 0:
+        cache.set(_key(jti), blacklisted, timeout)
+
+
+def is_blacklisted(jti, exp) -> bool:
+    """Whether a token is blacklisted, from the cache when possible."""
+    blacklisted = cache.get(_key(jti))
+    if blacklisted is None:
+        blacklisted = BlacklistedToken.objects.filter(token__jti=jti).exists()
+        remember(jti, exp, blacklisted)
+    return blacklisted
+
+
+def purge_expired_tokens(chunk_size=1000, pause=0.0, now=None) -> int:
+    """
+    Delete the expired outstanding tokens and their blacklist entries,
+    ``chunk_size`` at a time, walking the primary key so that each chunk is
+    a short transaction and no scan restarts from the beginning. Returns
+    the number of outstanding tokens deleted.
+    """
+    now = now or timezone.now()
+    deleted, last_id = 0, 0
+    while True:
+        ids = list(
+            OutstandingToken.objects.filter(id__gt=last_id, expires_at__lte=now)
+            .order_by("id")
+            .values_list("id", flat=True)[:chunk_size]
+        )
+        if not ids:
+            return deleted
+        BlacklistedToken.objects.filter(token_id__in=ids).delete()
+        OutstandingToken.objects.filter(id__in=ids).delete()
+        deleted += len(ids)
+        last_id = ids[-1]
+        if pause:
+            time.sleep(pause)
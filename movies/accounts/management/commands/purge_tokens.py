@@ -0,0 +1,21 @@
+from accounts.blacklist import purge_expired_tokens
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired outstanding and blacklisted refresh tokens in small "
+        "batches (schedule it, e.g. hourly from cron)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--sleep", type=float, default=0.0, help="seconds to pause between chunks"
+        )
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_tokens(
+            chunk_size=options["chunk_size"], pause=options["sleep"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Purged {deleted} expired tokens"))
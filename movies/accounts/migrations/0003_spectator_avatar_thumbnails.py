@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="spectator",
+            name="avatar_thumbnails",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
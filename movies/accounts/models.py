@@ -9,6 +9,8 @@ class Spectator(AbstractUser):
 
     bio = models.TextField(blank=True)
     avatar = models.ImageField(upload_to="spectator_avatars/", null=True, blank=True)
+    # size -> storage name of the WebP thumbnails (see services.avatars)
+    avatar_thumbnails = models.JSONField(default=dict, blank=True, editable=False)
     favorites = models.ManyToManyField(
         "manage_movies.Film",
         related_name="favorited_by",
@@ -1,5 +1,17 @@
 from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+    TokenVerifySerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import UntypedToken
+
+from . import blacklist, user_cache
+from .tokens import CachedRefreshToken
 
 User = get_user_model()
 
@@ -19,3 +31,71 @@ class RegisterSerializer(serializers.ModelSerializer):
             password=validated_data["password"],
         )
         return user
+
+
+def set_user_claims(token, user) -> None:
+    """Add the claims TokenUser reads, from the user as stored now."""
+    token["username"] = user.get_username()
+    token["is_staff"] = user.is_staff
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Token pair carrying the claims TokenUser reads (username, is_staff), so
+    read-only endpoints can authenticate without loading the user.
+    """
+
+    token_class = CachedRefreshToken
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        set_user_claims(token, user)
+        return token
+
+
+class CachedTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh reading the blacklist and the user through the cache, so that
+    repeated refreshes of a token rarely query the database. The new tokens
+    carry the user's current claims, not those of the refresh token: a
+    demoted staff member is no longer staff in the claims.
+    """
+
+    token_class = CachedRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        if user_id:
+            user = user_cache.load_user(user_id)
+            if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+                raise AuthenticationFailed(
+                    self.error_messages["no_active_account"], "no_active_account"
+                )
+            set_user_claims(refresh, user)
+
+        data = {"access": str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data["refresh"] = str(refresh)
+
+        return data
+
+
+class CachedTokenVerifySerializer(TokenVerifySerializer):
+    """Token verification reading the blacklist through the cache."""
+
+    def validate(self, attrs):
+        token = UntypedToken(attrs["token"])
+        jti = token.get(api_settings.JTI_CLAIM)
+        if jti and blacklist.is_blacklisted(jti, token["exp"]):
+            raise serializers.ValidationError(_("Token is blacklisted"))
+        return {}
@@ -0,0 +1,33 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Spectator
+from .user_cache import REVOKING_FIELDS, forget_user, revoke_tokens
+
+
+@receiver(pre_save, sender=Spectator)
+def detect_revoking_change(sender, instance, update_fields=None, **kwargs):
+    """Flag saves that change the password, the active or the staff status."""
+    instance._revoke_tokens = False
+    if instance.pk is None or (
+        update_fields is not None and not set(REVOKING_FIELDS) & set(update_fields)
+    ):
+        return
+    previous = (
+        Spectator.objects.filter(pk=instance.pk).values_list(*REVOKING_FIELDS).first()
+    )
+    current = tuple(getattr(instance, field) for field in REVOKING_FIELDS)
+    instance._revoke_tokens = previous is not None and previous != current
+
+
+@receiver(post_save, sender=Spectator)
+def invalidate_cached_user(sender, instance, created, **kwargs):
+    if getattr(instance, "_revoke_tokens", False):
+        revoke_tokens(instance.pk)
+    elif not created:
+        forget_user(instance.pk)
+
+
+@receiver(post_delete, sender=Spectator)
+def revoke_deleted_user(sender, instance, **kwargs):
+    revoke_tokens(instance.pk)
@@ -0,0 +1,124 @@
+import runpy
+import time
+from pathlib import Path
+
+import pytest
+from accounts import user_cache
+from accounts.authentication import CachedJWTAuthentication
+from accounts.models import Spectator
+from django.conf import settings as django_settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(settings):
+    settings.SHARED_CACHE = True
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _authenticate(token):
+    """Authenticate a GET to a claims-only view with a bearer token."""
+    request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+    view = type("View", (), {"token_user_reads": True})()
+    user, _ = CachedJWTAuthentication().authenticate(
+        Request(request, parser_context={"view": view})
+    )
+    return user
+
+
+def test_caches_and_forgets_users():
+    spectator = Spectator(id=7, username="ana")
+    user_cache.set_user(spectator)
+    assert user_cache.get_user(7).username == "ana"
+
+    user_cache.forget_user(7)
+    assert user_cache.get_user(7) is None
+
+
+def test_revocation_rejects_older_tokens():
+    user_cache.set_user(Spectator(id=7, username="ana"))
+    now = int(time.time())
+    assert not user_cache.is_revoked(7, now - 10)
+
+    user_cache.revoke_tokens(7)
+    assert user_cache.get_user(7) is None
+    assert user_cache.is_revoked(7, now - 10)
+    assert not user_cache.is_revoked(7, now + 1)
+    assert not user_cache.is_revoked(8, now - 10)
+
+
+def test_users_are_not_cached_without_a_shared_cache(settings):
+    settings.SHARED_CACHE = False
+    user_cache.set_user(Spectator(id=7, username="ana"))
+    assert user_cache.get_user(7) is None
+
+
+@pytest.mark.django_db
+def test_claims_only_needs_a_shared_cache(settings):
+    spectator = Spectator.objects.create_user("ana", password="x")
+    token = RefreshToken.for_user(spectator).access_token
+    assert isinstance(_authenticate(token), TokenUser)
+
+    settings.SHARED_CACHE = False
+    assert isinstance(_authenticate(token), Spectator)
+
+
+@pytest.mark.django_db
+def test_refresh_carries_the_current_staff_status():
+    spectator = Spectator.objects.create_user(
+        "ana", password="secret-pass", is_staff=True
+    )
+    client = APIClient()
+    tokens = client.post(
+        "/auth/login/", {"username": "ana", "password": "secret-pass"}
+    ).json()
+    assert AccessToken(tokens["access"])["is_staff"] is True
+
+    spectator.is_staff = False
+    spectator.save()
+    response = client.post("/auth/token/refresh/", {"refresh": tokens["refresh"]})
+    access = response.json()["access"]
+    assert AccessToken(access)["is_staff"] is False
+
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+    assert client.get("/export/films.csv").status_code == 403
+
+
+def _load_settings(monkeypatch, cache_url):
+    """Evaluate cinema/settings.py with CACHE_URL set to ``cache_url``."""
+    monkeypatch.setenv("CACHE_URL", cache_url)
+    return runpy.run_path(
+        str(Path(django_settings.BASE_DIR) / "cinema" / "settings.py")
+    )
+
+
+@pytest.mark.parametrize(
+    "cache_url, backend",
+    [
+        ("redis://cache:6379/0", "django.core.cache.backends.redis.RedisCache"),
+        ("db", "django.core.cache.backends.db.DatabaseCache"),
+    ],
+)
+def test_shared_cache_urls(monkeypatch, cache_url, backend):
+    loaded = _load_settings(monkeypatch, cache_url)
+    assert loaded["CACHES"]["default"]["BACKEND"] == backend
+    assert loaded["SHARED_CACHE"] is True
+
+
+def test_no_cache_url_means_no_shared_cache(monkeypatch):
+    loaded = _load_settings(monkeypatch, "")
+    assert "CACHES" not in loaded
+    assert loaded["SHARED_CACHE"] is False
+
+
+@pytest.mark.parametrize("cache_url", ["memcached://cache:11211", "cache:6379", "DB"])
+def test_unknown_cache_urls_are_rejected(monkeypatch, cache_url):
+    with pytest.raises(ImproperlyConfigured, match="CACHE_URL"):
+        _load_settings(monkeypatch, cache_url)
@@ -0,0 +1,131 @@
+import io
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from accounts import blacklist
+from accounts.models import Spectator
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_blacklisted_tokens_are_answered_from_the_cache():
+    blacklist.remember("abc", time.time() + 3600, True)
+    assert blacklist.is_blacklisted("abc", time.time() + 3600)
+
+
+def test_cache_entries_do_not_outlive_tokens(settings):
+    settings.SHARED_CACHE = True
+    settings.TOKEN_BLACKLIST_CACHE_TTL = 0
+    blacklist.remember("fresh", time.time() + 3600, False)
+    blacklist.remember("expired", time.time() - 1, True)
+    assert cache.get("accounts:blacklisted:fresh") is None
+    assert cache.get("accounts:blacklisted:expired") is None
+
+
+def test_not_blacklisted_is_only_cached_when_shared(settings):
+    settings.SHARED_CACHE = False
+    blacklist.remember("local", time.time() + 3600, False)
+    assert cache.get("accounts:blacklisted:local") is None
+
+    settings.SHARED_CACHE = True
+    blacklist.remember("shared", time.time() + 3600, False)
+    assert cache.get("accounts:blacklisted:shared") is False
+
+
+def _outstanding(user, jti, expires_at, blacklisted=False):
+    token = OutstandingToken.objects.create(
+        user=user,
+        jti=jti,
+        token=jti,
+        created_at=expires_at - timedelta(days=1),
+        expires_at=expires_at,
+    )
+    if blacklisted:
+        BlacklistedToken.objects.create(token=token)
+    return token
+
+
+@pytest.mark.django_db
+def test_purge_deletes_expired_tokens_only():
+    user = Spectator.objects.create_user("ana", password="x")
+    now = timezone.now()
+    for i in range(5):
+        _outstanding(user, f"old-{i}", now - timedelta(hours=1), blacklisted=i % 2)
+    _outstanding(user, "live", now + timedelta(hours=1))
+    _outstanding(user, "live-blacklisted", now + timedelta(hours=1), True)
+
+    assert blacklist.purge_expired_tokens(chunk_size=2, now=now) == 5
+    assert set(OutstandingToken.objects.values_list("jti", flat=True)) == {
+        "live",
+        "live-blacklisted",
+    }
+    assert list(BlacklistedToken.objects.values_list("token__jti", flat=True)) == [
+        "live-blacklisted"
+    ]
+
+
+@pytest.mark.django_db
+def test_purge_deletes_in_chunks(monkeypatch):
+    user = Spectator.objects.create_user("ana", password="x")
+    now = timezone.now()
+    for i in range(5):
+        _outstanding(user, f"old-{i}", now - timedelta(hours=1))
+    remaining = []
+    monkeypatch.setattr(
+        blacklist,
+        "time",
+        SimpleNamespace(
+            sleep=lambda seconds: remaining.append(OutstandingToken.objects.count())
+        ),
+    )
+    assert blacklist.purge_expired_tokens(chunk_size=2, pause=0.1, now=now) == 5
+    # A pause after each chunk.
+    assert remaining == [3, 1, 0]
+
+
+@pytest.mark.django_db
+def test_purge_tokens_command():
+    user = Spectator.objects.create_user("ana", password="x")
+    _outstanding(user, "old", timezone.now() - timedelta(hours=1), True)
+    out = io.StringIO()
+    call_command("purge_tokens", "--chunk-size=10", stdout=out)
+    assert "Purged 1 expired tokens" in out.getvalue()
+    assert not OutstandingToken.objects.exists()
+
+
+@pytest.mark.django_db
+def test_logged_out_refresh_tokens_are_refused(settings):
+    settings.SHARED_CACHE = True
+    Spectator.objects.create_user("ana", password="secret-pass")
+    client = APIClient()
+    tokens = client.post(
+        "/auth/login/", {"username": "ana", "password": "secret-pass"}
+    ).json()
+    refresh = tokens["refresh"]
+    assert client.post("/auth/token/refresh/", {"refresh": refresh}).status_code == 200
+    jti = RefreshToken(refresh)["jti"]
+    assert cache.get(f"accounts:blacklisted:{jti}") is False
+
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+    assert client.post("/auth/logout/", {"refresh": refresh}).status_code == 205
+
+    response = client.post("/auth/token/refresh/", {"refresh": refresh})
+    assert response.status_code == 401
+    response = client.post("/auth/token/verify/", {"token": refresh})
+    assert response.status_code == 400
@@ -0,0 +1,96 @@
+"""
+Cache of the spectators authenticated by CachedJWTAuthentication, and the
+revocation markers rejecting access tokens issued before a sensitive change.
+Users are only cached with SHARED_CACHE: in a per-process cache, a worker
+would never see another one forget a user it changed.
+Deliberately free of simplejwt imports, so signal handlers can use it.
+"""
+
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+# Fields whose change revokes the access tokens already issued to a user.
+REVOKING_FIELDS = ("password", "is_active", "is_staff")
+
+
+def _user_key(user_id) -> str:
+    return f"accounts:user:{user_id}"
+
+
+def _revoked_key(user_id) -> str:
+    return f"accounts:revoked:{user_id}"
+
+
+def shared_cache() -> bool:
+    """Whether every worker and command shares the cache (SHARED_CACHE)."""
+    return getattr(settings, "SHARED_CACHE", False)
+
+
+def get_user(user_id):
+    """The cached user, or None."""
+    if not shared_cache():
+        return None
+    return cache.get(_user_key(user_id))
+
+
+def set_user(user) -> None:
+    if not shared_cache():
+        return
+    ttl = getattr(settings, "AUTH_USER_CACHE_TTL", 60)
+    cache.set(_user_key(user.pk), user, ttl)
+
+
+def load_user(user_id):
+    """The user from the cache, else from the database (None if missing)."""
+    user = get_user(user_id)
+    if user is None:
+        user = get_user_model().objects.filter(pk=user_id).first()
+        if user is not None:
+            set_user(user)
+    return user
+
+
+def is_staff(user) -> bool:
+    """
+    Whether an authenticated user is staff now. A TokenUser, built from
+    the claims of its access token, is checked against the stored user.
+    """
+    if not isinstance(user, get_user_model()):
+        user = load_user(user.pk)
+    return user is not None and user.is_staff
+
+
+def forget_user(user_id) -> None:
+    """Drop a user from the cache."""
+    cache.delete(_user_key(user_id))
+
+
+def revoke_tokens(user_id) -> None:
+    """
+    Forget a user and reject the access tokens issued to them until now.
+    The marker outlives every such token, then expires on its own: the
+    access tokens refreshed afterwards carry the user's current claims.
+    """
+    forget_user(user_id)
+    lifetime = getattr(settings, "SIMPLE_JWT", {}).get(
+        "ACCESS_TOKEN_LIFETIME", timedelta(minutes=5)
+    )
+    cache.set(
+        _revoked_key(user_id),
+        int(time.time()),
+        timeout=int(lifetime.total_seconds()) + 1,
+    )
+
+
+def is_revoked(user_id, issued_at) -> bool:
+    """
+    Whether a token issued at ``issued_at`` (epoch seconds) was revoked.
+    iat has a one second resolution: tokens issued during the second of
+    the revocation are still accepted.
+    """
+    revoked_at = cache.get(_revoked_key(user_id))
+    return revoked_at is not None and issued_at < revoked_at
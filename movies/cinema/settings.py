@@ -14,6 +14,7 @@ import os
 from datetime import timedelta
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -43,11 +44,14 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "rest_framework",
+    "rest_framework_simplejwt.token_blacklist",
     "accounts",
     "manage_movies",
 ]
 
 MIDDLEWARE = [
+    # First, so its timings cover the whole chain; removed when disabled.
+    "manage_movies.instrumentation.InstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -98,6 +102,35 @@ DATABASES = {
     }
 }
 
+# Cache shared by every worker and management command: CACHE_URL set to
+# redis://host:6379/0 (needs the redis package, the "redis" extra) or to "db"
+# for a table created by `python manage.py createcachetable`. Without one,
+# each process caches on its own and SHARED_CACHE is False: what relies on
+# other processes seeing cache writes (claims-only authentication, cached
+# users and blacklist answers, autocomplete indexes) uses the database. Any
+# other value is refused rather than silently falling back to a per-process
+# cache that the code would take for a shared one.
+CACHE_URL = os.getenv("CACHE_URL", "")
+if CACHE_URL.startswith(("redis://", "rediss://")):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+        }
+    }
+elif CACHE_URL == "db":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "cinema_cache",
+        }
+    }
+elif CACHE_URL:
+    raise ImproperlyConfigured(
+        f"Unsupported CACHE_URL {CACHE_URL!r}: expected redis://, rediss:// or db."
+    )
+SHARED_CACHE = bool(CACHE_URL)
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -134,6 +167,43 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+# Uploaded files (spectator avatars and their thumbnails)
+MEDIA_URL = "media/"
+MEDIA_ROOT = BASE_DIR / "media"
+
+# Processes rendering avatar thumbnails; 0 renders them in the request.
+AVATAR_WORKERS = int(os.getenv("AVATAR_WORKERS", "2"))
+
+# Trending films (see manage_movies.services.trending): list size, decay
+# half-life and how long the list is served from cache between refreshes.
+TRENDING = {
+    "SIZE": int(os.getenv("TRENDING_SIZE", "50")),
+    "HALF_LIFE_HOURS": float(os.getenv("TRENDING_HALF_LIFE_HOURS", "24")),
+    "CACHE_TTL": int(os.getenv("TRENDING_CACHE_TTL", "900")),
+}
+
+# Seconds facet counts of the film list are cached per filter set.
+FACETS_CACHE_TTL = int(os.getenv("FACETS_CACHE_TTL", "60"))
+
+# Most ids a ?ids= multi-get of films or authors may ask for.
+MULTI_GET_MAX_IDS = int(os.getenv("MULTI_GET_MAX_IDS", "100"))
+
+# Autocomplete (see manage_movies.services.autocomplete): result counts and
+# the in-memory index of each worker, kept in sync through the cache. It
+# needs SHARED_CACHE; without it, or with AUTOCOMPLETE_INDEX=False, every
+# query goes to the database.
+AUTOCOMPLETE = {
+    "LIMIT": int(os.getenv("AUTOCOMPLETE_LIMIT", "10")),
+    "MAX_LIMIT": int(os.getenv("AUTOCOMPLETE_MAX_LIMIT", "50")),
+    "INDEX": os.getenv("AUTOCOMPLETE_INDEX", "True") == "True",
+}
+
+# Memory-mapped catalogue snapshot serving film reads (see
+# manage_movies.services.snapshot), written by fill_db, generate_data and
+# snapshot_catalogue. Off unless set to a path every worker can read: its
+# change marker lives next to it.
+CATALOGUE_SNAPSHOT = os.getenv("CATALOGUE_SNAPSHOT", "")
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -143,18 +213,58 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # JWT without a user query per request, see accounts.authentication
+        "accounts.authentication.CachedJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
     ),
+    # orjson-backed JSON, falls back to the stdlib when orjson is not installed
+    "DEFAULT_RENDERER_CLASSES": (
+        "manage_movies.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "manage_movies.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
 }
 AUTH_USER_MODEL = "accounts.Spectator"
 
+# Per-request query / latency instrumentation, see manage_movies.instrumentation
+INSTRUMENTATION = {
+    "ENABLED": os.getenv("INSTRUMENTATION", "False") == "True",
+    "SERVER_TIMING": DEBUG,
+    "SLOW_REQUEST_MS": int(os.getenv("SLOW_REQUEST_MS", "500")),
+    "SLOW_QUERY_COUNT": 3,
+    "METRICS_TOKEN": os.getenv("METRICS_TOKEN"),
+}
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "manage_movies.instrumentation": {"handlers": ["console"], "level": "INFO"},
+    },
+}
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=59),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
+    "TOKEN_OBTAIN_SERIALIZER": "accounts.serializers.ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "accounts.serializers.CachedTokenRefreshSerializer",
+    "TOKEN_VERIFY_SERIALIZER": "accounts.serializers.CachedTokenVerifySerializer",
 }
 
+# Seconds a spectator stays cached by CachedJWTAuthentication (only with
+# SHARED_CACHE: a per-process cache would miss changes made elsewhere).
+AUTH_USER_CACHE_TTL = int(os.getenv("AUTH_USER_CACHE_TTL", "60"))
+# Seconds a refresh token is cached as not blacklisted, with SHARED_CACHE only
+# (blacklisted tokens stay cached until they expire). Purge expired tokens
+# with purge_tokens.
+TOKEN_BLACKLIST_CACHE_TTL = int(os.getenv("TOKEN_BLACKLIST_CACHE_TTL", "300"))
+
 LOGIN_REDIRECT_URL = "/api/"
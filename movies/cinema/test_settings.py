@@ -0,0 +1,14 @@
+import os
+
+from .settings import *  # noqa: F401,F403
+
+# The test run needs a secret key even without a .env: simplejwt reads it
+# when the token blacklist app loads.
+SECRET_KEY = SECRET_KEY or "test-secret-key-long-enough-for-hs256"  # noqa: F405
+
+# Database tests run on in-memory SQLite unless TEST_DATABASE=postgres asks
+# for the configured PostgreSQL server.
+if os.getenv("TEST_DATABASE", "sqlite") == "sqlite":
+    DATABASES = {
+        "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+    }
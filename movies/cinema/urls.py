@@ -15,6 +15,8 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
@@ -23,4 +25,4 @@ urlpatterns = [
     path("", include("manage_movies.urls")),
     path("auth/", include("accounts.urls", namespace="accounts")),
     path("api-auth/", include("rest_framework.urls", namespace="rest_framework")),
-]
+] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
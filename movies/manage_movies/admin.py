@@ -3,9 +3,12 @@ from datetime import date
 from django.contrib import admin
 from django.contrib.contenttypes.admin import GenericTabularInline
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.contenttypes.prefetch import GenericPrefetch
+from django.db.models import Exists, OuterRef
 from django.utils.html import format_html
 
 from .models import Author, Film, Genre, Rating
+from .paginators import EstimatedCountPaginator
 
 # ——— Inlines —————————————————————————————————————————————————————————————————
 
@@ -20,6 +23,10 @@ class FilmInline(admin.TabularInline):
     verbose_name = "Film"
     verbose_name_plural = "Films"
     show_change_link = True
+    autocomplete_fields = ("film",)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("film")
 
 
 class RatingInline(GenericTabularInline):
@@ -33,10 +40,16 @@ class RatingInline(GenericTabularInline):
     extra = 0
     show_change_link = True
 
+    autocomplete_fields = ("spectator",)
+
     def get_queryset(self, request):
         qs = super().get_queryset(request)
         film_type = ContentType.objects.get_for_model(Film)
-        return qs.filter(content_type=film_type)
+        return (
+            qs.filter(content_type=film_type)
+            .select_related("spectator")
+            .prefetch_related("content_object")
+        )
 
 
 class AuthorInline(admin.TabularInline):
@@ -45,6 +58,10 @@ class AuthorInline(admin.TabularInline):
     verbose_name = "Author"
     verbose_name_plural = "Authors"
     show_change_link = True
+    autocomplete_fields = ("author",)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("author")
 
 
 # ——— Filters ————————————————————————————————————————————————————————————————
@@ -65,10 +82,13 @@ class HasFilmsFilter(admin.SimpleListFilter):
         )
 
     def queryset(self, request, queryset):
+        has_films = Exists(
+            Film.authors.through.objects.filter(author_id=OuterRef("pk"))
+        )
         if self.value() == "yes":
-            return queryset.filter(films__isnull=False).distinct()
+            return queryset.filter(has_films)
         if self.value() == "no":
-            return queryset.filter(films__isnull=True)
+            return queryset.filter(~has_films)
         return queryset
 
 
@@ -85,6 +105,9 @@ class AuthorAdmin(admin.ModelAdmin):
     search_fields = ("name",)
     list_filter = (HasFilmsFilter,)
     inlines = [FilmInline]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
 
     def age(self, obj):
         """Calculate the age of the author based on their birth date."""
@@ -124,10 +147,14 @@ class FilmAdmin(admin.ModelAdmin):
         "show_revenue_in_millions",
     )
     search_fields = ("title", "description")
-    list_filter = ("created_at", "rating", "status")
-    date_hierarchy = "created_at"
+    list_filter = ("created_at", "rating", "status", "archived")
     inlines = [AuthorInline, RatingInline]
     exclude = ("authors",)
+    # No date_hierarchy: its year/month drill-down runs a DISTINCT over
+    # created_at on every page load.
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
 
     def show_revenue_in_millions(self, obj):
         """Format the box office revenue in millions of dollars."""
@@ -160,6 +187,27 @@ class RatingAdmin(admin.ModelAdmin):
     )
     search_fields = ("spectator__username", "comment")
     list_filter = ("score", "content_type")
+    list_select_related = ("spectator", "content_type")
+    autocomplete_fields = ("spectator",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+
+    def get_queryset(self, request):
+        """Resolve rating targets with one query per content type."""
+        return (
+            super()
+            .get_queryset(request)
+            .prefetch_related(
+                GenericPrefetch(
+                    "content_object",
+                    [
+                        Film.all_objects.only("id", "title"),
+                        Author.objects.only("id", "name"),
+                    ],
+                )
+            )
+        )
 
     def target(self, obj):
         """
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ManageMoviesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "manage_movies"
+
+    def ready(self):
+        from . import signals  # noqa: F401
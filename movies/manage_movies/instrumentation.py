@@ -0,0 +1,284 @@
+import heapq
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "ENABLED": False,
+    # Server-Timing response header, meant for debugging.
+    "SERVER_TIMING": False,
+    # Requests slower than this are logged with their slowest queries.
+    "SLOW_REQUEST_MS": 500,
+    "SLOW_QUERY_COUNT": 3,
+    # When set, /metrics/ requires "Authorization: Bearer <token>".
+    "METRICS_TOKEN": None,
+}
+
+# Request latency histogram buckets, in seconds.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_current: ContextVar[Optional["RequestMetrics"]] = ContextVar(
+    "request_metrics", default=None
+)
+
+
+def get_config() -> Dict[str, Any]:
+    """Return the INSTRUMENTATION setting merged over the defaults."""
+    return {**DEFAULTS, **getattr(settings, "INSTRUMENTATION", {})}
+
+
+class RequestMetrics:
+    """Costs collected while one request is being handled."""
+
+    def __init__(self, slow_query_count: int = 3) -> None:
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.slow_query_count = slow_query_count
+        # Min-heap of (duration, seq, sql, params): the slowest queries.
+        self.slowest: List[Tuple[float, int, str, Any]] = []
+
+    def record_query(self, sql: str, params: Any, duration: float) -> None:
+        """Account for one executed query."""
+        self.query_count += 1
+        self.db_time += duration
+        if self.slow_query_count <= 0:
+            return
+        entry = (duration, self.query_count, sql, params)
+        if len(self.slowest) < self.slow_query_count:
+            heapq.heappush(self.slowest, entry)
+        elif duration > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    def slowest_queries(self) -> List[Tuple[float, str, Any]]:
+        """Return the recorded slowest queries, slowest first."""
+        return [
+            (duration, sql, params)
+            for duration, _, sql, params in sorted(self.slowest, reverse=True)
+        ]
+
+    def server_timing(self, total: float) -> str:
+        """Render the Server-Timing header value (durations in ms)."""
+        return ", ".join(
+            [
+                f'db;dur={self.db_time * 1000:.1f};desc="{self.query_count} queries"',
+                f"serialize;dur={self.serialize_time * 1000:.1f}",
+                f"total;dur={total * 1000:.1f}",
+            ]
+        )
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper timing queries for the current request.
+    Outside an instrumented request it only costs a context variable lookup.
+    """
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.record_query(sql, params, time.perf_counter() - start)
+
+
+def install_query_recorder(sender=None, connection=None, **kwargs) -> None:
+    """Add the query recorder to a database connection, once."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def timed_serialization() -> Iterator[None]:
+    """Count the time spent in the block as serialization time."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serialize_time += time.perf_counter() - start
+
+
+class MetricsRegistry:
+    """
+    In-process aggregates per view, rendered in the Prometheus text format.
+    Each worker process keeps its own registry.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.series: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+
+    def observe(
+        self,
+        view: str,
+        method: str,
+        status: int,
+        metrics: RequestMetrics,
+        duration: float,
+        size: Optional[int],
+    ) -> None:
+        """Add one finished request to the aggregates."""
+        key = (view, method, str(status))
+        with self.lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = {
+                    "requests": 0,
+                    "duration": 0.0,
+                    "buckets": [0] * len(BUCKETS),
+                    "queries": 0,
+                    "db": 0.0,
+                    "serialize": 0.0,
+                    "bytes": 0,
+                }
+            series["requests"] += 1
+            series["duration"] += duration
+            for index, bound in enumerate(BUCKETS):
+                if duration <= bound:
+                    series["buckets"][index] += 1
+            series["queries"] += metrics.query_count
+            series["db"] += metrics.db_time
+            series["serialize"] += metrics.serialize_time
+            series["bytes"] += size or 0
+
+    def render(self) -> str:
+        """Render every series in the Prometheus text exposition format."""
+        with self.lock:
+            series = sorted(
+                (key, {**values, "buckets": list(values["buckets"])})
+                for key, values in self.series.items()
+            )
+        lines = []
+        counters = [
+            ("http_requests_total", "requests", "counter", "Handled requests."),
+            ("db_queries_total", "queries", "counter", "Executed SQL queries."),
+            ("db_seconds_total", "db", "counter", "Time spent in SQL queries."),
+            (
+                "serialize_seconds_total",
+                "serialize",
+                "counter",
+                "Time spent rendering responses.",
+            ),
+            ("response_bytes_total", "bytes", "counter", "Response body bytes."),
+        ]
+        for name, field, kind, help_text in counters:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            for key, values in series:
+                lines.append(f"{name}{{{_labels(key)}}} {values[field]}")
+
+        name = "http_request_duration_seconds"
+        lines += [f"# HELP {name} Request latency.", f"# TYPE {name} histogram"]
+        for key, values in series:
+            labels = _labels(key)
+            for bound, count in zip(BUCKETS, values["buckets"]):
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {values["requests"]}')
+            lines.append(f"{name}_sum{{{labels}}} {values['duration']}")
+            lines.append(f"{name}_count{{{labels}}} {values['requests']}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Forget every series."""
+        with self.lock:
+            self.series = {}
+
+
+def _labels(key: Tuple[str, str, str]) -> str:
+    """Format the (view, method, status) labels of a series."""
+    view, method, status = key
+    view = view.replace("\\", "\\\\").replace('"', '\\"')
+    return f'view="{view}",method="{method}",status="{status}"'
+
+
+registry = MetricsRegistry()
+
+
+class InstrumentationMiddleware:
+    """
+    Records the query count, database time, serialization time, latency and
+    response size of every request. Adds a Server-Timing header when
+    configured, feeds /metrics/ and logs slow requests with their slowest
+    queries. Disabled, it is removed from the middleware chain entirely.
+
+    Streaming responses are measured up to the start of the stream.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response) -> None:
+        self.config = get_config()
+        if not self.config["ENABLED"]:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        connection_created.connect(install_query_recorder)
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection=connection)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics = RequestMetrics(self.config["SLOW_QUERY_COUNT"])
+        token = _current.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, response, metrics)
+        return response
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics(self.config["SLOW_QUERY_COUNT"])
+        token = _current.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, response, metrics)
+        return response
+
+    def finish(self, request, response, metrics: RequestMetrics) -> None:
+        """Publish the metrics of a handled request."""
+        total = time.perf_counter() - metrics.started
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match else "unresolved"
+        size = None if response.streaming else len(response.content)
+        registry.observe(
+            view, request.method, response.status_code, metrics, total, size
+        )
+        if self.config["SERVER_TIMING"]:
+            response["Server-Timing"] = metrics.server_timing(total)
+        if total * 1000 >= self.config["SLOW_REQUEST_MS"]:
+            logger.warning(
+                "Slow request %s %s (%s): %.1f ms, %d queries in %.1f ms%s",
+                request.method,
+                request.get_full_path(),
+                view,
+                total * 1000,
+                metrics.query_count,
+                metrics.db_time * 1000,
+                "".join(
+                    f"\n  {duration * 1000:.1f} ms: {sql} {params!r}"
+                    for duration, sql, params in metrics.slowest_queries()
+                ),
+            )
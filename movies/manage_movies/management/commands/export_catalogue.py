@@ -0,0 +1,43 @@
+import sys
+
+from django.core.management.base import BaseCommand
+from manage_movies.services.catalogue_export import (
+    EXPORT_COLUMNS,
+    FORMATS,
+    stream_export,
+)
+
+
+class Command(BaseCommand):
+    help = "Stream a catalogue table to a file or stdout as NDJSON or CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument("table", choices=sorted(EXPORT_COLUMNS))
+        parser.add_argument("--format", choices=FORMATS, default="ndjson")
+        parser.add_argument("--output", help="output file (default: stdout)")
+        parser.add_argument("--gzip", action="store_true", help="gzip the output")
+        parser.add_argument(
+            "--after", type=int, help="resume after this id (last exported id)"
+        )
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        blocks = stream_export(
+            options["table"],
+            options["format"],
+            after=options["after"],
+            compress=options["gzip"],
+            chunk_size=options["chunk_size"],
+        )
+        output = options["output"]
+        out = open(output, "wb") if output else sys.stdout.buffer
+        try:
+            for block in blocks:
+                out.write(block)
+        finally:
+            if output:
+                out.close()
+        if output:
+            self.stdout.write(
+                self.style.SUCCESS(f"Exported {options['table']} to {output}")
+            )
@@ -1,5 +1,9 @@
+from django.conf import settings
 from django.core.management.base import BaseCommand
 from manage_movies.models import Author, Film, Genre
+from manage_movies.services import image_mirror
+from manage_movies.services.snapshot import write_snapshot
+from manage_movies.services.stats import refresh_stats
 from manage_movies.services.tmdb_client import TMDbClient
 from manage_movies.utils.utils import format_date
 
@@ -7,10 +11,23 @@ from manage_movies.utils.utils import format_date
 class Command(BaseCommand):
     help = "Fill the database with sample data"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--skip-images", action="store_true", help="do not mirror TMDb images"
+        )
+        parser.add_argument(
+            "--refresh-images",
+            action="store_true",
+            help="revalidate images mirrored before",
+        )
+        parser.add_argument("--image-workers", type=int, default=8)
+
     def handle(self, *args, **kwargs):
         tmdb_client = TMDbClient()
+        # TMDb image paths, mirrored once every film is created.
+        film_images, author_images = {}, {}
         # Clear existing data
-        Film.objects.all().delete()
+        Film.all_objects.all().delete()
         Author.objects.all().delete()
         Genre.objects.all().delete()
 
@@ -46,6 +63,7 @@ class Command(BaseCommand):
                     tmdb_id=director_data["id"],
                 )
                 authors.append(author)
+                author_images[author.pk] = author_details.get("profile_path")
             movie_detais = tmdb_client.fetch_movie_details(movie_data["id"])
             if created:
                 self.stdout.write(self.style.SUCCESS(f"Created author: {author.name}"))
@@ -57,7 +75,7 @@ class Command(BaseCommand):
                 rating = Film.RatingChoices.GOOD
             else:
                 rating = Film.RatingChoices.EXCELLENT
-            film, created = Film.objects.get_or_create(
+            film, created = Film.all_objects.get_or_create(
                 title=movie_data["title"],
                 description=movie_data.get("overview", ""),
                 release_date=movie_data.get("release_date"),
@@ -74,6 +92,10 @@ class Command(BaseCommand):
                 self.stdout.write(
                     self.style.WARNING(f"Film already exists: {film.title}")
                 )
+            film_images[film.pk] = (
+                movie_data.get("poster_path"),
+                movie_data.get("backdrop_path"),
+            )
             film.authors.set(authors)
             genre_objs = [
                 Genre.objects.get(tmdb_id=genre_id)
@@ -81,4 +103,47 @@ class Command(BaseCommand):
             ]
             film.genres.set(genre_objs)
 
+        if not kwargs["skip_images"]:
+            self.mirror_images(film_images, author_images, kwargs)
+        refresh_stats()
+        if settings.CATALOGUE_SNAPSHOT:
+            count = write_snapshot()
+            self.stdout.write(self.style.SUCCESS(f"Snapshot of {count} films written"))
         self.stdout.write(self.style.SUCCESS("Database filled with sample data"))
+
+    def mirror_images(self, film_images, author_images, options):
+        """Mirror posters, backdrops and profiles concurrently, then save paths."""
+        mirror = image_mirror.ImageMirror(
+            workers=options["image_workers"], refresh=options["refresh_images"]
+        )
+        posters = mirror.mirror(
+            (poster for poster, _ in film_images.values()), image_mirror.POSTER_SIZE
+        )
+        backdrops = mirror.mirror(
+            (backdrop for _, backdrop in film_images.values()),
+            image_mirror.BACKDROP_SIZE,
+        )
+        profiles = mirror.mirror(author_images.values(), image_mirror.PROFILE_SIZE)
+
+        # Images that could not be mirrored keep the copy mirrored before.
+        films = list(
+            Film.all_objects.filter(pk__in=film_images).only(
+                "id", "poster_path", "backdrop_path"
+            )
+        )
+        for film in films:
+            poster, backdrop = film_images[film.pk]
+            film.poster_path = posters.get(poster, film.poster_path)
+            film.backdrop_path = backdrops.get(backdrop, film.backdrop_path)
+        Film.all_objects.bulk_update(
+            films, ["poster_path", "backdrop_path"], batch_size=500
+        )
+        authors = list(
+            Author.objects.filter(pk__in=author_images).only("id", "profile_path")
+        )
+        for author in authors:
+            author.profile_path = profiles.get(
+                author_images[author.pk], author.profile_path
+            )
+        Author.objects.bulk_update(authors, ["profile_path"], batch_size=500)
+        self.stdout.write(self.style.SUCCESS(f"Images: {mirror.stats}"))
@@ -0,0 +1,70 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from manage_movies.services import autocomplete
+from manage_movies.services.snapshot import write_snapshot
+from manage_movies.services.stats import refresh_stats
+from manage_movies.services.synthetic_data import seed_catalogue
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic catalogue for load testing: films, authors, "
+        "spectators, favorites and ratings with realistic distributions"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--films", type=int, default=10_000)
+        parser.add_argument("--authors", type=int, help="default: films / 10")
+        parser.add_argument(
+            "--spectators", type=int, help="default: films / 10, at least 100"
+        )
+        parser.add_argument("--favorites", type=int, help="default: --films")
+        parser.add_argument("--ratings", type=int, help="default: --films")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--chunk-size", type=int, default=10_000)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=min(8, os.cpu_count() or 1),
+            help="worker processes (PostgreSQL only)",
+        )
+        parser.add_argument("--skip-stats", action="store_true")
+
+    def handle(self, *args, **options):
+        counts = [
+            options[name]
+            for name in ("films", "authors", "spectators", "favorites", "ratings")
+        ]
+        if any(count is not None and count < 0 for count in counts):
+            raise CommandError("Counts must be positive.")
+
+        start = time.perf_counter()
+        created = seed_catalogue(
+            films=options["films"],
+            authors=options["authors"],
+            spectators=options["spectators"],
+            favorites=options["favorites"],
+            ratings=options["ratings"],
+            seed=options["seed"],
+            chunk_size=options["chunk_size"],
+            workers=options["workers"],
+            progress=lambda step: self.stdout.write(
+                f"{time.perf_counter() - start:7.1f}s  {step}"
+            ),
+        )
+        # COPY and bulk inserts send no signals.
+        autocomplete.invalidate()
+        if not options["skip_stats"]:
+            refresh_stats()
+        if settings.CATALOGUE_SNAPSHOT:
+            written = write_snapshot()
+            self.stdout.write(f"Snapshot of {written} films written")
+        summary = ", ".join(f"{count} {name}" for name, count in created.items())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {summary} in {time.perf_counter() - start:.1f}s"
+            )
+        )
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from manage_movies.services.stats import refresh_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute the precomputed statistics served under /stats/"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--blocking",
+            action="store_true",
+            help="refresh without CONCURRENTLY (faster, blocks readers)",
+        )
+
+    def handle(self, *args, **options):
+        refresh_stats(concurrently=not options["blocking"])
+        self.stdout.write(self.style.SUCCESS("Statistics refreshed"))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from manage_movies.services.trending import refresh_trending
+
+
+class Command(BaseCommand):
+    help = (
+        "Rank trending films from the recent rating and favorite counters and "
+        "cache the list served under /films/trending/ (schedule it, e.g. every "
+        "5 minutes from cron)"
+    )
+
+    def handle(self, *args, **options):
+        films = refresh_trending()
+        self.stdout.write(self.style.SUCCESS(f"{len(films)} trending films cached"))
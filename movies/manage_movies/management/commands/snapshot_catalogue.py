@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from manage_movies.services.snapshot import is_stale, write_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the memory-mapped catalogue snapshot serving film reads (run it "
+        "after each import; workers pick the new file up within a second)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path", help="snapshot file (default: the CATALOGUE_SNAPSHOT setting)"
+        )
+        parser.add_argument(
+            "--if-stale",
+            action="store_true",
+            help="only write it when the catalogue changed since the last one "
+            "(e.g. every minute from cron)",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"] or settings.CATALOGUE_SNAPSHOT
+        if not path:
+            raise CommandError("CATALOGUE_SNAPSHOT is empty: snapshots are disabled.")
+        if options["if_stale"] and not is_stale(path):
+            self.stdout.write("Snapshot up to date")
+            return
+        count = write_snapshot(path)
+        self.stdout.write(self.style.SUCCESS(f"Snapshot of {count} films written"))
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from manage_movies.services.tmdb_stub import TMDbStub, make_server
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve a local TMDb emulator with a synthetic catalogue, optional "
+        "latency, error rate and 429 rate limiting"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--movies", type=int, default=10_000)
+        parser.add_argument("--directors", type=int, help="default: one per ten movies")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--latency-ms", type=float, default=0)
+        parser.add_argument("--jitter-ms", type=float, default=0)
+        parser.add_argument(
+            "--error-rate", type=float, default=0.0, help="share of 500 responses"
+        )
+        parser.add_argument(
+            "--rate-limit", type=float, help="requests per second before 429s"
+        )
+        parser.add_argument("--verbose-log", action="store_true")
+
+    def handle(self, *args, **options):
+        stub = TMDbStub(
+            movies=options["movies"],
+            directors=options["directors"],
+            seed=options["seed"],
+            latency_ms=options["latency_ms"],
+            jitter_ms=options["jitter_ms"],
+            error_rate=options["error_rate"],
+            rate_limit=options["rate_limit"],
+        )
+        server = make_server(
+            stub, options["host"], options["port"], verbose=options["verbose_log"]
+        )
+        host, port = server.server_address[:2]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"TMDb stub serving {stub.movies} movies, "
+                f"point the client at it with TMDB_BASE_URL=http://{host}:{port}/3"
+            )
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write(f"Stub stats: {stub.stats}")
@@ -0,0 +1,182 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:36
+
+from django.db import migrations, models
+
+# The statistics SELECTs as of this migration; services.stats keeps the
+# current ones to refresh the SQLite tables.
+YEAR_SQL = {
+    "postgresql": "CAST(EXTRACT(YEAR FROM f.release_date) AS INTEGER)",
+    "sqlite": "CAST(strftime('%Y', f.release_date) AS INTEGER)",
+}
+
+FINANCIALS_SQL = """
+    COUNT(*) AS film_count,
+    CAST(SUM(f.budget) AS BIGINT) AS total_budget,
+    CAST(SUM(f.box_office) AS BIGINT) AS total_box_office,
+    CAST(SUM(CASE WHEN f.budget > 0 AND f.box_office IS NOT NULL
+                  THEN f.box_office END) AS DOUBLE PRECISION)
+      / SUM(CASE WHEN f.budget > 0 AND f.box_office IS NOT NULL
+                 THEN f.budget END) AS roi
+"""
+
+# name -> (unique key column, SELECT statement)
+STATS_VIEWS = {
+    "manage_movies_stats_year": (
+        "year",
+        f"""
+        SELECT {{year}} AS year, {FINANCIALS_SQL}
+        FROM manage_movies_film f
+        GROUP BY {{year}}
+        """,
+    ),
+    "manage_movies_stats_genre": (
+        "genre_id",
+        f"""
+        SELECT g.id AS genre_id, g.name AS genre_name, {FINANCIALS_SQL}
+        FROM manage_movies_film f
+        JOIN manage_movies_film_genres fg ON fg.film_id = f.id
+        JOIN manage_movies_genre g ON g.id = fg.genre_id
+        GROUP BY g.id, g.name
+        """,
+    ),
+    "manage_movies_stats_director": (
+        "author_id",
+        f"""
+        SELECT a.id AS author_id, a.name AS author_name, {FINANCIALS_SQL}
+        FROM manage_movies_film f
+        JOIN manage_movies_film_authors fa ON fa.film_id = f.id
+        JOIN manage_movies_author a ON a.id = fa.author_id
+        GROUP BY a.id, a.name
+        """,
+    ),
+    "manage_movies_stats_rating": (
+        "key",
+        """
+        SELECT f.rating || '/' || f.status AS key,
+               f.rating AS rating,
+               f.status AS status,
+               COUNT(*) AS film_count,
+               CAST(COALESCE(SUM(r.rating_count), 0) AS INTEGER) AS rating_count,
+               CAST(SUM(r.score_sum) AS DOUBLE PRECISION)
+                 / NULLIF(SUM(r.rating_count), 0) AS average_score
+        FROM manage_movies_film f
+        LEFT JOIN (
+            SELECT object_id, COUNT(*) AS rating_count, SUM(score) AS score_sum
+            FROM manage_movies_rating
+            WHERE content_type_id = (
+                SELECT id FROM django_content_type
+                WHERE app_label = 'manage_movies' AND model = 'film'
+            )
+            GROUP BY object_id
+        ) r ON r.object_id = f.id
+        GROUP BY f.rating, f.status
+        """,
+    ),
+}
+
+
+def create_views(apps, schema_editor):
+    """
+    Materialized views with a unique index (required by REFRESH ...
+    CONCURRENTLY) on PostgreSQL, plain tables elsewhere.
+    """
+    vendor = schema_editor.connection.vendor
+    year = YEAR_SQL.get(vendor, YEAR_SQL["sqlite"])
+    for name, (key, sql) in STATS_VIEWS.items():
+        select = sql.format(year=year)
+        if vendor == "postgresql":
+            schema_editor.execute(f"CREATE MATERIALIZED VIEW {name} AS {select}")
+            schema_editor.execute(f"CREATE UNIQUE INDEX {name}_key ON {name} ({key})")
+        else:
+            schema_editor.execute(f"CREATE TABLE {name} AS {select}")
+
+
+def drop_views(apps, schema_editor):
+    kind = (
+        "MATERIALIZED VIEW"
+        if schema_editor.connection.vendor == "postgresql"
+        else "TABLE"
+    )
+    for name in STATS_VIEWS:
+        schema_editor.execute(f"DROP {kind} IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("manage_movies", "0003_remove_film_author_film_authors"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DirectorStats",
+            fields=[
+                ("film_count", models.IntegerField()),
+                ("total_budget", models.BigIntegerField(null=True)),
+                ("total_box_office", models.BigIntegerField(null=True)),
+                ("roi", models.FloatField(help_text="box_office / budget", null=True)),
+                (
+                    "author_id",
+                    models.BigIntegerField(primary_key=True, serialize=False),
+                ),
+                ("author_name", models.CharField(max_length=255)),
+            ],
+            options={
+                "db_table": "manage_movies_stats_director",
+                "ordering": ["-film_count", "author_name"],
+                "managed": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="FilmGenreStats",
+            fields=[
+                ("film_count", models.IntegerField()),
+                ("total_budget", models.BigIntegerField(null=True)),
+                ("total_box_office", models.BigIntegerField(null=True)),
+                ("roi", models.FloatField(help_text="box_office / budget", null=True)),
+                ("genre_id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("genre_name", models.CharField(max_length=100)),
+            ],
+            options={
+                "db_table": "manage_movies_stats_genre",
+                "ordering": ["genre_name"],
+                "managed": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="FilmYearStats",
+            fields=[
+                ("film_count", models.IntegerField()),
+                ("total_budget", models.BigIntegerField(null=True)),
+                ("total_box_office", models.BigIntegerField(null=True)),
+                ("roi", models.FloatField(help_text="box_office / budget", null=True)),
+                ("year", models.IntegerField(primary_key=True, serialize=False)),
+            ],
+            options={
+                "db_table": "manage_movies_stats_year",
+                "ordering": ["year"],
+                "managed": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="RatingDistributionStats",
+            fields=[
+                (
+                    "key",
+                    models.CharField(max_length=30, primary_key=True, serialize=False),
+                ),
+                ("rating", models.CharField(max_length=10)),
+                ("status", models.CharField(max_length=15)),
+                ("film_count", models.IntegerField()),
+                ("rating_count", models.IntegerField()),
+                ("average_score", models.FloatField(null=True)),
+            ],
+            options={
+                "db_table": "manage_movies_stats_rating",
+                "ordering": ["rating", "status"],
+                "managed": False,
+            },
+        ),
+        migrations.RunPython(create_views, drop_views),
+    ]
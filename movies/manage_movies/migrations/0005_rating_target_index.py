@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("manage_movies", "0004_stats_views"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="rating",
+            index=models.Index(
+                fields=["content_type", "object_id"], name="rating_target_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("manage_movies", "0005_rating_target_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="rating",
+            name="rating_target_idx",
+        ),
+        migrations.AddIndex(
+            model_name="rating",
+            index=models.Index(
+                fields=["spectator", "-created_at"], name="rating_spectator_recent_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rating",
+            index=models.Index(
+                fields=["content_type", "object_id", "-created_at"],
+                name="rating_target_recent_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:42
+
+import django.db.models.manager
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("manage_movies", "0006_rating_scoped_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="film",
+            options={
+                "base_manager_name": "all_objects",
+                "default_manager_name": "all_objects",
+            },
+        ),
+        migrations.AlterModelManagers(
+            name="film",
+            managers=[
+                ("all_objects", django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="film",
+            index=models.Index(
+                condition=models.Q(("archived", False)),
+                fields=["id"],
+                name="film_live_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="film",
+            index=models.Index(
+                condition=models.Q(("archived", False)),
+                fields=["release_date"],
+                name="film_live_release_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("manage_movies", "0007_film_archived_manager"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MirroredImage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("source", models.CharField(max_length=255, unique=True)),
+                ("name", models.CharField(max_length=255)),
+                ("etag", models.CharField(blank=True, max_length=255)),
+                ("last_modified", models.CharField(blank=True, max_length=64)),
+                ("fetched_at", models.DateTimeField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name="author",
+            name="profile_path",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+        migrations.AddField(
+            model_name="film",
+            name="backdrop_path",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+        migrations.AddField(
+            model_name="film",
+            name="poster_path",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("manage_movies", "0008_tmdb_images"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FilmTrendBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("hour", models.DateTimeField()),
+                ("ratings", models.PositiveIntegerField(default=0)),
+                ("favorites", models.PositiveIntegerField(default=0)),
+                (
+                    "film",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="manage_movies.film",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [models.Index(fields=["hour"], name="film_trend_hour_idx")],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("film", "hour"), name="film_trend_bucket_unique"
+                    )
+                ],
+            },
+        ),
+    ]
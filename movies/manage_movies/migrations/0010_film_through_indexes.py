@@ -0,0 +1,24 @@
+from django.db import migrations
+
+# The auto-created through tables only index (film_id, x_id) and x_id alone.
+# Genre and author filters probe them from the genre/author side too: these
+# indexes cover that direction without touching the table.
+INDEXES = [
+    ("film_genres_genre_film_idx", "manage_movies_film_genres", "genre_id"),
+    ("film_authors_author_film_idx", "manage_movies_film_authors", "author_id"),
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("manage_movies", "0009_film_trend_bucket"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            f"CREATE INDEX {name} ON {table} ({column}, film_id)",
+            reverse_sql=f"DROP INDEX {name}",
+        )
+        for name, table, column in INDEXES
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations
+
+# Trigram indexes serving the autocomplete database fallback: Django runs
+# icontains as UPPER(column::text) LIKE UPPER(%s) on PostgreSQL. Other
+# databases scan, the in-memory index normally answers anyway.
+INDEXES = [
+    ("film_title_trgm_idx", "manage_movies_film", "title"),
+    ("author_name_trgm_idx", "manage_movies_author", "name"),
+]
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX {name} ON {table} "
+            f"USING gin (UPPER({column}::text) gin_trgm_ops)"
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _, _ in INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("manage_movies", "0010_film_through_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -0,0 +1,50 @@
+from django.db import migrations
+
+# The autocomplete database fallback ignores accents on PostgreSQL:
+# unaccent() is only STABLE, so an IMMUTABLE wrapper lets the trigram
+# indexes cover UPPER(immutable_unaccent(column)::text), the expression
+# the istartswith and icontains lookups compare.
+INDEXES = [
+    ("film_title_trgm_idx", "manage_movies_film", "title"),
+    ("author_name_trgm_idx", "manage_movies_author", "name"),
+]
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    schema_editor.execute(
+        "CREATE OR REPLACE FUNCTION immutable_unaccent(text) RETURNS text "
+        "AS $$ SELECT public.unaccent('public.unaccent', $1) $$ "
+        "LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT"
+    )
+    for name, table, column in INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+        schema_editor.execute(
+            f"CREATE INDEX {name} ON {table} "
+            f"USING gin (UPPER(immutable_unaccent({column})::text) gin_trgm_ops)"
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, table, column in INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+        schema_editor.execute(
+            f"CREATE INDEX {name} ON {table} "
+            f"USING gin (UPPER({column}::text) gin_trgm_ops)"
+        )
+    schema_editor.execute("DROP FUNCTION IF EXISTS immutable_unaccent(text)")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("manage_movies", "0011_autocomplete_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -24,11 +24,26 @@ class Author(models.Model):
         default=GenderChoices.NOT_SPECIFIED,
     )
     tmdb_id = models.BigIntegerField(unique=True, null=True, blank=True)
+    # Storage name of the mirrored TMDb image (see services.image_mirror).
+    profile_path = models.CharField(max_length=255, blank=True, default="")
 
     def __str__(self):
         return self.name
 
 
+class FilmQuerySet(models.QuerySet):
+    def live(self):
+        """Films that are not archived."""
+        return self.filter(archived=False)
+
+
+class LiveFilmManager(models.Manager.from_queryset(FilmQuerySet)):
+    """Default Film manager: archived films are left out."""
+
+    def get_queryset(self):
+        return super().get_queryset().live()
+
+
 class Film(models.Model):
     class RatingChoices(models.TextChoices):
         BAD = "Bad", "Bad"
@@ -60,11 +75,52 @@ class Film(models.Model):
     genres = models.ManyToManyField(
         "Genre", related_name="films", blank=True, verbose_name="Genres"
     )
+    # Storage names of the mirrored TMDb images (see services.image_mirror).
+    poster_path = models.CharField(max_length=255, blank=True, default="")
+    backdrop_path = models.CharField(max_length=255, blank=True, default="")
+
+    objects = LiveFilmManager()
+    all_objects = FilmQuerySet.as_manager()
+
+    class Meta:
+        # Only reads through Film.objects skip archived films: the admin,
+        # model forms, relations and validators see the whole table.
+        base_manager_name = "all_objects"
+        default_manager_name = "all_objects"
+        indexes = [
+            # Partial indexes over the live catalogue only: list pages,
+            # counts and release date ranges never touch archived rows.
+            models.Index(
+                fields=["id"], condition=Q(archived=False), name="film_live_idx"
+            ),
+            models.Index(
+                fields=["release_date"],
+                condition=Q(archived=False),
+                name="film_live_release_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
 
+class MirroredImage(models.Model):
+    """
+    A TMDb image copied to local storage. Files are named after their
+    SHA-256, so images shared by several TMDb paths are stored once.
+    """
+
+    # TMDb size and file path, e.g. "w500/kqjL17yufvn9OVLyXYpvtyrFfak.jpg"
+    source = models.CharField(max_length=255, unique=True)
+    name = models.CharField(max_length=255)
+    etag = models.CharField(max_length=255, blank=True)
+    last_modified = models.CharField(max_length=64, blank=True)
+    fetched_at = models.DateTimeField()
+
+    def __str__(self):
+        return self.source
+
+
 class Genre(models.Model):
     name = models.CharField(max_length=100, unique=True)
     tmdb_id = models.BigIntegerField(unique=True, null=True, blank=True)
@@ -104,8 +160,105 @@ class Rating(models.Model):
         verbose_name = "Notation"
         verbose_name_plural = "Notations"
         unique_together = ("spectator", "content_type", "object_id")
+        indexes = [
+            # Rating lists are scoped to one spectator or one target and
+            # sorted by -created_at: both slices are read straight from
+            # these indexes.
+            models.Index(
+                fields=["spectator", "-created_at"],
+                name="rating_spectator_recent_idx",
+            ),
+            models.Index(
+                fields=["content_type", "object_id", "-created_at"],
+                name="rating_target_recent_idx",
+            ),
+        ]
 
     def __str__(self):
         return (
             f"{self.spectator.username} – {self.score}/5 on « {self.content_object} »"
         )
+
+
+class FilmTrendBucket(models.Model):
+    """
+    New ratings and favorites of a film during one hour, incremented on
+    every write and ranked by manage_movies.services.trending.
+    """
+
+    film = models.ForeignKey(Film, on_delete=models.CASCADE, related_name="+")
+    hour = models.DateTimeField()
+    ratings = models.PositiveIntegerField(default=0)
+    favorites = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["film", "hour"], name="film_trend_bucket_unique"
+            )
+        ]
+        # Ranking reads and pruning both scan a range of recent hours.
+        indexes = [models.Index(fields=["hour"], name="film_trend_hour_idx")]
+
+    def __str__(self):
+        return f"{self.film_id} @ {self.hour:%Y-%m-%d %H:00}"
+
+
+# ——— Precomputed statistics ——————————————————————————————————————————————
+# Read-only models over the materialized views (tables on SQLite) created in
+# migration 0004 and refreshed by manage_movies.services.stats.
+
+
+class FinancialStats(models.Model):
+    """Box-office aggregates shared by the statistics views."""
+
+    film_count = models.IntegerField()
+    total_budget = models.BigIntegerField(null=True)
+    total_box_office = models.BigIntegerField(null=True)
+    roi = models.FloatField(null=True, help_text="box_office / budget")
+
+    class Meta:
+        abstract = True
+
+
+class FilmYearStats(FinancialStats):
+    year = models.IntegerField(primary_key=True)
+
+    class Meta:
+        managed = False
+        db_table = "manage_movies_stats_year"
+        ordering = ["year"]
+
+
+class FilmGenreStats(FinancialStats):
+    genre_id = models.BigIntegerField(primary_key=True)
+    genre_name = models.CharField(max_length=100)
+
+    class Meta:
+        managed = False
+        db_table = "manage_movies_stats_genre"
+        ordering = ["genre_name"]
+
+
+class DirectorStats(FinancialStats):
+    author_id = models.BigIntegerField(primary_key=True)
+    author_name = models.CharField(max_length=255)
+
+    class Meta:
+        managed = False
+        db_table = "manage_movies_stats_director"
+        ordering = ["-film_count", "author_name"]
+
+
+class RatingDistributionStats(models.Model):
+    key = models.CharField(max_length=30, primary_key=True)
+    rating = models.CharField(max_length=10)
+    status = models.CharField(max_length=15)
+    film_count = models.IntegerField()
+    rating_count = models.IntegerField()
+    average_score = models.FloatField(null=True)
+
+    class Meta:
+        managed = False
+        db_table = "manage_movies_stats_rating"
+        ordering = ["rating", "status"]
@@ -0,0 +1,37 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator reading the planner's row estimate (pg_class.reltuples) instead
+    of running COUNT(*) when an unfiltered PostgreSQL table is large.
+    Filtered querysets, small tables and other databases keep exact counts.
+    """
+
+    estimate_threshold = 100_000
+
+    @cached_property
+    def count(self):
+        estimate = self.estimated_count()
+        if estimate is not None and estimate >= self.estimate_threshold:
+            return estimate
+        return super().count
+
+    def estimated_count(self):
+        """Return the planner's row estimate, or None if it does not apply."""
+        qs = self.object_list
+        if not isinstance(qs, QuerySet) or qs.query.where or qs.query.is_sliced:
+            return None
+        connection = connections[qs.db]
+        if connection.vendor != "postgresql":
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [qs.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return int(row[0]) if row and row[0] >= 0 else None
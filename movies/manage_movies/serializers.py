@@ -1,25 +1,114 @@
 from django.contrib.contenttypes.models import ContentType
+from django.core.files.storage import default_storage
 from rest_framework import serializers
 
-from .models import Author, Film, Rating, Spectator
+from .models import (
+    Author,
+    DirectorStats,
+    Film,
+    FilmGenreStats,
+    FilmYearStats,
+    Rating,
+    RatingDistributionStats,
+    Spectator,
+)
+from .services.image_mirror import image_url
+
+
+def isoformat(value):
+    """Format a date the way DRF's DateField does, keeping None as is."""
+    return value.isoformat() if value is not None else None
+
+
+def sparse_fields(request, available):
+    """
+    Return the names of ``available`` selected by the ``?fields=`` and
+    ``?exclude=`` query parameters of a GET request, in declaration order.
+    Unknown names are ignored and an empty selection keeps every field.
+    """
+    available = list(available)
+    if request is None or request.method != "GET":
+        return available
+    params = request.query_params
+    selected = available
+    if params.get("fields"):
+        wanted = {name.strip() for name in params["fields"].split(",")}
+        selected = [name for name in selected if name in wanted]
+    if params.get("exclude"):
+        unwanted = {name.strip() for name in params["exclude"].split(",")}
+        selected = [name for name in selected if name not in unwanted]
+    return selected or available
+
+
+def expanded_fields(request):
+    """Return the names listed in the ``?expand=`` query parameter."""
+    if request is None or not request.query_params.get("expand"):
+        return set()
+    return {name.strip() for name in request.query_params["expand"].split(",")}
+
+
+class MirroredImageField(serializers.CharField):
+    """Storage name of a mirrored TMDb image, serialized as its URL."""
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return image_url(value)
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin dropping the fields not selected by ``?fields=`` /
+    ``?exclude=`` on the request found in the serializer context.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = set(sparse_fields(self.context.get("request"), self.fields))
+        for name in list(self.fields):
+            if name not in selected:
+                self.fields.pop(name)
 
 
 class SpectatorSerializer(serializers.ModelSerializer):
     """
-    Serializer for Spectator model.
+    Serializer for Spectator model. ``avatar_thumbnails`` maps each size to
+    the URL of its WebP thumbnail, empty until the avatar is processed.
     """
 
+    avatar_thumbnails = serializers.SerializerMethodField()
+
     class Meta:
         model = Spectator
-        fields = ["id", "username", "first_name", "last_name", "email", "bio", "avatar"]
+        fields = [
+            "id",
+            "username",
+            "first_name",
+            "last_name",
+            "email",
+            "bio",
+            "avatar",
+            "avatar_thumbnails",
+        ]
+
+    def get_avatar_thumbnails(self, spectator):
+        request = self.context.get("request")
+        urls = {}
+        for size, name in spectator.avatar_thumbnails.items():
+            url = default_storage.url(name)
+            urls[size] = request.build_absolute_uri(url) if request else url
+        return urls
 
 
-class FilmSerializer(serializers.ModelSerializer):
+class FilmSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for Film model.
     """
 
     author_name = serializers.CharField(source="author.name", read_only=True)
+    poster_path = MirroredImageField()
 
     class Meta:
         model = Film
@@ -29,23 +118,51 @@ class FilmSerializer(serializers.ModelSerializer):
             "release_date",
             "status",
             "description",
+            "poster_path",
             "author_name",
         ]
 
+    values_fields = (
+        "id",
+        "title",
+        "release_date",
+        "status",
+        "description",
+        "poster_path",
+    )
+    values_converters = {"release_date": isoformat, "poster_path": image_url}
+
+    @classmethod
+    def from_values(cls, rows, fields=values_fields):
+        """
+        Read-only fast path: build the list payload from .values() rows
+        instead of instantiating model objects and field serializers per row.
+        """
+        converters = cls.values_converters
+        return [
+            {
+                name: converters[name](row[name]) if name in converters else row[name]
+                for name in fields
+            }
+            for row in rows
+        ]
+
 
-class FilmDetailSerializer(serializers.ModelSerializer):
+class FilmDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Detailed serializer for Film model (all fields).
     """
 
     author = serializers.StringRelatedField()
+    poster_path = MirroredImageField()
+    backdrop_path = MirroredImageField()
 
     class Meta:
         model = Film
         fields = "__all__"
 
 
-class AuthorDetailSerializer(serializers.ModelSerializer):
+class AuthorDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Detailed serializer for Author model (all fields).
     """
@@ -55,13 +172,14 @@ class AuthorDetailSerializer(serializers.ModelSerializer):
         read_only=True,
         slug_field="title",
     )
+    profile_path = MirroredImageField()
 
     class Meta:
         model = Author
         fields = "__all__"
 
 
-class AuthorSerializer(serializers.ModelSerializer):
+class AuthorSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for Author model.
     """
@@ -74,8 +192,43 @@ class AuthorSerializer(serializers.ModelSerializer):
         model = Author
         fields = ["id", "name", "birth_date", "biography", "movies_list"]
 
+    values_fields = ("id", "name", "birth_date", "biography")
 
-class RatingSerializer(serializers.ModelSerializer):
+    @classmethod
+    def values_columns(cls, fields):
+        """Return the .values() columns needed to build ``fields``."""
+        columns = [name for name in fields if name in cls.values_fields]
+        if "movies_list" in fields and "id" not in columns:
+            columns.append("id")
+        return columns
+
+    @classmethod
+    def from_values(cls, rows, fields=Meta.fields):
+        """
+        Read-only fast path: build the list payload from .values() rows,
+        resolving film titles for the whole page in a single query.
+        """
+        rows = list(rows)
+        titles = {}
+        if "movies_list" in fields:
+            titles = {row["id"]: [] for row in rows}
+            film_links = Film.authors.through.objects.filter(
+                author_id__in=titles, film__archived=False
+            ).values_list("author_id", "film__title")
+            for author_id, title in film_links:
+                titles[author_id].append(title)
+        payload = []
+        for row in rows:
+            item = {name: row[name] for name in fields if name in cls.values_fields}
+            if "birth_date" in item:
+                item["birth_date"] = isoformat(item["birth_date"])
+            if "movies_list" in fields:
+                item["movies_list"] = titles[row["id"]]
+            payload.append(item)
+        return payload
+
+
+class RatingSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for Rating model.
     This serializer allows posting ratings for films and authors."""
 
@@ -83,6 +236,8 @@ class RatingSerializer(serializers.ModelSerializer):
         slug_field="model",
         queryset=ContentType.objects.filter(model__in=["film", "author"]),
     )
+    # Only serialized with ?expand=target; the view prefetches the targets.
+    target = serializers.SerializerMethodField()
 
     class Meta:
         model = Rating
@@ -94,5 +249,139 @@ class RatingSerializer(serializers.ModelSerializer):
             "comment",
             "created_at",
             "updated_at",
+            "target",
         ]
         read_only_fields = ["id", "created_at", "updated_at"]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if "target" not in expanded_fields(self.context.get("request")):
+            self.fields.pop("target", None)
+
+    def validate(self, attrs):
+        """Check that the rated film or author exists."""
+        content_type = attrs.get(
+            "content_type", getattr(self.instance, "content_type", None)
+        )
+        object_id = attrs.get("object_id", getattr(self.instance, "object_id", None))
+        if content_type is not None and object_id is not None:
+            model = content_type.model_class()
+            if not model._default_manager.filter(pk=object_id).exists():
+                raise serializers.ValidationError(
+                    {"object_id": [f"No {content_type.model} with this id."]}
+                )
+        return attrs
+
+    def get_target(self, obj):
+        """Return a compact representation of the rated film or author."""
+        target = obj.content_object
+        if isinstance(target, Film):
+            return {
+                "id": target.pk,
+                "title": target.title,
+                "release_date": isoformat(target.release_date),
+            }
+        if isinstance(target, Author):
+            return {"id": target.pk, "name": target.name}
+        return None
+
+
+class ReferenceField(serializers.Field):
+    """
+    Reference to an author or genre in bulk imports: an integer is a TMDb
+    id, a string is a name. ``{"tmdb_id": ...}`` and ``{"name": ...}`` are
+    accepted too. Validates to a ``(lookup, value)`` pair.
+    """
+
+    default_error_messages = {
+        "invalid": "Expected a TMDb id (integer) or a name (string).",
+    }
+
+    def to_internal_value(self, data):
+        if isinstance(data, dict):
+            if data.keys() == {"tmdb_id"}:
+                data = data["tmdb_id"]
+                if not isinstance(data, int) or isinstance(data, bool):
+                    self.fail("invalid")
+            elif data.keys() == {"name"}:
+                data = data["name"]
+            else:
+                self.fail("invalid")
+        if isinstance(data, int) and not isinstance(data, bool):
+            return ("tmdb_id", data)
+        if isinstance(data, str) and data.strip():
+            return ("name", data.strip())
+        self.fail("invalid")
+
+    def to_representation(self, value):
+        return value[1]
+
+
+class FilmImportSerializer(serializers.Serializer):
+    """
+    Validates one film of a bulk import without touching the database;
+    references and tmdb_id upserts are resolved for the whole batch.
+    """
+
+    title = serializers.CharField(max_length=255)
+    description = serializers.CharField(allow_blank=True, default="")
+    release_date = serializers.DateField()
+    adult = serializers.BooleanField(default=False)
+    rating = serializers.ChoiceField(
+        choices=Film.RatingChoices.choices, default=Film.RatingChoices.GOOD
+    )
+    status = serializers.ChoiceField(
+        choices=Film.StatusChoices.choices, default=Film.StatusChoices.PLANNED
+    )
+    budget = serializers.IntegerField(required=False, allow_null=True, min_value=0)
+    box_office = serializers.IntegerField(required=False, allow_null=True, min_value=0)
+    tmdb_id = serializers.IntegerField(required=False, allow_null=True)
+    # Omitted on an update: the film keeps its current authors / genres.
+    authors = serializers.ListField(child=ReferenceField(), required=False)
+    genres = serializers.ListField(child=ReferenceField(), required=False)
+
+
+class FilmYearStatsSerializer(serializers.ModelSerializer):
+    """Serializer for per-year film statistics."""
+
+    class Meta:
+        model = FilmYearStats
+        fields = ["year", "film_count", "total_budget", "total_box_office", "roi"]
+
+
+class FilmGenreStatsSerializer(serializers.ModelSerializer):
+    """Serializer for per-genre film statistics."""
+
+    class Meta:
+        model = FilmGenreStats
+        fields = [
+            "genre_id",
+            "genre_name",
+            "film_count",
+            "total_budget",
+            "total_box_office",
+            "roi",
+        ]
+
+
+class DirectorStatsSerializer(serializers.ModelSerializer):
+    """Serializer for per-director film statistics."""
+
+    class Meta:
+        model = DirectorStats
+        fields = [
+            "author_id",
+            "author_name",
+            "film_count",
+            "total_budget",
+            "total_box_office",
+            "roi",
+        ]
+
+
+class RatingDistributionStatsSerializer(serializers.ModelSerializer):
+    """Serializer for the rating distribution statistics."""
+
+    class Meta:
+        model = RatingDistributionStats
+        exclude = ["key"]
@@ -0,0 +1,349 @@
+"""
+Typeahead over film titles and author names.
+
+Each worker keeps a PrefixIndex in memory: the normalized word suffixes of
+every title and name ("the godfather", "godfather") in one sorted list, so
+the entries starting with a query are a contiguous slice found by
+bisection, ranked by popularity (favorites of a film, live films of an
+author). Catalogue changes are logged in the cache under increasing
+versions and replayed by every worker on its next query; a worker too far
+behind rebuilds. Bulk writes sending no signals (imports, generate_data)
+call invalidate(). Until its index is built, a worker answers from the
+database, matching the same word prefixes with LIKE lookups that trigram
+indexes serve on PostgreSQL.
+
+The change log needs SHARED_CACHE: in a per-process cache, no worker would
+see the changes of the others, so every query goes to the database.
+"""
+
+import heapq
+import logging
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import CharField, Count, Func, Q
+from django.db.models.functions import Length
+from manage_movies.models import Author, Film
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "autocomplete:version"
+CHANGE_KEY = "autocomplete:change:{}"
+KINDS = ("film", "author")
+# Word suffixes indexed per title, the rest of a long title is not.
+MAX_WORDS = 6
+# Prefixes this short match a large slice: their results are memoized.
+MEMO_LENGTH = 2
+MEMO_SIZE = 4096
+
+DEFAULTS = {
+    "LIMIT": 10,
+    "MAX_LIMIT": 50,
+    # Changes logged in the cache, and kept this long for workers to replay.
+    "CHANGE_TTL": 3600,
+    # A worker more changes behind than this rebuilds its index instead.
+    "MAX_REPLAY": 500,
+    # False answers every query from the database.
+    "INDEX": True,
+}
+
+Ref = Tuple[str, int]
+
+_index: Optional["PrefixIndex"] = None
+_building = False
+_lock = threading.Lock()
+
+
+def get_config() -> dict:
+    return {**DEFAULTS, **getattr(settings, "AUTOCOMPLETE", {})}
+
+
+def strip_accents(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in text if not unicodedata.combining(char))
+
+
+def normalize(text: str) -> str:
+    """Lower-case, accent-free words separated by single spaces."""
+    return " ".join(re.findall(r"\w+", strip_accents(text).casefold()))
+
+
+def index_keys(label: str) -> List[str]:
+    """Keys of a label: its normalized text from each of its first words."""
+    words = normalize(label).split()
+    return [" ".join(words[i:]) for i in range(min(len(words), MAX_WORDS))]
+
+
+class PrefixIndex:
+    """
+    Sorted keys with, at the same position, the (kind, id) they belong to;
+    labels and weights are kept once per object.
+    """
+
+    def __init__(self, version: int = 0) -> None:
+        self.version = version
+        self.keys: List[str] = []
+        self.refs: List[Ref] = []
+        self.entries: Dict[Ref, Tuple[str, int]] = {}
+        # (prefix, limit): results, cleared by any change.
+        self.memo: Dict[Tuple[str, int], List[dict]] = {}
+
+    @classmethod
+    def build(
+        cls, rows: Iterable[Tuple[str, int, str, int]], version: int = 0
+    ) -> "PrefixIndex":
+        """Index (kind, id, label, weight) rows in one sort."""
+        index = cls(version)
+        pairs = []
+        for kind, pk, label, weight in rows:
+            ref = (kind, pk)
+            index.entries[ref] = (label, weight)
+            pairs.extend((key, ref) for key in index_keys(label))
+        pairs.sort()
+        index.keys = [key for key, _ in pairs]
+        index.refs = [ref for _, ref in pairs]
+        return index
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def remove(self, ref: Ref) -> None:
+        entry = self.entries.pop(ref, None)
+        if entry is None:
+            return
+        self.memo.clear()
+        for key in index_keys(entry[0]):
+            position = bisect_left(self.keys, key)
+            while self.refs[position] != ref:
+                position += 1
+            del self.keys[position]
+            del self.refs[position]
+
+    def put(self, ref: Ref, label: str, weight: int) -> None:
+        """Add an object, or replace it."""
+        self.remove(ref)
+        self.memo.clear()
+        self.entries[ref] = (label, weight)
+        for key in index_keys(label):
+            position = bisect_left(self.keys, key)
+            # Among equal keys, keep refs sorted as build() does.
+            while (
+                position < len(self.keys)
+                and self.keys[position] == key
+                and self.refs[position] < ref
+            ):
+                position += 1
+            self.keys.insert(position, key)
+            self.refs.insert(position, ref)
+
+    def search(self, query: str, limit: int) -> List[dict]:
+        """The most popular objects with a word starting with ``query``."""
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        if len(prefix) <= MEMO_LENGTH:
+            key = (prefix, limit)
+            if key not in self.memo:
+                if len(self.memo) >= MEMO_SIZE:
+                    self.memo.clear()
+                self.memo[key] = self._search(prefix, limit)
+            return self.memo[key]
+        return self._search(prefix, limit)
+
+    def _search(self, prefix: str, limit: int) -> List[dict]:
+        start = bisect_left(self.keys, prefix)
+        end = bisect_left(self.keys, prefix + "\U0010ffff", start)
+        refs = set(self.refs[start:end])
+
+        def rank(ref):
+            label, weight = self.entries[ref]
+            return -weight, len(label), label, ref
+
+        return [
+            {"type": kind, "id": pk, "label": self.entries[(kind, pk)][0]}
+            for kind, pk in heapq.nsmallest(limit, refs, key=rank)
+        ]
+
+
+# ——— Loading ————————————————————————————————————————————————————————————————
+
+
+def _films():
+    return Film.objects.annotate(weight=Count("favorited_by"))
+
+
+def _authors():
+    return Author.objects.annotate(
+        weight=Count("films", filter=Q(films__archived=False))
+    )
+
+
+# Kind: (annotated queryset, label field).
+SOURCES = {"film": (_films, "title"), "author": (_authors, "name")}
+
+
+def load_rows(kind: str, ids: Optional[Iterable[int]] = None):
+    """(kind, id, label, weight) rows of live films or authors."""
+    queryset, field = SOURCES[kind]
+    qs = queryset()
+    if ids is not None:
+        qs = qs.filter(pk__in=ids)
+    for pk, label, weight in qs.values_list("pk", field, "weight"):
+        yield kind, pk, label, weight
+
+
+def build_index() -> PrefixIndex:
+    """Index the whole catalogue and make it this worker's index."""
+    global _index
+    # Read first: changes logged while loading are replayed afterwards.
+    version = cache.get(VERSION_KEY, 0)
+    index = PrefixIndex.build(
+        [row for kind in KINDS for row in load_rows(kind)], version
+    )
+    with _lock:
+        _index = index
+    logger.info("Autocomplete index built: %d entries", len(index))
+    return index
+
+
+def _build_in_background() -> None:
+    global _building
+    try:
+        build_index()
+    except Exception:
+        logger.exception("Could not build the autocomplete index")
+    finally:
+        _building = False
+        connection.close()
+
+
+def replay(index: PrefixIndex, version: int) -> bool:
+    """
+    Apply the changes logged since the index was built or last synced.
+    False when some expired or are too many: the index must be rebuilt.
+    """
+    if version - index.version > get_config()["MAX_REPLAY"]:
+        return False
+    keys = [CHANGE_KEY.format(v) for v in range(index.version + 1, version + 1)]
+    changes = cache.get_many(keys)
+    if len(changes) != len(keys):
+        return False
+    changed = {kind: set() for kind in KINDS}
+    for kind, pk in changes.values():
+        changed[kind].add(pk)
+    for kind, ids in changed.items():
+        if not ids:
+            continue
+        found = {pk: (label, weight) for _, pk, label, weight in load_rows(kind, ids)}
+        for pk in ids:
+            if pk in found:
+                index.put((kind, pk), *found[pk])
+            else:
+                index.remove((kind, pk))
+    index.version = version
+    return True
+
+
+def get_index() -> Optional[PrefixIndex]:
+    """
+    This worker's index, synced with the logged changes, or None while it
+    is built in a background thread (on first use or when out of date).
+    """
+    global _building
+    if not get_config()["INDEX"] or not getattr(settings, "SHARED_CACHE", False):
+        return None
+    version = cache.get(VERSION_KEY, 0)
+    with _lock:
+        index = _index
+        if index is not None and (
+            version == index.version
+            or (version > index.version and replay(index, version))
+        ):
+            return index
+        if not _building:
+            _building = True
+            threading.Thread(target=_build_in_background, daemon=True).start()
+    return None
+
+
+class Unaccent(Func):
+    """unaccent() made indexable by migration 0012 (PostgreSQL only)."""
+
+    function = "immutable_unaccent"
+    output_field = CharField()
+
+
+def search_database(query: str, limit: int) -> List[dict]:
+    """
+    The fallback: labels with a word starting with ``query``, ranked as the
+    index ranks them. Accents are ignored on PostgreSQL only, and words are
+    split on spaces: "man" finds "Iron Man" but not "Spider-Man".
+    """
+    if not normalize(query):
+        return []
+    prefix = " ".join(strip_accents(query).split())
+    results = []
+    for kind, (queryset, field) in SOURCES.items():
+        qs, searched = queryset(), field
+        if connection.vendor == "postgresql":
+            qs, searched = qs.annotate(searched=Unaccent(field)), "searched"
+        rows = (
+            qs.filter(
+                Q(**{f"{searched}__istartswith": prefix})
+                | Q(**{f"{searched}__icontains": " " + prefix})
+            )
+            .order_by("-weight", Length(field), field, "pk")
+            .values_list("pk", field, "weight")[:limit]
+        )
+        results.extend(
+            (-weight, len(label), label, (kind, pk)) for pk, label, weight in rows
+        )
+    return [
+        {"type": kind, "id": pk, "label": label}
+        for _, _, label, (kind, pk) in sorted(results)[:limit]
+    ]
+
+
+def autocomplete(query: str, limit: Optional[int] = None) -> List[dict]:
+    """
+    Up to ``limit`` (LIMIT by default, MAX_LIMIT at most) films and authors
+    matching a typed prefix.
+    """
+    config = get_config()
+    limit = max(1, min(limit or config["LIMIT"], config["MAX_LIMIT"]))
+    index = get_index()
+    if index is None:
+        return search_database(query, limit)
+    # Replays mutate the index: no search meanwhile.
+    with _lock:
+        return index.search(query, limit)
+
+
+# ——— Change log ——————————————————————————————————————————————————————————————
+
+
+def _log(kind: Optional[str], pk: Optional[int]) -> None:
+    cache.add(VERSION_KEY, 0, None)
+    try:
+        version = cache.incr(VERSION_KEY)
+    except ValueError:
+        # Evicted since add(): every worker rebuilds.
+        return
+    if kind is not None:
+        cache.set(CHANGE_KEY.format(version), (kind, pk), get_config()["CHANGE_TTL"])
+
+
+def log_change(kind: str, pk: int) -> None:
+    """Have every worker re-read one film or author, once committed."""
+    transaction.on_commit(lambda: _log(kind, pk))
+
+
+def invalidate() -> None:
+    """Have every worker rebuild its index, e.g. after bulk writes."""
+    transaction.on_commit(lambda: _log(None, None))
@@ -0,0 +1,131 @@
+"""
+Spectator avatar thumbnails: each uploaded avatar is resized into square
+WebP thumbnails of AVATAR_SIZES pixels by a process pool, once the upload
+is committed, so the request only has to store the original file.
+"""
+
+import io
+import logging
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from pathlib import PurePosixPath
+from typing import Dict, Iterable, Optional, Union
+
+from accounts.models import Spectator
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+AVATAR_SIZES = (64, 128, 256)
+WEBP_QUALITY = 80
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def thumbnail_name(name: str, size: int) -> str:
+    """Storage name of one thumbnail of the avatar stored as ``name``."""
+    path = PurePosixPath(name)
+    return str(path.parent / "thumbs" / f"{path.stem}_{size}.webp")
+
+
+def render_thumbnails(
+    source: Union[str, bytes], sizes=AVATAR_SIZES
+) -> Dict[int, bytes]:
+    """
+    Crop an image (a file path or its bytes) to a centred square and encode
+    it as WebP at each size. Runs in the worker processes: no Django here.
+    """
+    with Image.open(source if isinstance(source, str) else io.BytesIO(source)) as im:
+        # JPEG only: decode at the smallest scale still larger than needed.
+        im.draft("RGB", (max(sizes), max(sizes)))
+        image = ImageOps.exif_transpose(im)
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+    thumbnails = {}
+    for size in sizes:
+        buffer = io.BytesIO()
+        ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS).save(
+            buffer, "WEBP", quality=WEBP_QUALITY
+        )
+        thumbnails[size] = buffer.getvalue()
+    return thumbnails
+
+
+def get_executor() -> Optional[ProcessPoolExecutor]:
+    """The shared pool, created on first use; None when AVATAR_WORKERS is 0."""
+    global _executor
+    workers = getattr(settings, "AVATAR_WORKERS", 2)
+    if not workers:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=workers)
+        return _executor
+
+
+def delete_thumbnails(names: Iterable[str]) -> None:
+    """Delete thumbnail files from storage."""
+    for name in names:
+        default_storage.delete(name)
+
+
+def store_thumbnails(
+    spectator_id: int, name: str, thumbnails: Dict[int, bytes]
+) -> None:
+    """Save rendered thumbnails, unless the spectator changed avatar since."""
+    names = {}
+    for size, data in thumbnails.items():
+        target = thumbnail_name(name, size)
+        default_storage.delete(target)
+        names[str(size)] = default_storage.save(target, ContentFile(data))
+    updated = Spectator.objects.filter(pk=spectator_id, avatar=name).update(
+        avatar_thumbnails=names
+    )
+    if not updated:
+        # Replaced meanwhile: nothing refers to these thumbnails.
+        delete_thumbnails(names.values())
+
+
+def _finish(spectator_id: int, name: str, future: Future) -> None:
+    try:
+        store_thumbnails(spectator_id, name, future.result())
+    except Exception:
+        logger.exception("Could not process avatar %s", name)
+    finally:
+        # Callbacks run in the pool's management thread, not a request.
+        connection.close()
+
+
+def process_avatar(spectator_id: int, name: str) -> None:
+    """Render the thumbnails of a stored avatar in the process pool."""
+    try:
+        source = default_storage.path(name)
+    except NotImplementedError:
+        with default_storage.open(name) as avatar:
+            source = avatar.read()
+    executor = get_executor()
+    if executor is None:
+        store_thumbnails(spectator_id, name, render_thumbnails(source))
+        return
+    executor.submit(render_thumbnails, source).add_done_callback(
+        partial(_finish, spectator_id, name)
+    )
+
+
+def schedule_avatar(spectator: Spectator, replaced: Iterable[str] = ()) -> None:
+    """
+    Process a spectator's new avatar once the current transaction commits,
+    and delete the ``replaced`` thumbnails of the previous one.
+    """
+    replaced = list(replaced)
+    if replaced:
+        transaction.on_commit(partial(delete_thumbnails, replaced))
+    if spectator.avatar:
+        transaction.on_commit(
+            partial(process_avatar, spectator.pk, spectator.avatar.name)
+        )
@@ -0,0 +1,180 @@
+import csv
+import json
+import zlib
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from django.core.serializers.json import DjangoJSONEncoder
+from manage_movies.models import Author, Film, Genre, Rating
+from manage_movies.renderers import orjson, orjson_default
+
+FORMATS = ("ndjson", "csv")
+
+EXPORT_COLUMNS = {
+    "films": [
+        "id",
+        "title",
+        "description",
+        "release_date",
+        "adult",
+        "rating",
+        "status",
+        "budget",
+        "box_office",
+        "created_at",
+        "tmdb_id",
+        "archived",
+        "author_ids",
+        "genre_ids",
+    ],
+    "authors": [
+        "id",
+        "name",
+        "birth_date",
+        "death_date",
+        "biography",
+        "place_of_birth",
+        "gender",
+        "tmdb_id",
+    ],
+    "genres": ["id", "name", "tmdb_id"],
+    "ratings": [
+        "id",
+        "spectator_id",
+        "content_type",
+        "object_id",
+        "score",
+        "comment",
+        "created_at",
+        "updated_at",
+    ],
+}
+
+# Exports are complete: archived films included.
+_MANAGERS = {
+    "films": Film.all_objects,
+    "authors": Author.objects,
+    "genres": Genre.objects,
+    "ratings": Rating.objects,
+}
+_FILM_RELATIONS = (
+    ("author_ids", Film.authors.through, "author_id"),
+    ("genre_ids", Film.genres.through, "genre_id"),
+)
+
+
+def _chunks(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield successive lists of at most ``size`` items."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _value_columns(table: str) -> List[str]:
+    """Return the .values() columns read for an exported table."""
+    columns = [c for c in EXPORT_COLUMNS[table] if not c.endswith("_ids")]
+    if table == "ratings":
+        columns[columns.index("content_type")] = "content_type__model"
+    return columns
+
+
+def export_rows(
+    table: str, after: Optional[int] = None, chunk_size: int = 2000
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield the rows of an exported table in chunks, ordered by id.
+    Rows are read through a server-side cursor, so memory stays constant
+    whatever the table size. ``after`` resumes from the last exported id.
+    """
+    qs = _MANAGERS[table].order_by("id")
+    if after is not None:
+        qs = qs.filter(id__gt=after)
+    rows = qs.values(*_value_columns(table)).iterator(chunk_size=chunk_size)
+
+    for chunk in _chunks(rows, chunk_size):
+        if table == "films":
+            _attach_film_relations(chunk)
+        elif table == "ratings":
+            for row in chunk:
+                row["content_type"] = row.pop("content_type__model")
+        yield chunk
+
+
+def _attach_film_relations(chunk: List[Dict[str, Any]]) -> None:
+    """Add author and genre ids to a chunk of film rows, one query each."""
+    by_id = {row["id"]: row for row in chunk}
+    for key, through, column in _FILM_RELATIONS:
+        for row in chunk:
+            row[key] = []
+        links = through.objects.filter(film_id__in=by_id).values_list("film_id", column)
+        for film_id, related_id in links:
+            by_id[film_id][key].append(related_id)
+
+
+def _dumps(row: Dict[str, Any]) -> bytes:
+    """Encode a row as one JSON line, with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(row, default=orjson_default) + b"\n"
+    return (json.dumps(row, cls=DjangoJSONEncoder) + "\n").encode()
+
+
+def render_ndjson(
+    table: str, chunks: Iterable[List[Dict[str, Any]]]
+) -> Iterator[bytes]:
+    """Render chunks of rows as newline-delimited JSON, one block per chunk."""
+    for chunk in chunks:
+        yield b"".join(_dumps(row) for row in chunk)
+
+
+class _Echo:
+    """File-like object handing back what csv.writer writes to it."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _csv_value(value: Any) -> Any:
+    """Flatten id lists and dates into CSV cells."""
+    if isinstance(value, list):
+        return "|".join(str(item) for item in value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def render_csv(table: str, chunks: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    """Render chunks of rows as CSV with a header line, one block per chunk."""
+    columns = EXPORT_COLUMNS[table]
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns).encode()
+    for chunk in chunks:
+        yield "".join(
+            writer.writerow([_csv_value(row[c]) for c in columns]) for row in chunk
+        ).encode()
+
+
+def gzip_stream(blocks: Iterable[bytes]) -> Iterator[bytes]:
+    """Gzip a stream of byte blocks on the fly."""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for block in blocks:
+        data = compressor.compress(block)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_export(
+    table: str,
+    fmt: str = "ndjson",
+    after: Optional[int] = None,
+    compress: bool = False,
+    chunk_size: int = 2000,
+) -> Iterator[bytes]:
+    """Stream a whole table as NDJSON or CSV bytes, optionally gzipped."""
+    if table not in EXPORT_COLUMNS:
+        raise ValueError(f"Unknown table: {table}")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt}")
+    render = render_ndjson if fmt == "ndjson" else render_csv
+    blocks = render(table, export_rows(table, after=after, chunk_size=chunk_size))
+    return gzip_stream(blocks) if compress else blocks
@@ -0,0 +1,99 @@
+"""
+Facet counts of the film list: films per status, rating, genre and release
+year among the films matching the current filters, one grouped query per
+facet, cached per normalized filter set.
+"""
+
+import hashlib
+from typing import Dict, Iterable, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.functions import ExtractYear
+from manage_movies.models import Film
+
+FACETS = ("status", "rating", "genre", "year")
+# Parameters that do not change which films match.
+NON_FILTER_PARAMS = {"page", "page_size", "fields", "exclude", "facets", "ordering"}
+# Parameters whose values match case-insensitively; genre names and the
+# other values are matched as given, so their case is kept in the key.
+CASE_INSENSITIVE_PARAMS = {"rating", "status"}
+
+
+def _status(qs):
+    return qs.values_list("status").annotate(count=Count("pk")).order_by("status")
+
+
+def _rating(qs):
+    return qs.values_list("rating").annotate(count=Count("pk")).order_by("rating")
+
+
+def _genre(qs):
+    return (
+        Film.genres.through.objects.filter(film_id__in=qs.values("pk"))
+        .values_list("genre__name")
+        .annotate(count=Count("film_id"))
+        .order_by("-count", "genre__name")
+    )
+
+
+def _year(qs):
+    return (
+        qs.annotate(year=ExtractYear("release_date"))
+        .values_list("year")
+        .annotate(count=Count("pk"))
+        .order_by("-year")
+    )
+
+
+COUNTERS = {"status": _status, "rating": _rating, "genre": _genre, "year": _year}
+
+
+def filter_key(params) -> str:
+    """
+    Cache key part identifying the films matched by the list parameters:
+    parameters sorted, comma-separated values sorted, and lower-cased for
+    the parameters matched case-insensitively.
+    """
+    normalized = []
+    for name, values in params.items():
+        if name in NON_FILTER_PARAMS:
+            continue
+        values = [value.strip() for value in values.split(",")]
+        if name in CASE_INSENSITIVE_PARAMS:
+            values = [value.lower() for value in values]
+        normalized.append((name, ",".join(sorted(values))))
+    return hashlib.sha1(repr(sorted(normalized)).encode()).hexdigest()
+
+
+def film_facets(qs, names: Iterable[str], params) -> Dict[str, Dict[str, int]]:
+    """
+    Counts of the films of ``qs`` (filtered from ``params``) per value of
+    each facet in ``names``, in display order, cached FACETS_CACHE_TTL
+    seconds.
+    """
+    key = filter_key(params)
+    keys = {name: f"facets:film:{name}:{key}" for name in names}
+    facets = cache.get_many(list(keys.values()))
+    result = {}
+    for name, cache_key in keys.items():
+        if cache_key not in facets:
+            counts = COUNTERS[name](qs.order_by())
+            facets[cache_key] = {str(value): count for value, count in counts}
+            cache.set(
+                cache_key,
+                facets[cache_key],
+                getattr(settings, "FACETS_CACHE_TTL", 60),
+            )
+        result[name] = facets[cache_key]
+    return result
+
+
+def parse_facets(value: str) -> List[str]:
+    """Facet names of a ``?facets=`` value; raises ValueError on unknown ones."""
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in COUNTERS]
+    if unknown:
+        raise ValueError(f"Unknown facet {unknown[0]!r}, expected {', '.join(FACETS)}.")
+    return list(dict.fromkeys(names))
@@ -0,0 +1,193 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.db import DatabaseError, transaction
+from django.db.models import Q
+from manage_movies.models import Author, Film, Genre
+from manage_movies.serializers import FilmImportSerializer
+from manage_movies.services import autocomplete, snapshot
+
+FILM_FIELDS = [
+    "title",
+    "description",
+    "release_date",
+    "adult",
+    "rating",
+    "status",
+    "budget",
+    "box_office",
+    "tmdb_id",
+]
+
+Reference = Tuple[str, Any]
+
+
+class ReferenceResolver:
+    """
+    Resolves name / TMDb id references to primary keys for a whole batch
+    with a single query on the referenced table.
+    """
+
+    def __init__(self, model, references: Iterable[Reference]) -> None:
+        self.model = model
+        names, tmdb_ids = set(), set()
+        for lookup, value in references:
+            (names if lookup == "name" else tmdb_ids).add(value)
+        self.by_name: Dict[str, List[int]] = defaultdict(list)
+        self.by_tmdb_id: Dict[int, int] = {}
+        if names or tmdb_ids:
+            rows = model.objects.filter(
+                Q(name__in=names) | Q(tmdb_id__in=tmdb_ids)
+            ).values_list("id", "name", "tmdb_id")
+            for pk, name, tmdb_id in rows:
+                self.by_name[name].append(pk)
+                if tmdb_id is not None:
+                    self.by_tmdb_id[tmdb_id] = pk
+
+    def resolve(self, reference: Reference) -> Tuple[Optional[int], Optional[str]]:
+        """Return ``(pk, None)`` or ``(None, error message)``."""
+        lookup, value = reference
+        label = self.model._meta.verbose_name
+        if lookup == "tmdb_id":
+            pk = self.by_tmdb_id.get(value)
+            if pk is None:
+                return None, f"Unknown {label} tmdb_id: {value}."
+            return pk, None
+        pks = self.by_name.get(value, [])
+        if not pks:
+            return None, f"Unknown {label}: {value}."
+        if len(pks) > 1:
+            return None, f"Ambiguous {label} name, use its tmdb_id: {value}."
+        return pks[0], None
+
+
+def import_films(rows: List[Any], chunk_size: int = 500) -> Dict[str, Any]:
+    """
+    Validate and upsert a batch of films with their authors and genres.
+
+    Films carrying a ``tmdb_id`` that already exists are updated, the
+    others are created. Validation costs one query per referenced table
+    for the whole batch; writes use ``bulk_create`` / ``bulk_update`` and
+    bulk through-table rows, one transaction per chunk. Invalid rows are
+    reported by index and never abort the rest of the batch.
+    """
+    errors: Dict[int, Dict[str, Any]] = {}
+    valid: List[Tuple[int, Dict[str, Any]]] = []
+    # Fields each row carries: an update leaves the others untouched,
+    # serializer defaults only apply to new films.
+    provided: Dict[int, Tuple[str, ...]] = {}
+    for index, row in enumerate(rows):
+        serializer = FilmImportSerializer(data=row)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+            provided[index] = tuple(field for field in FILM_FIELDS if field in row)
+        else:
+            errors[index] = serializer.errors
+
+    authors = ReferenceResolver(
+        Author, (ref for _, data in valid for ref in data.get("authors", []))
+    )
+    genres = ReferenceResolver(
+        Genre, (ref for _, data in valid for ref in data.get("genres", []))
+    )
+    tmdb_ids = {data["tmdb_id"] for _, data in valid if data.get("tmdb_id") is not None}
+    existing = dict(
+        Film.all_objects.filter(tmdb_id__in=tmdb_ids).values_list("tmdb_id", "id")
+    )
+
+    prepared = []
+    seen_tmdb_ids = set()
+    for index, data in valid:
+        row_errors = {}
+        for key, resolver in (("authors", authors), ("genres", genres)):
+            if key not in data:
+                continue
+            pks = []
+            for reference in data[key]:
+                pk, error = resolver.resolve(reference)
+                if error:
+                    row_errors.setdefault(key, []).append(error)
+                else:
+                    pks.append(pk)
+            data[key] = pks
+        tmdb_id = data.get("tmdb_id")
+        if tmdb_id is not None:
+            if tmdb_id in seen_tmdb_ids:
+                row_errors["tmdb_id"] = ["Duplicate tmdb_id in this batch."]
+            seen_tmdb_ids.add(tmdb_id)
+        if row_errors:
+            errors[index] = row_errors
+        else:
+            prepared.append((index, data))
+
+    created = updated = 0
+    for start in range(0, len(prepared), chunk_size):
+        end = start + chunk_size
+        chunk = prepared[start:end]
+        try:
+            chunk_created, chunk_updated = _write_chunk(chunk, existing, provided)
+        except DatabaseError as exc:
+            for index, _ in chunk:
+                errors[index] = {"non_field_errors": [f"Database error: {exc}"]}
+            continue
+        created += chunk_created
+        updated += chunk_updated
+    if created or updated:
+        # Bulk writes send no signals.
+        autocomplete.invalidate()
+        snapshot.mark_changed()
+
+    return {
+        "created": created,
+        "updated": updated,
+        "errors": [
+            {"index": index, "errors": errors[index]} for index in sorted(errors)
+        ],
+    }
+
+
+def _write_chunk(
+    chunk: List[Tuple[int, Dict[str, Any]]],
+    existing: Dict[int, int],
+    provided: Dict[int, Tuple[str, ...]],
+) -> Tuple[int, int]:
+    """
+    Write one chunk of validated films in a single transaction. Existing
+    films only get the fields their row carries, one ``bulk_update`` per
+    set of fields.
+    """
+    new_films = []
+    changed_films: Dict[Tuple[str, ...], List[Film]] = defaultdict(list)
+    links = {"authors": [], "genres": []}
+    replaced = {"authors": [], "genres": []}
+    for index, data in chunk:
+        tmdb_id = data.get("tmdb_id")
+        if tmdb_id in existing:
+            fields = provided[index]
+            film = Film(
+                pk=existing[tmdb_id], **{field: data[field] for field in fields}
+            )
+            changed_films[fields].append(film)
+        else:
+            film = Film(**{field: data.get(field) for field in FILM_FIELDS})
+            new_films.append(film)
+        for key in links:
+            if key in data:
+                links[key].append((film, set(data[key])))
+                if film.pk is not None:
+                    replaced[key].append(film.pk)
+
+    with transaction.atomic():
+        Film.objects.bulk_create(new_films)
+        for fields, films in changed_films.items():
+            Film.all_objects.bulk_update(films, fields)
+        for key, column in (("authors", "author_id"), ("genres", "genre_id")):
+            through = getattr(Film, key).through
+            if replaced[key]:
+                through.objects.filter(film_id__in=replaced[key]).delete()
+            through.objects.bulk_create(
+                through(film_id=film.pk, **{column: related_id})
+                for film, related_ids in links[key]
+                for related_id in related_ids
+            )
+    return len(new_films), sum(len(films) for films in changed_films.values())
@@ -0,0 +1,183 @@
+"""
+Mirror TMDb posters, backdrops and profile pictures into local storage.
+
+Files are content-addressed (``tmdb/<sha256[:2]>/<sha256><ext>``): an image
+served under several TMDb paths is stored once, and a stored file never
+changes, so it can be cached forever. MirroredImage remembers where each
+TMDb path landed with its ETag and Last-Modified, to skip images already
+mirrored and re-download only what changed when refreshing.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from pathlib import PurePosixPath
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import requests
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from django.utils import timezone
+from manage_movies.models import MirroredImage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = "https://image.tmdb.org/t/p"
+POSTER_SIZE = "w500"
+BACKDROP_SIZE = "w1280"
+PROFILE_SIZE = "w185"
+EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".svg"}
+# Storage names produced by content_name(), the only ones served.
+NAME_RE = re.compile(r"tmdb/[0-9a-f]{2}/[0-9a-f]{64}\.[a-z]+")
+LOOKUP_CHUNK = 500
+
+
+def content_name(content: bytes, extension: str) -> str:
+    """Storage name of an image, derived from its content."""
+    digest = hashlib.sha256(content).hexdigest()
+    return f"tmdb/{digest[:2]}/{digest}{extension.lower()}"
+
+
+def image_url(name: str) -> Optional[str]:
+    """URL of a mirrored image, None when there is none."""
+    return reverse("mirrored-image", args=[name]) if name else None
+
+
+def _chunks(items: List[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class ImageMirror:
+    """
+    Download TMDb images with ``workers`` concurrent connections. ``refresh``
+    revalidates already mirrored images (conditional requests) instead of
+    trusting them.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        workers: int = 8,
+        refresh: bool = False,
+        timeout: float = 10,
+    ) -> None:
+        self.base_url = (
+            base_url or os.getenv("TMDB_IMAGE_BASE_URL") or DEFAULT_BASE_URL
+        ).rstrip("/")
+        self.workers = workers
+        self.refresh = refresh
+        self.timeout = timeout
+        self.local = threading.local()
+        # Serializes exists() + save() of a name, and stats, between workers.
+        self.lock = threading.Lock()
+        self.stats = {"downloaded": 0, "not_modified": 0, "skipped": 0, "failed": 0}
+
+    def _count(self, outcome: str) -> None:
+        with self.lock:
+            self.stats[outcome] += 1
+
+    def _session(self) -> requests.Session:
+        """One HTTP session (connection pool) per worker thread."""
+        if not hasattr(self.local, "session"):
+            self.local.session = requests.Session()
+        return self.local.session
+
+    def _store(self, content: bytes, extension: str) -> str:
+        name = content_name(content, extension)
+        with self.lock:
+            if not default_storage.exists(name):
+                default_storage.save(name, ContentFile(content))
+        return name
+
+    def _fetch(self, source: str, known: Optional[MirroredImage]) -> Optional[dict]:
+        """
+        Download one image, conditionally when it was mirrored before.
+        Returns the fields of its MirroredImage, or None on failure.
+        """
+        headers = {}
+        if known is not None:
+            if known.etag:
+                headers["If-None-Match"] = known.etag
+            if known.last_modified:
+                headers["If-Modified-Since"] = known.last_modified
+        try:
+            response = self._session().get(
+                f"{self.base_url}/{source}", headers=headers, timeout=self.timeout
+            )
+            if response.status_code == 304 and known is not None:
+                self._count("not_modified")
+                return {
+                    "name": known.name,
+                    "etag": known.etag,
+                    "last_modified": known.last_modified,
+                }
+            response.raise_for_status()
+            name = self._store(response.content, PurePosixPath(source).suffix)
+        except (requests.RequestException, OSError):
+            logger.warning("Could not mirror TMDb image %s", source, exc_info=True)
+            self._count("failed")
+            return None
+        self._count("downloaded")
+        return {
+            "name": name,
+            "etag": response.headers.get("ETag", ""),
+            "last_modified": response.headers.get("Last-Modified", ""),
+        }
+
+    def mirror(self, paths: Iterable[Optional[str]], size: str) -> Dict[str, str]:
+        """
+        Mirror TMDb file paths (e.g. a movie's ``poster_path``) at ``size``.
+        Returns the storage name of each path mirrored. Failed downloads are
+        left out, unless an earlier copy is still stored (failed refreshes).
+        """
+        sources = {}
+        for path in paths:
+            if path and PurePosixPath(path).suffix.lower() in EXTENSIONS:
+                sources[f"{size}/{path.lstrip('/')}"] = path
+        known = {}
+        for chunk in _chunks(list(sources), LOOKUP_CHUNK):
+            known.update(
+                (image.source, image)
+                for image in MirroredImage.objects.filter(source__in=chunk)
+            )
+
+        names, todo = {}, []
+        for source, path in sources.items():
+            image = known.get(source)
+            if image is not None and not default_storage.exists(image.name):
+                # The file went missing: download it again, unconditionally.
+                del known[source]
+                image = None
+            if image is not None and not self.refresh:
+                names[path] = image.name
+                self.stats["skipped"] += 1
+            else:
+                todo.append(source)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            fetched = list(
+                pool.map(lambda source: self._fetch(source, known.get(source)), todo)
+            )
+        now = timezone.now()
+        rows = []
+        for source, fields in zip(todo, fetched):
+            if fields is not None:
+                names[sources[source]] = fields["name"]
+                rows.append(MirroredImage(source=source, fetched_at=now, **fields))
+            elif source in known:
+                names[sources[source]] = known[source].name
+        MirroredImage.objects.bulk_create(
+            rows,
+            batch_size=LOOKUP_CHUNK,
+            update_conflicts=True,
+            unique_fields=["source"],
+            update_fields=["name", "etag", "last_modified", "fetched_at"],
+        )
+        return names
@@ -0,0 +1,560 @@
+"""
+Read-only catalogue snapshot serving the film list and detail reads.
+
+write_snapshot() dumps the live films into one binary file: fixed-width
+columns (ids, dates, choice codes, amounts) as native arrays, genre and
+author ids as offsets into flat id arrays, and the list and detail
+payload of each film as JSON in two blobs, indexed by a JSON footer.
+Queries are prepared at write time too: the rows of each genre and
+author, and each sort order as a permutation of the rows.
+Every worker maps the file with mmap and reads the columns through
+memoryviews: nothing is parsed up front and the pages are shared by all
+processes through the OS page cache.
+
+A new snapshot atomically replaces the file, and workers remap it once
+they notice. Writes to films, authors or genres, from any process, mark
+the snapshot stale in a file next to it (``<snapshot>.changed``): reads go
+to the database until the next snapshot is written.
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from manage_movies.models import Author, Film, Genre
+from manage_movies.serializers import FilmDetailSerializer, FilmSerializer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"HMCSNAP2"
+MAGIC_SIZE = len(MAGIC)
+# Footer: JSON index, then its offset and MAGIC again.
+TRAILER = struct.Struct("<Q8s")
+# Seconds between checks for a newer snapshot file or change marker.
+CHECK_INTERVAL = 1.0
+NULL = -(2**63)
+CHUNK_SIZE = 2000
+
+# Ordering field: column holding its sort key.
+SORT_COLUMNS = {
+    "id": "id",
+    "title": "title_rank",
+    "release_date": "release_date",
+    "created_at": "created_at",
+    "budget": "budget",
+    "box_office": "box_office",
+}
+# Filtered rows fewer than count / SORT_THRESHOLD are sorted, more are
+# picked from the precomputed permutation.
+SORT_THRESHOLD = 16
+RELATIONS = ("genre", "author")
+
+# Column: array typecode.
+COLUMNS = {
+    "id": "q",
+    "title_rank": "i",
+    "release_date": "i",
+    "created_at": "d",
+    "created_day": "i",
+    "rating": "b",
+    "status": "b",
+    "tmdb": "b",
+    "budget": "q",
+    "box_office": "q",
+    "genre_offsets": "Q",
+    "genre_ids": "q",
+    "author_offsets": "Q",
+    "author_ids": "q",
+    "list_offsets": "Q",
+    "detail_offsets": "Q",
+}
+# Rows by genre / author: their sorted ids, offsets into the rows.
+COLUMNS.update(
+    {
+        f"{name}_index_{part}": typecode
+        for name in RELATIONS
+        for part, typecode in (("ids", "q"), ("offsets", "Q"), ("rows", "i"))
+    }
+)
+# Rows in each order, ties by id: ascending (NULLs last) and descending
+# (NULLs first), as on PostgreSQL.
+COLUMNS.update(
+    {
+        f"{field}_{way}": "i"
+        for field in SORT_COLUMNS
+        if field != "id"
+        for way in ("asc", "desc")
+    }
+)
+BLOBS = ("list_blob", "detail_blob")
+
+
+def _dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, default=JSONEncoder().default)
+    return json.dumps(data, cls=JSONEncoder, separators=(",", ":")).encode()
+
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+# ——— Writing —————————————————————————————————————————————————————————————————
+
+
+def collect_films() -> Iterable[dict]:
+    """
+    The live films in id order with everything the snapshot stores, read
+    CHUNK_SIZE at a time.
+    """
+    # Titles ranked in the database's collation, equal titles alike.
+    ranks, rank, previous = {}, -1, None
+    for pk, title in Film.objects.order_by("title", "id").values_list("pk", "title"):
+        if title != previous:
+            rank, previous = rank + 1, title
+        ranks[pk] = rank
+    films = Film.objects.order_by("pk").prefetch_related(
+        Prefetch("authors", queryset=Author.objects.only("id")),
+        Prefetch("genres", queryset=Genre.objects.only("id")),
+    )
+    for film in films.iterator(chunk_size=CHUNK_SIZE):
+        row = {name: getattr(film, name) for name in FilmSerializer.values_fields}
+        yield {
+            "id": film.pk,
+            "title_rank": ranks.get(film.pk, len(ranks)),
+            "release_date": film.release_date,
+            "created_at": film.created_at,
+            "rating": film.rating,
+            "status": film.status,
+            "tmdb_id": film.tmdb_id,
+            "budget": film.budget,
+            "box_office": film.box_office,
+            "genres": [genre.pk for genre in film.genres.all()],
+            "authors": [author.pk for author in film.authors.all()],
+            "list": FilmSerializer.from_values([row])[0],
+            "detail": FilmDetailSerializer(film).data,
+        }
+
+
+def pack(films: Iterable[dict], genres: Dict[str, int], created_at: float) -> bytes:
+    """Encode films (as collect_films() yields them) into a snapshot."""
+    ratings, statuses = Film.RatingChoices.values, Film.StatusChoices.values
+    columns = {name: array(typecode) for name, typecode in COLUMNS.items()}
+    blobs = {name: bytearray() for name in BLOBS}
+    for name in ("genre_offsets", "author_offsets", "list_offsets", "detail_offsets"):
+        columns[name].append(0)
+    for film in films:
+        columns["id"].append(film["id"])
+        columns["title_rank"].append(film["title_rank"])
+        columns["release_date"].append(film["release_date"].toordinal())
+        columns["created_at"].append(film["created_at"].timestamp())
+        columns["created_day"].append(
+            timezone.localdate(film["created_at"]).toordinal()
+        )
+        columns["rating"].append(ratings.index(film["rating"]))
+        columns["status"].append(statuses.index(film["status"]))
+        columns["tmdb"].append(film["tmdb_id"] is not None)
+        for name in ("budget", "box_office"):
+            columns[name].append(NULL if film[name] is None else film[name])
+        for name in RELATIONS:
+            columns[f"{name}_ids"].extend(film[f"{name}s"])
+            columns[f"{name}_offsets"].append(len(columns[f"{name}_ids"]))
+        for name in ("list", "detail"):
+            blobs[f"{name}_blob"] += _dumps(film[name])
+            columns[f"{name}_offsets"].append(len(blobs[f"{name}_blob"]))
+    _index_relations(columns)
+    _sort_rows(columns)
+
+    out = bytearray(MAGIC)
+    sections = {}
+    for name, data in [*columns.items(), *blobs.items()]:
+        out += bytes(-len(out) % 8)
+        start = len(out)
+        out += data
+        sections[name] = [start, len(out)]
+    footer = {
+        "byteorder": sys.byteorder,
+        "created_at": created_at,
+        "count": len(columns["id"]),
+        "ratings": ratings,
+        "statuses": statuses,
+        "genres": genres,
+        "sections": sections,
+    }
+    offset = len(out)
+    out += _dumps(footer)
+    out += TRAILER.pack(offset, MAGIC)
+    return bytes(out)
+
+
+def _index_relations(columns: Dict[str, array]) -> None:
+    """Fill the genre and author indexes: their rows, by id."""
+    for name in RELATIONS:
+        offsets, ids = columns[f"{name}_offsets"], columns[f"{name}_ids"]
+        rows_by_id = defaultdict(list)
+        for row, (start, end) in enumerate(zip(offsets, offsets[1:])):
+            for pk in ids[start:end]:
+                rows_by_id[pk].append(row)
+        index_offsets = columns[f"{name}_index_offsets"]
+        index_offsets.append(0)
+        for pk in sorted(rows_by_id):
+            columns[f"{name}_index_ids"].append(pk)
+            columns[f"{name}_index_rows"].extend(rows_by_id[pk])
+            index_offsets.append(len(columns[f"{name}_index_rows"]))
+
+
+def _sort_rows(columns: Dict[str, array]) -> None:
+    """Fill the permutations of the rows in each order, ties by id (row)."""
+    rows = range(len(columns["id"]))
+    for field, name in SORT_COLUMNS.items():
+        if field == "id":
+            continue
+        key = _sort_key(columns[name], field)
+        columns[f"{field}_asc"].extend(sorted(rows, key=key))
+        # Sorts stay stable reversed: equal keys keep their row order.
+        columns[f"{field}_desc"].extend(sorted(rows, key=key, reverse=True))
+
+
+def write_snapshot(path: Optional[str] = None) -> int:
+    """
+    Snapshot the live catalogue into ``path`` (CATALOGUE_SNAPSHOT by
+    default), replacing the previous snapshot atomically. Returns the
+    number of films written.
+    """
+    path = path or settings.CATALOGUE_SNAPSHOT
+    # Taken first: any write from now on makes this snapshot stale.
+    created_at = time.time()
+    genres = dict(Genre.objects.values_list("name", "pk"))
+    data = pack(collect_films(), genres, created_at)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    # Workers keep reading the previous file, still mapped, until they remap.
+    os.replace(temporary, path)
+    return Snapshot(data).count
+
+
+def _marker(path: str) -> str:
+    return f"{path}.changed"
+
+
+def _write_marker(path: str) -> None:
+    global _changed_at
+    changed_at = time.time()
+    # This worker stops reading the snapshot at once, the others within
+    # CHECK_INTERVAL.
+    _changed_at = max(_changed_at, changed_at)
+    temporary = f"{_marker(path)}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, "w") as file:
+            file.write(repr(changed_at))
+        os.replace(temporary, _marker(path))
+    except OSError:
+        logger.exception("Could not mark the catalogue snapshot %s stale", path)
+
+
+def mark_changed() -> None:
+    """
+    Make the current snapshot stale, for every process, once the
+    transaction commits.
+    """
+    path = getattr(settings, "CATALOGUE_SNAPSHOT", "")
+    if path:
+        transaction.on_commit(lambda: _write_marker(path))
+
+
+def changed_at(path: str) -> float:
+    """When the catalogue last changed (epoch seconds, 0 if never marked)."""
+    try:
+        with open(_marker(path)) as file:
+            return float(file.read())
+    except FileNotFoundError:
+        return 0.0
+    except (OSError, ValueError):
+        logger.exception("Could not read the catalogue change marker of %s", path)
+        # Assume a change: the database is never wrong.
+        return time.time()
+
+
+def is_stale(path: str) -> bool:
+    """Whether the snapshot at ``path`` is missing or older than a change."""
+    try:
+        snapshot = Snapshot.open(path)
+    except (OSError, ValueError):
+        return True
+    return snapshot.created_at < changed_at(path)
+
+
+# ——— Reading —————————————————————————————————————————————————————————————————
+
+
+def _sort_key(column, field):
+    if field in ("budget", "box_office"):
+        return lambda row: (column[row] == NULL, column[row])
+    return column.__getitem__
+
+
+def _csv_values(params, name, lower=True):
+    values = [v.strip() for v in params.get(name, "").split(",") if v.strip()]
+    return {v.lower() for v in values} if lower else values
+
+
+class Snapshot:
+    """
+    A snapshot over any buffer, usually a read-only mmap of the file:
+    columns are memoryviews cast to their type, payloads decoded on read.
+    """
+
+    def __init__(self, buffer, identity=None) -> None:
+        view = memoryview(buffer)
+        if len(view) < MAGIC_SIZE + TRAILER.size:
+            raise ValueError("Not a catalogue snapshot.")
+        end = len(view) - TRAILER.size
+        offset, magic = TRAILER.unpack_from(view, end)
+        if view[:MAGIC_SIZE] != MAGIC or magic != MAGIC:
+            raise ValueError("Not a catalogue snapshot.")
+        footer = _loads(bytes(view[offset:end]))
+        if footer["byteorder"] != sys.byteorder:
+            raise ValueError("Snapshot written on a different architecture.")
+        self.identity = identity
+        self.buffer = buffer
+        self.created_at = footer["created_at"]
+        self.count = footer["count"]
+        self.ratings = footer["ratings"]
+        self.statuses = footer["statuses"]
+        self.genres = footer["genres"]
+        self.columns = {}
+        for name, (start, end) in footer["sections"].items():
+            section = view[start:end]
+            self.columns[name] = (
+                section.cast(COLUMNS[name]) if name in COLUMNS else section
+            )
+
+    @classmethod
+    def open(cls, path: str) -> "Snapshot":
+        with open(path, "rb") as file:
+            stat = os.fstat(file.fileno())
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer, identity=(stat.st_ino, stat.st_mtime_ns))
+
+    def _payload(self, kind: str, row: int) -> dict:
+        offsets = self.columns[f"{kind}_offsets"]
+        blob = self.columns[f"{kind}_blob"]
+        start, end = offsets[row], offsets[row + 1]
+        return _loads(bytes(blob[start:end]))
+
+    def _rows_with(self, kind: str, wanted: set) -> set:
+        """Rows related to any of the ``wanted`` genre or author ids."""
+        ids = self.columns[f"{kind}_index_ids"]
+        offsets = self.columns[f"{kind}_index_offsets"]
+        rows = self.columns[f"{kind}_index_rows"]
+        matching = set()
+        for pk in wanted - {None}:
+            position = bisect_left(ids, pk)
+            if position < len(ids) and ids[position] == pk:
+                start, end = offsets[position], offsets[position + 1]
+                matching.update(rows[start:end])
+        return matching
+
+    def films(self, rows: Iterable[int], fields: Sequence[str]) -> List[dict]:
+        """List payloads of rows, restricted to ``fields``."""
+        payloads = (self._payload("list", row) for row in rows)
+        return [{name: payload[name] for name in fields} for payload in payloads]
+
+    def film_detail(self, pk: int) -> Optional[dict]:
+        """Detail payload of a film, None when the snapshot does not have it."""
+        ids = self.columns["id"]
+        row = bisect_left(ids, pk)
+        if row == len(ids) or ids[row] != pk:
+            return None
+        return self._payload("detail", row)
+
+    def _between(self, field: str, low=None, high=None) -> set:
+        """
+        Rows whose ``field`` lies within [low, high] (None: unbounded), a
+        slice of its ascending permutation. NULLs, sorted last, never match.
+        """
+        permutation = self.columns[f"{field}_asc"]
+        key = _sort_key(self.columns[SORT_COLUMNS[field]], field)
+        amounts = field in ("budget", "box_office")
+
+        def bound(value):
+            return (False, value) if amounts else value
+
+        start = 0 if low is None else bisect_left(permutation, bound(low), key=key)
+        if high is not None:
+            end = bisect_right(permutation, bound(high), key=key)
+        elif amounts:
+            end = bisect_left(permutation, (True, NULL), key=key)
+        else:
+            end = len(permutation)
+        return set(permutation[start:end])
+
+    def select(self, params, ordering: Sequence[str]) -> List[int]:
+        """
+        Rows of the films matching film list parameters, already validated
+        by compile_film_filters(), in ``ordering``. Mirrors filter_films():
+        NULL amounts match no range and sort last (first descending), as
+        on PostgreSQL. Indexed filters (genres, authors, ranges) go first,
+        the columns scanned after them only hold the rows left.
+        """
+        columns = self.columns
+        rows = range(self.count)
+
+        def narrow(matching: set):
+            nonlocal rows
+            if len(rows) == self.count:
+                rows = sorted(matching)
+            else:
+                rows = [row for row in rows if row in matching]
+
+        def keep(column, test):
+            return [row for row in rows if test(column[row])]
+
+        genres = _csv_values(params, "genre", lower=False)
+        if genres:
+            wanted = {int(g) if g.isdigit() else self.genres.get(g) for g in genres}
+            narrow(self._rows_with("genre", wanted))
+        authors = _csv_values(params, "author", lower=False)
+        if authors:
+            narrow(self._rows_with("author", {int(a) for a in authors}))
+
+        dates = [params.get(f"release_date_{end}") for end in ("after", "before")]
+        if any(dates):
+            narrow(
+                self._between(
+                    "release_date",
+                    *(parse_date(day).toordinal() if day else None for day in dates),
+                )
+            )
+        for name in ("budget", "box_office"):
+            amounts = [params.get(f"{name}_{end}") for end in ("min", "max")]
+            if any(amounts):
+                narrow(
+                    self._between(
+                        name, *(int(amount) if amount else None for amount in amounts)
+                    )
+                )
+
+        for param, after in (("created_at_after", True), ("created_at_before", False)):
+            if params.get(param):
+                day = parse_date(params[param]).toordinal()
+                test = day.__le__ if after else day.__ge__
+                rows = keep(columns["created_day"], test)
+
+        for name, choices in (("rating", self.ratings), ("status", self.statuses)):
+            values = _csv_values(params, name)
+            if values:
+                codes = {
+                    code
+                    for code, choice in enumerate(choices)
+                    if choice.lower() in values
+                }
+                rows = keep(columns[name], codes.__contains__)
+
+        source = params.get("source")
+        if source in ("admin", "tmdb"):
+            rows = keep(columns["tmdb"], (source == "tmdb").__eq__)
+
+        return self._order(rows, ordering)
+
+    def _order(self, rows: Sequence[int], ordering: Sequence[str]) -> List[int]:
+        """Rows, in id order, put in ``ordering``."""
+        fields = [name.lstrip("-") for name in ordering]
+        if fields in ([], ["id"]):
+            return list(reversed(rows)) if ordering == ["-id"] else list(rows)
+        if (
+            len(fields) == 2
+            and fields[0] != "id"
+            and fields[1] == "id"
+            and len(rows) * SORT_THRESHOLD >= self.count
+        ):
+            # One field, ties by id: its permutation, filtered. Reversed,
+            # the ascending one is descending with ties by -id, and so on.
+            descending = ordering[0].startswith("-")
+            by_last_id = ordering[1] == "-id"
+            way = "asc" if descending == by_last_id else "desc"
+            permutation = self.columns[f"{fields[0]}_{way}"]
+            if by_last_id:
+                permutation = permutation[::-1]
+            if len(rows) == self.count:
+                return permutation.tolist()
+            kept = bytearray(self.count)
+            for row in rows:
+                kept[row] = 1
+            return [row for row in permutation if kept[row]]
+        rows = list(rows)
+        # Stable sorts, least significant key first.
+        for name, field in zip(reversed(ordering), reversed(fields)):
+            rows.sort(
+                key=_sort_key(self.columns[SORT_COLUMNS[field]], field),
+                reverse=name.startswith("-"),
+            )
+        return rows
+
+
+_snapshot: Optional[Snapshot] = None
+_changed_at = 0.0
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def get_snapshot() -> Optional[Snapshot]:
+    """
+    The current snapshot, mapped or remapped when the file changed; None
+    when disabled, missing or stale.
+    """
+    global _snapshot, _changed_at, _checked_at
+    path = getattr(settings, "CATALOGUE_SNAPSHOT", "")
+    if not path:
+        return None
+    now = time.monotonic()
+    if now - _checked_at >= CHECK_INTERVAL:
+        with _lock:
+            if now - _checked_at >= CHECK_INTERVAL:
+                _snapshot = _reload(path, _snapshot)
+                _changed_at = max(_changed_at, changed_at(path))
+                _checked_at = now
+    snapshot = _snapshot
+    if snapshot is None or snapshot.created_at < _changed_at:
+        return None
+    return snapshot
+
+
+def _reload(path: str, current: Optional[Snapshot]) -> Optional[Snapshot]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    if current is not None and current.identity == (stat.st_ino, stat.st_mtime_ns):
+        return current
+    try:
+        snapshot = Snapshot.open(path)
+    except (OSError, ValueError):
+        logger.exception("Could not map the catalogue snapshot %s", path)
+        return None
+    logger.info("Mapped catalogue snapshot %s: %d films", path, snapshot.count)
+    return snapshot
@@ -0,0 +1,147 @@
+import logging
+import threading
+from typing import Dict, Tuple
+
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+# Release year, per database vendor.
+YEAR_SQL = {
+    "postgresql": "CAST(EXTRACT(YEAR FROM f.release_date) AS INTEGER)",
+    "sqlite": "CAST(strftime('%Y', f.release_date) AS INTEGER)",
+}
+
+FINANCIALS_SQL = """
+    COUNT(*) AS film_count,
+    CAST(SUM(f.budget) AS BIGINT) AS total_budget,
+    CAST(SUM(f.box_office) AS BIGINT) AS total_box_office,
+    CAST(SUM(CASE WHEN f.budget > 0 AND f.box_office IS NOT NULL
+                  THEN f.box_office END) AS DOUBLE PRECISION)
+      / SUM(CASE WHEN f.budget > 0 AND f.box_office IS NOT NULL
+                 THEN f.budget END) AS roi
+"""
+
+# name -> (unique key column, SELECT statement). Migration 0004 created the
+# views from a copy: changing one here needs a migration recreating it.
+STATS_VIEWS: Dict[str, Tuple[str, str]] = {
+    "manage_movies_stats_year": (
+        "year",
+        f"""
+        SELECT {{year}} AS year, {FINANCIALS_SQL}
+        FROM manage_movies_film f
+        GROUP BY {{year}}
+        """,
+    ),
+    "manage_movies_stats_genre": (
+        "genre_id",
+        f"""
+        SELECT g.id AS genre_id, g.name AS genre_name, {FINANCIALS_SQL}
+        FROM manage_movies_film f
+        JOIN manage_movies_film_genres fg ON fg.film_id = f.id
+        JOIN manage_movies_genre g ON g.id = fg.genre_id
+        GROUP BY g.id, g.name
+        """,
+    ),
+    "manage_movies_stats_director": (
+        "author_id",
+        f"""
+        SELECT a.id AS author_id, a.name AS author_name, {FINANCIALS_SQL}
+        FROM manage_movies_film f
+        JOIN manage_movies_film_authors fa ON fa.film_id = f.id
+        JOIN manage_movies_author a ON a.id = fa.author_id
+        GROUP BY a.id, a.name
+        """,
+    ),
+    "manage_movies_stats_rating": (
+        "key",
+        """
+        SELECT f.rating || '/' || f.status AS key,
+               f.rating AS rating,
+               f.status AS status,
+               COUNT(*) AS film_count,
+               CAST(COALESCE(SUM(r.rating_count), 0) AS INTEGER) AS rating_count,
+               CAST(SUM(r.score_sum) AS DOUBLE PRECISION)
+                 / NULLIF(SUM(r.rating_count), 0) AS average_score
+        FROM manage_movies_film f
+        LEFT JOIN (
+            SELECT object_id, COUNT(*) AS rating_count, SUM(score) AS score_sum
+            FROM manage_movies_rating
+            WHERE content_type_id = (
+                SELECT id FROM django_content_type
+                WHERE app_label = 'manage_movies' AND model = 'film'
+            )
+            GROUP BY object_id
+        ) r ON r.object_id = f.id
+        GROUP BY f.rating, f.status
+        """,
+    ),
+}
+
+
+def _select(sql: str, vendor: str) -> str:
+    """Render a statistics SELECT for a database vendor."""
+    return sql.format(year=YEAR_SQL.get(vendor, YEAR_SQL["sqlite"]))
+
+
+def refresh_stats(concurrently: bool = True) -> None:
+    """
+    Recompute every statistics view. On PostgreSQL the refresh runs
+    CONCURRENTLY so readers are never blocked; elsewhere the fallback
+    tables are rebuilt in a single transaction.
+    """
+    vendor = connection.vendor
+    with connection.cursor() as cursor:
+        if vendor == "postgresql":
+            option = " CONCURRENTLY" if concurrently else ""
+            for name in STATS_VIEWS:
+                cursor.execute(f"REFRESH MATERIALIZED VIEW{option} {name}")
+            return
+        with transaction.atomic():
+            for name, (_, sql) in STATS_VIEWS.items():
+                cursor.execute(f"DELETE FROM {name}")
+                cursor.execute(f"INSERT INTO {name} {_select(sql, vendor)}")
+
+
+# ——— Deferred refresh ————————————————————————————————————————————————————————
+
+_refreshing = False
+_pending = False
+_lock = threading.Lock()
+
+
+def _refresh_in_background() -> None:
+    global _refreshing, _pending
+    try:
+        while True:
+            with _lock:
+                _pending = False
+            try:
+                refresh_stats()
+            except Exception:
+                logger.exception("Could not refresh the statistics")
+            with _lock:
+                if not _pending:
+                    _refreshing = False
+                    return
+    finally:
+        connection.close()
+
+
+def _start_refresh() -> None:
+    global _pending, _refreshing
+    with _lock:
+        if _refreshing:
+            _pending = True
+            return
+        _refreshing = True
+    threading.Thread(target=_refresh_in_background, daemon=True).start()
+
+
+def schedule_refresh() -> None:
+    """
+    Refresh the statistics in a background thread once the current
+    transaction commits, off the request. Refreshes requested while one
+    runs are coalesced into a single next one.
+    """
+    transaction.on_commit(_start_refresh)
@@ -0,0 +1,456 @@
+import io
+import json
+import random
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import django
+from accounts.models import Spectator
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, connections, transaction
+from django.db.models import Max
+from manage_movies.models import Author, Film, Genre, Rating
+
+GENRE_NAMES = [
+    "Action",
+    "Adventure",
+    "Animation",
+    "Comedy",
+    "Crime",
+    "Documentary",
+    "Drama",
+    "Family",
+    "Fantasy",
+    "History",
+    "Horror",
+    "Music",
+    "Mystery",
+    "Romance",
+    "Science Fiction",
+    "TV Movie",
+    "Thriller",
+    "War",
+    "Western",
+]
+
+FIRST_RELEASE = date(1950, 1, 1)
+RELEASE_SPAN_DAYS = (date(2026, 12, 31) - FIRST_RELEASE).days
+# Rows get a creation date spread over this many days before the run.
+HISTORY_DAYS = 5 * 365
+# Scores lean towards 4, like real rating sites.
+SCORE_WEIGHTS = [0.06, 0.1, 0.22, 0.36, 0.26]
+
+# Film ids shared with the worker processes, ordered by popularity.
+_film_ids: List[int] = []
+
+
+def _chunks(iterable: Iterable, size: int) -> Iterator[List]:
+    """Yield successive lists of at most ``size`` items."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def skewed_index(rng: random.Random, size: int, exponent: float = 3.0) -> int:
+    """
+    Draw an index in ``range(size)`` following a power law: low indexes
+    (the most popular films, the busiest directors) come up far more often.
+    """
+    return min(size - 1, int(size * rng.random() ** exponent))
+
+
+def _copy_value(value: Any) -> str:
+    """Encode a value for COPY ... FROM STDIN (text format)."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def insert_rows(
+    model, fields: Sequence[str], rows: Iterable[Sequence[Any]], chunk_size: int
+) -> int:
+    """
+    Insert raw rows (values in ``fields`` order, by attname) chunk by chunk:
+    COPY on PostgreSQL, ``bulk_create`` elsewhere. Returns the row count.
+    """
+    count = 0
+    if connection.vendor == "postgresql":
+        columns = ", ".join(
+            connection.ops.quote_name(model._meta.get_field(name).column)
+            for name in fields
+        )
+        sql = (
+            f"COPY {connection.ops.quote_name(model._meta.db_table)} "
+            f"({columns}) FROM STDIN"
+        )
+        with connection.cursor() as cursor:
+            for chunk in _chunks(rows, chunk_size):
+                buffer = io.StringIO()
+                for row in chunk:
+                    buffer.write("\t".join(_copy_value(v) for v in row) + "\n")
+                buffer.seek(0)
+                cursor.cursor.copy_expert(sql, buffer)
+                count += len(chunk)
+        return count
+    for chunk in _chunks(rows, chunk_size):
+        with transaction.atomic():
+            model._base_manager.bulk_create(
+                model(**dict(zip(fields, row))) for row in chunk
+            )
+        count += len(chunk)
+    return count
+
+
+def _insert_with_ids(
+    model, fields: Sequence[str], rows: Iterable[Sequence[Any]], chunk_size: int
+) -> List[int]:
+    """Insert rows and return their primary keys (assumes a single writer)."""
+    last = model._base_manager.aggregate(last=Max("pk"))["last"] or 0
+    insert_rows(model, fields, rows, chunk_size)
+    return list(
+        model._base_manager.filter(pk__gt=last)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+
+def _created_at(rng: random.Random, now: datetime) -> datetime:
+    return now - timedelta(seconds=rng.randrange(HISTORY_DAYS * 86_400))
+
+
+def _film_rows(seed: int, start: int, count: int) -> Iterator[tuple]:
+    rng = random.Random(f"{seed}:films:{start}")
+    now = datetime.now(dt_timezone.utc)
+    ratings, statuses = Film.RatingChoices.values, Film.StatusChoices.values
+    for index in range(start, start + count):
+        budget = None
+        if rng.random() < 0.7:
+            budget = int(rng.lognormvariate(16.5, 1.2))
+        yield (
+            f"Synthetic film {index}",
+            "Synthetic film generated for load testing.",
+            FIRST_RELEASE + timedelta(days=rng.randrange(RELEASE_SPAN_DAYS)),
+            rng.random() < 0.02,
+            rng.choice(ratings),
+            rng.choice(statuses),
+            budget,
+            int(budget * rng.lognormvariate(0.5, 0.8)) if budget else None,
+            _created_at(rng, now),
+            None,
+            False,
+            "",
+            "",
+        )
+
+
+FILM_FIELDS = [
+    "title",
+    "description",
+    "release_date",
+    "adult",
+    "rating",
+    "status",
+    "budget",
+    "box_office",
+    "created_at",
+    "tmdb_id",
+    "archived",
+    "poster_path",
+    "backdrop_path",
+]
+
+
+def _author_rows(seed: int, start: int, count: int) -> Iterator[tuple]:
+    rng = random.Random(f"{seed}:authors:{start}")
+    genders = Author.GenderChoices.values
+    for index in range(start, start + count):
+        birth = date(1920, 1, 1) + timedelta(days=rng.randrange(30_000))
+        yield (
+            f"Synthetic author {index}",
+            birth,
+            None,
+            "",
+            "Unknown",
+            rng.choice(genders),
+            None,
+            "",
+        )
+
+
+AUTHOR_FIELDS = [
+    "name",
+    "birth_date",
+    "death_date",
+    "biography",
+    "place_of_birth",
+    "gender",
+    "tmdb_id",
+    "profile_path",
+]
+
+
+def _spectator_rows(start: int, count: int) -> Iterator[tuple]:
+    now = datetime.now(dt_timezone.utc)
+    for index in range(start, start + count):
+        # "!" is an unusable password: synthetic spectators cannot log in.
+        flags = (False, False, True)  # is_superuser, is_staff, is_active
+        yield (f"spectator_{index}", "!", "", "", "", *flags, now, "", "", {})
+
+
+SPECTATOR_FIELDS = [
+    "username",
+    "password",
+    "first_name",
+    "last_name",
+    "email",
+    "is_superuser",
+    "is_staff",
+    "is_active",
+    "date_joined",
+    "bio",
+    "avatar",
+    "avatar_thumbnails",
+]
+
+
+def _share_film_ids(film_ids: List[int]) -> None:
+    global _film_ids
+    _film_ids = film_ids
+
+
+def _init_worker(film_ids: List[int]) -> None:
+    """Set up Django and the shared film ids in a worker process."""
+    django.setup()
+    _share_film_ids(film_ids)
+
+
+def _write_film_links(task: tuple) -> int:
+    """Give a slice of films one or two directors and one to three genres."""
+    seed, first, last, author_ids, genre_ids, chunk_size = task
+    rng = random.Random(f"{seed}:links:{first}")
+    film_ids = _film_ids[first:last]
+    authors, genres = [], []
+    for film_id in film_ids:
+        directors = {skewed_index(rng, len(author_ids))}
+        if rng.random() < 0.1:
+            directors.add(skewed_index(rng, len(author_ids)))
+        authors.extend((film_id, author_ids[i]) for i in directors)
+        genres.extend(
+            (film_id, genre_id)
+            for genre_id in rng.sample(
+                genre_ids, min(len(genre_ids), rng.randint(1, 3))
+            )
+        )
+    insert_rows(Film.authors.through, ["film_id", "author_id"], authors, chunk_size)
+    insert_rows(Film.genres.through, ["film_id", "genre_id"], genres, chunk_size)
+    return len(film_ids)
+
+
+def _distinct_films(rng: random.Random, count: int) -> Iterator[int]:
+    """Yield ``count`` distinct film ids, popular films first in likelihood."""
+    size = len(_film_ids)
+    if count * 4 > size:
+        yield from (_film_ids[i] for i in rng.sample(range(size), count))
+        return
+    seen = set()
+    while len(seen) < count:
+        index = skewed_index(rng, size, exponent=2.0)
+        if index not in seen:
+            seen.add(index)
+            yield _film_ids[index]
+
+
+def _write_activity(task: tuple) -> Dict[str, int]:
+    """Write the ratings and favorites of a slice of spectators."""
+    seed, spectators, film_type_id, chunk_size = task
+    first_id = spectators[0][0] if spectators else 0
+    rng = random.Random(f"{seed}:activity:{first_id}")
+    now = datetime.now(dt_timezone.utc)
+
+    def ratings():
+        for spectator_id, rating_count, _ in spectators:
+            for film_id in _distinct_films(rng, rating_count):
+                created_at = _created_at(rng, now)
+                score = rng.choices(range(1, 6), SCORE_WEIGHTS)[0]
+                yield (
+                    spectator_id,
+                    film_type_id,
+                    film_id,
+                    score,
+                    "",
+                    created_at,
+                    created_at,
+                )
+
+    def favorites():
+        for spectator_id, _, favorite_count in spectators:
+            for film_id in _distinct_films(rng, favorite_count):
+                yield spectator_id, film_id
+
+    rating_fields = [
+        "spectator_id",
+        "content_type_id",
+        "object_id",
+        "score",
+        "comment",
+        "created_at",
+        "updated_at",
+    ]
+    return {
+        "ratings": insert_rows(Rating, rating_fields, ratings(), chunk_size),
+        "favorites": insert_rows(
+            Spectator.favorites.through,
+            ["spectator_id", "film_id"],
+            favorites(),
+            chunk_size,
+        ),
+    }
+
+
+def _allocate(
+    rng: random.Random, total: int, buckets: int, cap: int, exponent: float = 1.0
+) -> List[int]:
+    """
+    Split ``total`` across ``buckets`` along a Zipf law (a few very active
+    spectators, a long tail of occasional ones), at most ``cap`` each.
+    """
+    if not buckets or not cap:
+        return [0] * buckets
+    weights = [1 / (rank + 1) ** exponent for rank in range(buckets)]
+    rng.shuffle(weights)
+    scale = total / sum(weights)
+    counts = [min(cap, int(weight * scale)) for weight in weights]
+    missing = min(total, cap * buckets) - sum(counts)
+    index = 0
+    while missing > 0:
+        if counts[index] < cap:
+            counts[index] += 1
+            missing -= 1
+        index = (index + 1) % buckets
+    return counts
+
+
+def _run(
+    function: Callable, tasks: List[tuple], workers: int, film_ids: List[int]
+) -> List[Any]:
+    """Run tasks in worker processes (PostgreSQL) or in this process."""
+    if workers <= 1 or connection.vendor != "postgresql":
+        _share_film_ids(film_ids)
+        return [function(task) for task in tasks]
+    connections.close_all()
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(film_ids,)
+    ) as pool:
+        return list(pool.map(function, tasks))
+
+
+def _next_index(model) -> int:
+    """
+    First name suffix of new synthetic rows: the highest primary key. A
+    row's suffix is always below its primary key, so this is past every
+    suffix still in use, even after deletions.
+    """
+    return model._base_manager.aggregate(last=Max("pk"))["last"] or 0
+
+
+def seed_catalogue(
+    films: int,
+    authors: Optional[int] = None,
+    spectators: Optional[int] = None,
+    favorites: Optional[int] = None,
+    ratings: Optional[int] = None,
+    seed: int = 0,
+    chunk_size: int = 10_000,
+    workers: int = 1,
+    progress: Optional[Callable[[str], None]] = None,
+) -> Dict[str, int]:
+    """
+    Add a reproducible synthetic catalogue and return the created counts.
+
+    Films get one (sometimes two) directors drawn from a power law, so a
+    few directors sign many films, and one to three genres. Spectator
+    activity follows a Zipf law and favorites and ratings go to popular
+    films first; a spectator never rates the same film twice.
+
+    Rows are written with COPY on PostgreSQL (``bulk_create`` elsewhere);
+    links, ratings and favorites are split across ``workers`` processes.
+    """
+    progress = progress or (lambda message: None)
+    rng = random.Random(seed)
+    authors = max(1, films // 10) if authors is None else authors
+    spectators = max(100, films // 10) if spectators is None else spectators
+    favorites = films if favorites is None else favorites
+    ratings = films if ratings is None else ratings
+
+    Genre.objects.bulk_create(
+        [Genre(name=name) for name in GENRE_NAMES], ignore_conflicts=True
+    )
+    genre_ids = list(Genre.objects.values_list("id", flat=True))
+
+    start = _next_index(Author)
+    author_ids = _insert_with_ids(
+        Author, AUTHOR_FIELDS, _author_rows(seed, start, authors), chunk_size
+    )
+    progress(f"{len(author_ids)} authors")
+    start = _next_index(Film)
+    film_ids = _insert_with_ids(
+        Film, FILM_FIELDS, _film_rows(seed, start, films), chunk_size
+    )
+    progress(f"{len(film_ids)} films")
+    start = _next_index(Spectator)
+    spectator_ids = _insert_with_ids(
+        Spectator, SPECTATOR_FIELDS, _spectator_rows(start, spectators), chunk_size
+    )
+    progress(f"{len(spectator_ids)} spectators")
+    counts = {
+        "films": len(film_ids),
+        "authors": len(author_ids),
+        "spectators": len(spectator_ids),
+        "favorites": 0,
+        "ratings": 0,
+    }
+    if not film_ids:
+        return counts
+
+    # Film popularity follows a random order of the new films.
+    rng.shuffle(film_ids)
+    slices = max(1, workers * 4)
+    step = -(-len(film_ids) // slices)
+    link_tasks = [
+        (seed, first, first + step, author_ids, genre_ids, chunk_size)
+        for first in range(0, len(film_ids), step)
+    ]
+    if author_ids:
+        _run(_write_film_links, link_tasks, workers, film_ids)
+        progress("film directors and genres")
+
+    cap = len(film_ids)
+    rating_counts = _allocate(rng, ratings, len(spectator_ids), cap)
+    favorite_counts = _allocate(rng, favorites, len(spectator_ids), cap)
+    activity = list(zip(spectator_ids, rating_counts, favorite_counts))
+    step = -(-len(activity) // slices)
+    film_type_id = ContentType.objects.get_for_model(Film).id
+    activity_tasks = [
+        (seed, part, film_type_id, chunk_size) for part in _chunks(activity, step)
+    ]
+    written = _run(_write_activity, activity_tasks, workers, film_ids)
+    progress("ratings and favorites")
+
+    counts["favorites"] = sum(result["favorites"] for result in written)
+    counts["ratings"] = sum(result["ratings"] for result in written)
+    return counts
@@ -10,9 +10,16 @@ class TMDbClient:
     Provides methods to fetch movies, directors, and genres.
     """
 
-    def __init__(self, api_key: Optional[str] = None) -> None:
-        """Initialize the TMDbClient."""
-        self.BASE_URL = "https://api.themoviedb.org/3"
+    def __init__(
+        self, api_key: Optional[str] = None, base_url: Optional[str] = None
+    ) -> None:
+        """
+        Initialize the TMDbClient. ``base_url`` (or the TMDB_BASE_URL
+        environment variable) points it at another server, e.g. a local stub.
+        """
+        self.BASE_URL = (
+            base_url or os.getenv("TMDB_BASE_URL") or "https://api.themoviedb.org/3"
+        ).rstrip("/")
         self.api_key = api_key or os.getenv("TMDB_API_KEY")
 
     def _get(self, path: str, **params: Any) -> Dict[str, Any]:
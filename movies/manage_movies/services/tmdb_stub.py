@@ -0,0 +1,354 @@
+import hashlib
+import io
+import json
+import math
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlparse
+
+from manage_movies.services.synthetic_data import GENRE_NAMES
+from PIL import Image
+
+# TMDb id of each genre in GENRE_NAMES.
+GENRE_IDS = {
+    "Action": 28,
+    "Adventure": 12,
+    "Animation": 16,
+    "Comedy": 35,
+    "Crime": 80,
+    "Documentary": 99,
+    "Drama": 18,
+    "Family": 10751,
+    "Fantasy": 14,
+    "History": 36,
+    "Horror": 27,
+    "Music": 10402,
+    "Mystery": 9648,
+    "Romance": 10749,
+    "Science Fiction": 878,
+    "TV Movie": 10770,
+    "Thriller": 53,
+    "War": 10752,
+    "Western": 37,
+}
+
+PAGE_SIZE = 20
+# TMDb never serves more than 500 pages of a list.
+MAX_PAGES = 500
+DIRECTOR_ID_OFFSET = 1_000_000
+# Distinct images served: many file paths share the same content.
+IMAGE_VARIANTS = 16
+
+Response = Tuple[int, Union[Dict[str, Any], bytes], Dict[str, str]]
+
+
+def _error(status: int, code: int, message: str, **headers: str) -> Response:
+    """Build a TMDb-style error response."""
+    return status, {"status_code": code, "status_message": message}, headers
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket allowing ``rate`` requests per second, in
+    bursts of up to ``rate`` requests (one below a rate of 1).
+    """
+
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self) -> bool:
+        """Consume one token; False when the bucket is empty."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+    def retry_after(self) -> int:
+        """Whole seconds until the bucket holds a token again."""
+        with self.lock:
+            return max(1, math.ceil((1 - self.tokens) / self.rate))
+
+
+class TMDbStub:
+    """
+    Offline emulator of the TMDb endpoints used by TMDbClient, serving a
+    deterministic synthetic catalogue of ``movies`` movies directed by
+    ``directors`` people (a few of them directing many movies).
+
+    Latency (``latency_ms`` plus up to ``jitter_ms``), random 500 errors
+    (``error_rate``) and 429 rate limiting (``rate_limit`` requests per
+    second, with Retry-After) can be injected to exercise clients.
+    """
+
+    def __init__(
+        self,
+        movies: int = 10_000,
+        directors: Optional[int] = None,
+        seed: int = 0,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        error_rate: float = 0.0,
+        rate_limit: Optional[float] = None,
+    ) -> None:
+        self.movies = movies
+        self.directors = directors or max(1, movies // 10)
+        self.seed = seed
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.bucket = TokenBucket(rate_limit) if rate_limit else None
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "errors": 0, "throttled": 0}
+
+    def _random(self, kind: str, key: int) -> random.Random:
+        """Return a generator seeded for one resource, for stable payloads."""
+        return random.Random(f"{self.seed}:{kind}:{key}")
+
+    # ——— Payloads ———
+
+    def genres(self) -> Dict[str, Any]:
+        return {
+            "genres": [{"id": GENRE_IDS[name], "name": name} for name in GENRE_NAMES]
+        }
+
+    def movie_summary(self, movie_id: int) -> Dict[str, Any]:
+        """The movie as listed in /movie/popular and /movie/upcoming."""
+        rng = self._random("movie", movie_id)
+        release = date(1950, 1, 1) + timedelta(days=rng.randrange(28_000))
+        return {
+            "id": movie_id,
+            "title": f"Stub movie {movie_id}",
+            "overview": f"Synthetic overview of stub movie {movie_id}.",
+            "release_date": release.isoformat(),
+            "adult": rng.random() < 0.02,
+            "genre_ids": rng.sample(list(GENRE_IDS.values()), rng.randint(1, 3)),
+            # Popularity follows the id: movie 1 is the most popular.
+            "poster_path": f"/poster{movie_id}.png",
+            "backdrop_path": f"/backdrop{movie_id}.png",
+            "popularity": round(10_000 / movie_id, 3),
+            "vote_average": round(rng.uniform(2, 9.5), 1),
+            "vote_count": rng.randrange(10_000),
+        }
+
+    def movie_details(self, movie_id: int) -> Dict[str, Any]:
+        rng = self._random("details", movie_id)
+        budget = rng.choice([0, rng.randrange(100_000, 300_000_000, 100_000)])
+        return {
+            **self.movie_summary(movie_id),
+            "status": rng.choice(["Released", "Released", "Post Production"]),
+            "budget": budget,
+            "revenue": int(budget * rng.uniform(0.2, 6)),
+            "runtime": rng.randint(75, 190),
+        }
+
+    def credits(self, movie_id: int) -> Dict[str, Any]:
+        rng = self._random("credits", movie_id)
+        # Squaring a uniform draw skews the picks towards low ids, so a
+        # handful of directors sign many movies.
+        crew = []
+        for _ in range(1 if rng.random() < 0.9 else 2):
+            index = int(rng.random() ** 2 * self.directors)
+            crew.append(
+                {
+                    "id": DIRECTOR_ID_OFFSET + index,
+                    "name": f"Stub director {index}",
+                    "job": "Director",
+                    "department": "Directing",
+                }
+            )
+        crew.append({"id": 2 * DIRECTOR_ID_OFFSET, "name": "Stub", "job": "Producer"})
+        return {"id": movie_id, "cast": [], "crew": crew}
+
+    def person(self, person_id: int) -> Dict[str, Any]:
+        rng = self._random("person", person_id)
+        birthday = date(1920, 1, 1) + timedelta(days=rng.randrange(25_000))
+        return {
+            "id": person_id,
+            "name": f"Stub director {person_id - DIRECTOR_ID_OFFSET}",
+            "birthday": birthday.isoformat(),
+            "deathday": None,
+            "biography": "Synthetic director.",
+            "place_of_birth": rng.choice(["Paris, France", "Los Angeles, USA", None]),
+            "gender": rng.randint(0, 3),
+            "profile_path": f"/profile{person_id}.png",
+        }
+
+    def image(self, file_name: str) -> bytes:
+        """A small PNG, the same for every file name of a variant."""
+        digest = hashlib.sha1(f"{self.seed}:{file_name}".encode()).digest()
+        variant = digest[0] % IMAGE_VARIANTS
+        buffer = io.BytesIO()
+        Image.new("RGB", (8, 12), (variant * 16, 64, 255 - variant * 16)).save(
+            buffer, "PNG"
+        )
+        return buffer.getvalue()
+
+    def movie_list(self, kind: str, page: int) -> Response:
+        """One page of popular (ids ascending) or upcoming (ids descending)."""
+        total_pages = min(MAX_PAGES, math.ceil(self.movies / PAGE_SIZE))
+        if not 1 <= page <= MAX_PAGES:
+            return _error(400, 22, "Invalid page: Pages start at 1 and max at 500.")
+        first = (page - 1) * PAGE_SIZE
+        positions = range(first, min(first + PAGE_SIZE, self.movies))
+        if kind == "popular":
+            ids = [position + 1 for position in positions]
+        else:
+            ids = [self.movies - position for position in positions]
+        return (
+            200,
+            {
+                "page": page,
+                "results": [self.movie_summary(movie_id) for movie_id in ids],
+                "total_pages": total_pages,
+                "total_results": self.movies,
+            },
+            {},
+        )
+
+    # ——— Routing ———
+
+    def route(self, path: str, query: Dict[str, str]) -> Response:
+        """Answer a GET request, without faults."""
+        parts = path.strip("/").split("/")
+        if parts and parts[0] == "3":
+            parts = parts[1:]
+        not_found = _error(404, 34, "The resource you requested could not be found.")
+        if parts == ["genre", "movie", "list"]:
+            return 200, self.genres(), {}
+        if parts in (["movie", "popular"], ["movie", "upcoming"]):
+            try:
+                page = int(query.get("page", 1))
+            except ValueError:
+                page = 0
+            return self.movie_list(parts[1], page)
+        if len(parts) in (2, 3) and parts[0] == "movie" and parts[1].isdigit():
+            movie_id = int(parts[1])
+            if not 1 <= movie_id <= self.movies:
+                return not_found
+            if len(parts) == 2:
+                return 200, self.movie_details(movie_id), {}
+            if parts[2] == "credits":
+                return 200, self.credits(movie_id), {}
+        if len(parts) == 2 and parts[0] == "person" and parts[1].isdigit():
+            index = int(parts[1]) - DIRECTOR_ID_OFFSET
+            if 0 <= index < self.directors:
+                return 200, self.person(int(parts[1])), {}
+        return not_found
+
+    def route_image(self, path: str, headers: Dict[str, str]) -> Response:
+        """
+        Answer /t/p/{size}/{file} like TMDb's image CDN, with an ETag and
+        304 answers to a matching If-None-Match.
+        """
+        parts = path.strip("/").split("/")
+        if len(parts) != 4 or parts[:2] != ["t", "p"] or not parts[3].endswith(".png"):
+            return 404, b"", {}
+        body = self.image(parts[3])
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        if headers.get("If-None-Match") == etag:
+            return 304, b"", {"ETag": etag}
+        return 200, body, {"ETag": etag, "Content-Type": "image/png"}
+
+    def handle(self, path: str, query: Dict[str, str]) -> Response:
+        """Answer a GET request, injecting latency, errors and 429s."""
+        with self.lock:
+            self.stats["requests"] += 1
+            fail = self.error_rate and self.rng.random() < self.error_rate
+            delay = self.latency_ms + self.rng.uniform(0, self.jitter_ms)
+        if delay:
+            time.sleep(delay / 1000)
+        if self.bucket is not None and not self.bucket.take():
+            with self.lock:
+                self.stats["throttled"] += 1
+            return _error(
+                429,
+                25,
+                "Your request count is over the allowed limit.",
+                **{"Retry-After": str(self.bucket.retry_after())},
+            )
+        if fail:
+            with self.lock:
+                self.stats["errors"] += 1
+            return _error(500, 11, "Internal error: Something went wrong.")
+        return self.route(path, query)
+
+
+class TMDbStubHandler(BaseHTTPRequestHandler):
+    """HTTP front end of a TMDbStub (set as ``server.stub``)."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if url.path == "/__stats__":
+            status, payload, headers = 200, dict(self.server.stub.stats), {}
+        elif url.path.startswith("/t/p/"):
+            status, payload, headers = self.server.stub.route_image(
+                url.path, self.headers
+            )
+        else:
+            status, payload, headers = self.server.stub.handle(url.path, query)
+        if isinstance(payload, bytes):
+            body = payload
+        else:
+            body = json.dumps(payload).encode()
+            headers.setdefault("Content-Type", "application/json;charset=utf-8")
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if getattr(self.server, "verbose", False):
+            super().log_message(format, *args)
+
+
+def make_server(
+    stub: TMDbStub, host: str = "127.0.0.1", port: int = 0, verbose: bool = False
+) -> ThreadingHTTPServer:
+    """Create a threaded HTTP server for a stub (port 0 picks a free port)."""
+    server = ThreadingHTTPServer((host, port), TMDbStubHandler)
+    server.daemon_threads = True
+    server.stub = stub
+    server.verbose = verbose
+    return server
+
+
+@contextmanager
+def running_stub(stub: TMDbStub) -> Iterator[str]:
+    """
+    Serve a stub from a background thread and yield its API base URL. Its
+    images are under the same host, at ``/t/p`` (see image_base_url()).
+    """
+    server = make_server(stub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/3"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def image_base_url(base_url: str) -> str:
+    """The image base URL of a stub, from its API base URL."""
+    return base_url.rsplit("/3", 1)[0] + "/t/p"
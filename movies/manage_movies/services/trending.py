@@ -0,0 +1,114 @@
+"""
+Trending films. New ratings and favorites are counted per film and hour
+(FilmTrendBucket) as they are written; refresh_trending() periodically
+ranks films over the last WINDOW_HOURS, each hour weighted by exponential
+decay, and caches the payload of the top films so that it is served in
+O(K) without touching the database.
+"""
+
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, FloatField, Sum, Value, When
+from django.utils import timezone
+from manage_movies.models import Film, FilmTrendBucket
+from manage_movies.serializers import FilmSerializer
+
+CACHE_KEY = "trending:films"
+WINDOW_HOURS = 7 * 24
+# A favorite says more than a rating.
+FAVORITE_WEIGHT = 2
+
+DEFAULTS = {
+    "SIZE": 50,
+    "HALF_LIFE_HOURS": 24,
+    # Served from cache for this long; refresh_trending should run sooner.
+    "CACHE_TTL": 900,
+}
+
+
+def get_config() -> dict:
+    return {**DEFAULTS, **getattr(settings, "TRENDING", {})}
+
+
+def current_hour(now: Optional[datetime] = None) -> datetime:
+    """Start of the hourly bucket ``now`` falls in."""
+    return (now or timezone.now()).replace(minute=0, second=0, microsecond=0)
+
+
+def decay_weights(half_life_hours: float, window_hours: int = WINDOW_HOURS):
+    """Weight of a bucket by age in hours: 1 for the current hour."""
+    return [0.5 ** (age / half_life_hours) for age in range(window_hours)]
+
+
+def record(film_ids: Iterable[int], field: str, amount: int = 1, now=None) -> None:
+    """Add ``amount`` new ratings or favorites to films' current bucket."""
+    hour = current_hour(now)
+    for film_id in film_ids:
+        bucket = FilmTrendBucket.objects.filter(film_id=film_id, hour=hour)
+        if bucket.update(**{field: F(field) + amount}):
+            continue
+        if not Film.all_objects.filter(pk=film_id).exists():
+            # Deleted since: its bucket would reference no film.
+            continue
+        try:
+            with transaction.atomic():
+                FilmTrendBucket.objects.create(
+                    film_id=film_id, hour=hour, **{field: amount}
+                )
+        except IntegrityError:
+            # Created concurrently since the update.
+            bucket.update(**{field: F(field) + amount})
+
+
+def refresh_trending(now: Optional[datetime] = None) -> List[dict]:
+    """
+    Rank live films by decayed activity in one grouped query, cache the
+    list payload of the top ones (with their score) and return it. Buckets
+    older than the window are pruned.
+    """
+    config = get_config()
+    hour = current_hour(now)
+    start = hour - timedelta(hours=WINDOW_HOURS - 1)
+    FilmTrendBucket.objects.filter(hour__lt=start).delete()
+
+    weight = Case(
+        *(
+            When(hour=hour - timedelta(hours=age), then=Value(w))
+            for age, w in enumerate(decay_weights(config["HALF_LIFE_HOURS"]))
+        ),
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+    ranked = list(
+        FilmTrendBucket.objects.filter(hour__gte=start, film__archived=False)
+        .values("film_id")
+        .annotate(score=Sum((F("ratings") + FAVORITE_WEIGHT * F("favorites")) * weight))
+        .order_by("-score", "film_id")
+        .values_list("film_id", "score")[: config["SIZE"]]
+    )
+    rows = {
+        row["id"]: row
+        for row in Film.objects.filter(
+            pk__in=[film_id for film_id, _ in ranked]
+        ).values(*FilmSerializer.values_fields)
+    }
+    payload = []
+    for film_id, score in ranked:
+        if film_id in rows:
+            (item,) = FilmSerializer.from_values([rows[film_id]])
+            item["score"] = round(score, 3)
+            payload.append(item)
+    cache.set(CACHE_KEY, payload, config["CACHE_TTL"])
+    return payload
+
+
+def get_trending() -> List[dict]:
+    """The cached top films, computed now if the cache expired."""
+    payload = cache.get(CACHE_KEY)
+    if payload is None:
+        payload = refresh_trending()
+    return payload
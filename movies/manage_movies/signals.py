@@ -0,0 +1,56 @@
+from accounts.models import Spectator
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Author, Film, Genre, Rating
+from .services import autocomplete, snapshot, trending
+
+
+@receiver(post_save, sender=Rating)
+def count_film_rating(sender, instance, created, **kwargs):
+    """Feed new film ratings to the trending counters, once committed."""
+    film_type = ContentType.objects.get_for_model(Film)
+    if created and instance.content_type_id == film_type.pk:
+        film_ids = [instance.object_id]
+        # robust: a failing counter is logged, not raised after the commit.
+        transaction.on_commit(lambda: trending.record(film_ids, "ratings"), robust=True)
+
+
+@receiver(m2m_changed, sender=Spectator.favorites.through)
+def count_favorites(sender, instance, action, reverse, pk_set, **kwargs):
+    """Feed new favorites to the trending counters, once committed."""
+    if action != "post_add" or not pk_set:
+        return
+    if reverse:
+        # film.favorited_by.add(*spectators)
+        film_ids, amount = [instance.pk], len(pk_set)
+    else:
+        film_ids, amount = list(pk_set), 1
+    transaction.on_commit(
+        lambda: trending.record(film_ids, "favorites", amount=amount), robust=True
+    )
+
+
+@receiver(post_save, sender=Film)
+@receiver(post_delete, sender=Film)
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+def update_autocomplete(sender, instance, **kwargs):
+    """Have every worker's autocomplete index re-read the changed object."""
+    autocomplete.log_change("film" if sender is Film else "author", instance.pk)
+
+
+@receiver(post_save, sender=Film)
+@receiver(post_delete, sender=Film)
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+@receiver(m2m_changed, sender=Film.authors.through)
+@receiver(m2m_changed, sender=Film.genres.through)
+def mark_snapshot_stale(sender, **kwargs):
+    """Film reads go to the database until the next catalogue snapshot."""
+    if kwargs.get("action", "post_").startswith("post_"):
+        snapshot.mark_changed()
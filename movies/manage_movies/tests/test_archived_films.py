@@ -0,0 +1,68 @@
+from datetime import date
+
+import pytest
+from accounts.models import Spectator
+from manage_movies.models import Author, Film
+from rest_framework.test import APIClient
+
+
+@pytest.fixture
+def films():
+    author = Author.objects.create(name="Ridley Scott")
+    live = Film.objects.create(
+        title="Alien", description="", release_date=date(1979, 5, 25)
+    )
+    archived = Film.objects.create(
+        title="Legend", description="", release_date=date(1985, 8, 28), archived=True
+    )
+    author.films.add(live, archived)
+    return live, archived
+
+
+def listed_titles(response):
+    assert response.status_code == 200
+    return [film["title"] for film in response.json()["results"]]
+
+
+@pytest.mark.django_db
+def test_managers(films):
+    live, archived = films
+    assert list(Film.objects.all()) == [live]
+    assert set(Film.all_objects.all()) == {live, archived}
+    assert Film._default_manager is Film.all_objects
+
+
+@pytest.mark.django_db
+def test_archived_films_are_left_out_of_reads(films):
+    live, archived = films
+    client = APIClient()
+    assert listed_titles(client.get("/films/?ordering=id")) == ["Alien"]
+    assert client.get(f"/films/{archived.pk}/").status_code == 404
+    assert client.get(f"/films/{live.pk}/").status_code == 200
+    author = client.get("/authors/").json()["results"][0]
+    assert author["movies_list"] == ["Alien"]
+
+
+@pytest.mark.django_db
+def test_archived_films_can_be_included(films):
+    live, archived = films
+    client = APIClient()
+    response = client.get("/films/?ordering=id&include_archived=1")
+    assert listed_titles(response) == ["Alien", "Legend"]
+    response = client.get(f"/films/{archived.pk}/?include_archived=true")
+    assert response.status_code == 200
+    assert response.json()["archived"] is True
+
+
+@pytest.mark.django_db
+def test_archiving_hides_the_film(films):
+    live, _ = films
+    client = APIClient()
+    assert client.post(f"/films/{live.pk}/archive/").status_code == 401
+
+    client.force_authenticate(Spectator.objects.create_user("ana", password="x"))
+    response = client.post(f"/films/{live.pk}/archive/")
+    assert response.status_code == 200
+    assert Film.all_objects.get(pk=live.pk).archived
+    assert listed_titles(client.get("/films/")) == []
+    assert client.get(f"/films/{live.pk}/").status_code == 404
@@ -0,0 +1,75 @@
+import datetime
+
+import pytest
+from manage_movies.models import Author, Film
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def films():
+    author = Author.objects.create(name="Agnès Varda")
+    films = []
+    for i in range(12):
+        film = Film.objects.create(
+            title=f"Film {i}",
+            description="",
+            release_date=datetime.date(2000 + i, 1, 1),
+            archived=i == 11,
+        )
+        film.authors.add(author)
+        films.append(film)
+    return films
+
+
+def test_film_pages(client, films):
+    first = client.get("/async/films/").json()
+    assert first["count"] == 11
+    assert len(first["results"]) == 10
+    assert first["previous"] is None
+    assert first["next"].endswith("/async/films/?page=2")
+
+    second = client.get(first["next"]).json()
+    assert [film["id"] for film in second["results"]] == [films[10].pk]
+    assert second["next"] is None
+    assert second["previous"].endswith("/async/films/")
+
+
+@pytest.mark.parametrize("page", ["0", "-1", "abc", "3"])
+def test_invalid_pages(client, films, page):
+    response = client.get(f"/async/films/?page={page}")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Invalid page."}
+
+
+def test_empty_list_has_one_page(client):
+    response = client.get("/async/films/")
+    assert response.status_code == 200
+    assert response.json()["count"] == 0
+
+
+def test_film_filters_are_validated(client, films):
+    response = client.get("/async/films/?rating=great")
+    assert response.status_code == 400
+    assert "rating" in response.json()
+
+
+def test_film_detail(client, films):
+    response = client.get(f"/async/films/{films[0].pk}/")
+    assert response.status_code == 200
+    assert response.json()["title"] == "Film 0"
+    # Archived films stay hidden, as on /films/{id}/.
+    assert client.get(f"/async/films/{films[11].pk}/").status_code == 404
+    missing = client.get("/async/films/999999/")
+    assert missing.status_code == 404
+    assert missing.json() == {"detail": "No Film matches the given query."}
+
+
+def test_authors(client, films):
+    author = Author.objects.get()
+    page = client.get("/async/authors/").json()
+    assert page["count"] == 1 and page["next"] is None
+    detail = client.get(f"/async/authors/{author.pk}/").json()
+    assert detail["name"] == "Agnès Varda"
+    assert len(detail["films"]) == 11
+    assert client.get("/async/authors/999999/").status_code == 404
@@ -0,0 +1,124 @@
+from datetime import date
+
+import pytest
+from accounts.models import Spectator
+from django.db import connection
+from manage_movies.models import Author, Film
+from manage_movies.services import autocomplete
+from manage_movies.services.autocomplete import PrefixIndex, index_keys, normalize
+
+ROWS = [
+    ("film", 1, "The Godfather", 10),
+    ("film", 2, "Godzilla", 3),
+    ("film", 3, "Amélie", 5),
+    ("author", 1, "Francis Ford Coppola", 4),
+]
+
+
+def labels(results):
+    return [result["label"] for result in results]
+
+
+def test_normalize_and_keys():
+    assert normalize("  Amélie, l'Été ") == "amelie l ete"
+    assert index_keys("The Godfather: Part II") == [
+        "the godfather part ii",
+        "godfather part ii",
+        "part ii",
+        "ii",
+    ]
+
+
+def test_matches_word_prefixes_by_popularity():
+    index = PrefixIndex.build(ROWS)
+    assert labels(index.search("GOD", 10)) == ["The Godfather", "Godzilla"]
+    assert labels(index.search("god", 1)) == ["The Godfather"]
+    assert labels(index.search("ame", 10)) == ["Amélie"]
+    assert index.search("ford cop", 10) == [
+        {"type": "author", "id": 1, "label": "Francis Ford Coppola"}
+    ]
+    assert index.search("zz", 10) == [] and index.search(" ", 10) == []
+
+
+def test_updates_match_a_rebuild():
+    index = PrefixIndex.build(ROWS)
+    assert labels(index.search("g", 10)) == ["The Godfather", "Godzilla"]
+    index.put(("film", 2), "Gojira", 20)
+    index.remove(("film", 1))
+    index.put(("film", 4), "The Good, the Bad and the Ugly", 1)
+    rebuilt = PrefixIndex.build(
+        [ROWS[2], ROWS[3], ("film", 2, "Gojira", 20)]
+        + [("film", 4, "The Good, the Bad and the Ugly", 1)]
+    )
+    assert (index.keys, index.refs) == (rebuilt.keys, rebuilt.refs)
+    assert labels(index.search("g", 10)) == [
+        "Gojira",
+        "The Good, the Bad and the Ugly",
+    ]
+
+
+def test_no_index_without_a_shared_cache(settings, monkeypatch):
+    settings.SHARED_CACHE = False
+    monkeypatch.setattr(autocomplete, "_index", PrefixIndex.build(ROWS))
+    assert autocomplete.get_index() is None
+
+
+@pytest.mark.django_db
+def test_view_answers_from_the_database(client, settings):
+    settings.SHARED_CACHE = False
+    Film.objects.create(
+        title="The Godfather", description="", release_date=date(1972, 3, 24)
+    )
+    response = client.get("/autocomplete/", {"q": "godf"})
+    assert labels(response.json()["results"]) == ["The Godfather"]
+
+
+@pytest.mark.parametrize("limit", ["0", "-1"])
+def test_view_rejects_limits_below_one(client, limit):
+    response = client.get("/autocomplete/", {"q": "god", "limit": limit})
+    assert response.status_code == 400
+    assert response.json() == {"limit": "Expected a positive integer."}
+
+
+@pytest.fixture
+def catalogue():
+    """Films with 2, 1 and no favorites, and authors with 2 and 1 films."""
+    films = [
+        Film.objects.create(title=title, description="", release_date=date(2000, 1, 1))
+        for title in (
+            "The Godfather",
+            "Godzilla",
+            "Amélie",
+            "Spider-Man",
+            "Iron Man",
+            "Godard",
+        )
+    ]
+    for i in range(2):
+        Spectator.objects.create_user(f"fan{i}", password="x").favorites.add(
+            *films[: 2 - i]
+        )
+    Author.objects.create(name="Francis Ford Coppola").films.add(*films[:2])
+    Author.objects.create(name="Jean-Luc Godard").films.add(films[5])
+    return films
+
+
+@pytest.mark.django_db
+def test_the_database_matches_the_index(catalogue, monkeypatch):
+    """Test that the fallback answers as the index does."""
+    # Restored afterwards: other tests must not find this index.
+    monkeypatch.setattr(autocomplete, "_index", None)
+    index = autocomplete.build_index()
+    queries = ["god", "GODF", "the g", "father", "ford cop", "iron", "g", "zz", " "]
+    if connection.vendor == "postgresql":
+        queries += ["ame", "amé", "AMELIE"]
+    for query in queries:
+        for limit in (1, 2, 10):
+            expected = index.search(query, limit)
+            assert autocomplete.search_database(query, limit) == expected, query
+    assert labels(index.search("god", 10)) == [
+        "The Godfather",
+        "Godzilla",
+        "Jean-Luc Godard",
+        "Godard",
+    ]
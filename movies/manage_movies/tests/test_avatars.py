@@ -0,0 +1,126 @@
+import io
+
+import pytest
+from accounts.models import Spectator
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from manage_movies.services.avatars import (
+    AVATAR_SIZES,
+    render_thumbnails,
+    store_thumbnails,
+    thumbnail_name,
+)
+from PIL import Image
+from rest_framework.test import APIClient
+
+
+def test_thumbnail_names():
+    assert (
+        thumbnail_name("spectator_avatars/ana.png", 64)
+        == "spectator_avatars/thumbs/ana_64.webp"
+    )
+
+
+def test_renders_square_webp_thumbnails():
+    buffer = io.BytesIO()
+    Image.new("RGB", (900, 400), "red").save(buffer, "JPEG")
+
+    thumbnails = render_thumbnails(buffer.getvalue())
+
+    assert sorted(thumbnails) == sorted(AVATAR_SIZES)
+    for size, data in thumbnails.items():
+        with Image.open(io.BytesIO(data)) as image:
+            assert image.format == "WEBP"
+            assert image.size == (size, size)
+
+
+def test_keeps_transparency(tmp_path):
+    path = tmp_path / "avatar.png"
+    Image.new("RGBA", (300, 300), (0, 0, 0, 0)).save(path)
+
+    with Image.open(io.BytesIO(render_thumbnails(str(path), (32,))[32])) as image:
+        assert image.mode == "RGBA"
+
+
+def _image_file(name, color):
+    buffer = io.BytesIO()
+    Image.new("RGB", (300, 200), color).save(buffer, "PNG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+
+@pytest.fixture
+def storage(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.AVATAR_WORKERS = 0
+    return tmp_path
+
+
+@pytest.fixture
+def spectator():
+    return Spectator.objects.create_user("ana", password="x")
+
+
+@pytest.fixture
+def client(spectator):
+    client = APIClient()
+    client.force_authenticate(spectator)
+    return client
+
+
+def _upload(client, spectator, name, color, capture):
+    with capture(execute=True) as callbacks:
+        response = client.patch(
+            f"/spectators/{spectator.pk}/",
+            {"avatar": _image_file(name, color)},
+            format="multipart",
+        )
+        assert response.status_code == 200
+        # Rendered once committed: the response has no thumbnails yet.
+        assert response.json()["avatar_thumbnails"] == {}
+        spectator.refresh_from_db()
+        assert spectator.avatar_thumbnails == {}
+    assert callbacks
+    spectator.refresh_from_db()
+    return spectator
+
+
+@pytest.mark.django_db
+def test_uploaded_avatars_get_thumbnails_after_commit(
+    storage, client, spectator, django_capture_on_commit_callbacks
+):
+    _upload(client, spectator, "ana.png", "red", django_capture_on_commit_callbacks)
+
+    thumbnails = spectator.avatar_thumbnails
+    assert set(thumbnails) == {str(size) for size in AVATAR_SIZES}
+    for size, name in thumbnails.items():
+        assert name == thumbnail_name(spectator.avatar.name, int(size))
+        assert default_storage.exists(name)
+    urls = client.get(f"/spectators/{spectator.pk}/").json()["avatar_thumbnails"]
+    assert urls["64"].endswith(thumbnails["64"])
+
+
+@pytest.mark.django_db
+def test_replaced_avatars_lose_their_thumbnails(
+    storage, client, spectator, django_capture_on_commit_callbacks
+):
+    _upload(client, spectator, "ana.png", "red", django_capture_on_commit_callbacks)
+    old = list(spectator.avatar_thumbnails.values())
+
+    _upload(client, spectator, "new.png", "blue", django_capture_on_commit_callbacks)
+    new = list(spectator.avatar_thumbnails.values())
+
+    assert len(new) == len(AVATAR_SIZES)
+    assert all(default_storage.exists(name) for name in new)
+    assert not any(default_storage.exists(name) for name in old)
+
+
+@pytest.mark.django_db
+def test_thumbnails_of_a_replaced_avatar_are_discarded(storage, spectator):
+    spectator.avatar = "spectator_avatars/new.png"
+    spectator.save()
+
+    store_thumbnails(spectator.pk, "spectator_avatars/old.png", {64: b"webp"})
+
+    spectator.refresh_from_db()
+    assert spectator.avatar_thumbnails == {}
+    assert not default_storage.exists("spectator_avatars/thumbs/old_64.webp")
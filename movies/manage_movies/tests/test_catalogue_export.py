@@ -0,0 +1,156 @@
+import csv
+import gzip
+import io
+import json
+from datetime import date
+
+import pytest
+from accounts.models import Spectator
+from manage_movies.models import Author, Film, Genre
+from manage_movies.services.catalogue_export import (
+    EXPORT_COLUMNS,
+    export_rows,
+    gzip_stream,
+    render_csv,
+    render_ndjson,
+)
+from rest_framework.test import APIClient
+
+GENRE_CHUNKS = [
+    [{"id": 1, "name": "Action", "tmdb_id": 28}],
+    [{"id": 2, "name": "Drama, Romance", "tmdb_id": None}],
+]
+
+
+def test_render_ndjson():
+    """Test that each row becomes one JSON line, one block per chunk."""
+    blocks = list(render_ndjson("genres", GENRE_CHUNKS))
+    assert len(blocks) == 2
+    lines = b"".join(blocks).decode().splitlines()
+    assert [json.loads(line) for line in lines] == GENRE_CHUNKS[0] + GENRE_CHUNKS[1]
+
+
+def test_render_csv_quotes_and_header():
+    """Test the CSV header, quoting and empty cells for None."""
+    body = b"".join(render_csv("genres", GENRE_CHUNKS)).decode()
+    rows = list(csv.reader(io.StringIO(body)))
+    assert rows == [
+        ["id", "name", "tmdb_id"],
+        ["1", "Action", "28"],
+        ["2", "Drama, Romance", ""],
+    ]
+
+
+def test_render_csv_flattens_lists_and_dates():
+    """Test that id lists and dates are flattened into CSV cells."""
+    row = {
+        "id": 1,
+        "name": "Jane",
+        "birth_date": date(1970, 1, 2),
+        "death_date": None,
+        "biography": "",
+        "place_of_birth": "Paris",
+        "gender": "1",
+        "tmdb_id": 7,
+    }
+    body = b"".join(render_csv("authors", [[row]])).decode()
+    assert "1,Jane,1970-01-02,,,Paris,1,7" in body
+    film = dict.fromkeys(EXPORT_COLUMNS["films"])
+    film["author_ids"] = [3, 4]
+    assert b",3|4," in b"".join(render_csv("films", [[film]]))
+
+
+def test_gzip_stream_roundtrip():
+    """Test that gzipped blocks decompress back to the original stream."""
+    blocks = [b"first line\n", b"", b"second line\n" * 1000]
+    assert gzip.decompress(b"".join(gzip_stream(blocks))) == b"".join(blocks)
+
+
+@pytest.fixture
+def catalogue():
+    author = Author.objects.create(name="Jane", tmdb_id=7)
+    genre = Genre.objects.create(name="Drama")
+    films = [
+        Film.objects.create(
+            title=title,
+            description="",
+            release_date=date(2001, 1, 1),
+            archived=archived,
+        )
+        for title, archived in (("One", False), ("Two", True), ("Three", False))
+    ]
+    films[0].authors.add(author)
+    films[0].genres.add(genre)
+    return films
+
+
+@pytest.fixture
+def staff_client():
+    client = APIClient()
+    client.force_authenticate(
+        Spectator.objects.create_user("admin", password="x", is_staff=True)
+    )
+    return client
+
+
+@pytest.mark.django_db
+def test_export_rows_include_archived_films_and_relations(catalogue):
+    """Test that film rows carry their relation ids, archived ones too."""
+    rows = [row for chunk in export_rows("films", chunk_size=2) for row in chunk]
+    assert [row["title"] for row in rows] == ["One", "Two", "Three"]
+    assert rows[0]["author_ids"] == [Author.objects.get().pk]
+    assert rows[0]["genre_ids"] == [Genre.objects.get().pk]
+    assert rows[1]["archived"] is True
+    assert rows[2]["author_ids"] == []
+
+
+@pytest.mark.django_db
+def test_export_rows_resume_after_an_id(catalogue):
+    """Test that ?after= resumes right after the last exported id."""
+    chunks = list(export_rows("films", after=catalogue[0].pk, chunk_size=1))
+    assert [[row["title"] for row in chunk] for chunk in chunks] == [
+        ["Two"],
+        ["Three"],
+    ]
+
+
+@pytest.mark.django_db
+def test_export_is_staff_only(catalogue):
+    """Test that the export view is refused to anonymous and regular users."""
+    client = APIClient()
+    assert client.get("/export/films.ndjson").status_code == 401
+    client.force_authenticate(Spectator.objects.create_user("ana", password="x"))
+    assert client.get("/export/films.ndjson").status_code == 403
+
+
+@pytest.mark.django_db
+def test_export_streams_ndjson(catalogue, staff_client):
+    """Test the streamed NDJSON body and its headers."""
+    response = staff_client.get(f"/export/films.ndjson?after={catalogue[0].pk}")
+    assert response.status_code == 200
+    assert response.streaming
+    assert response["Content-Type"] == "application/x-ndjson"
+    assert response["Content-Disposition"] == 'attachment; filename="films.ndjson"'
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert [json.loads(line)["title"] for line in lines] == ["Two", "Three"]
+
+
+@pytest.mark.django_db
+def test_export_streams_gzipped_csv(catalogue, staff_client):
+    """Test the streamed CSV body, gzipped on request."""
+    response = staff_client.get("/export/genres.csv?gzip=1")
+    assert response["Content-Type"] == "application/gzip"
+    assert response["Content-Disposition"] == 'attachment; filename="genres.csv.gz"'
+    body = gzip.decompress(b"".join(response.streaming_content)).decode()
+    assert list(csv.reader(io.StringIO(body))) == [
+        ["id", "name", "tmdb_id"],
+        [str(Genre.objects.get().pk), "Drama", ""],
+    ]
+
+
+@pytest.mark.django_db
+def test_export_rejects_unknown_tables_and_bad_resume_ids(staff_client):
+    """Test the 404 on unknown exports and the 400 on a non-integer ?after=."""
+    assert staff_client.get("/export/spectators.csv").status_code == 404
+    assert staff_client.get("/export/films.xml").status_code == 404
+    assert staff_client.get("/export/films.csv?after=x").status_code == 400
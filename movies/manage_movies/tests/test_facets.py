@@ -0,0 +1,91 @@
+from datetime import date
+
+import pytest
+from django.core.cache import cache
+from manage_movies.models import Film, Genre
+from manage_movies.services.facets import COUNTERS, filter_key, parse_facets
+from rest_framework.test import APIClient
+
+
+def test_parses_facet_names():
+    assert parse_facets("status, year,status") == ["status", "year"]
+    assert parse_facets("") == []
+    with pytest.raises(ValueError):
+        parse_facets("status,director")
+
+
+def test_filter_key_is_normalized():
+    key = filter_key({"rating": "Good,excellent", "genre": "Drama"})
+    assert key == filter_key({"genre": "Drama", "rating": "Excellent,good"})
+    assert key == filter_key(
+        {"genre": "Drama", "rating": "Good,Excellent", "page": "3", "facets": "year"}
+    )
+    assert key != filter_key({"genre": "Drama"})
+
+
+def test_filter_key_keeps_the_case_of_genre_names():
+    """Genre names match case-sensitively: Drama and drama are two filters."""
+    assert filter_key({"genre": "Drama"}) != filter_key({"genre": "drama"})
+    assert filter_key({"source": "tmdb"}) != filter_key({"source": "TMDB"})
+
+
+def test_one_grouped_query_per_facet():
+    qs = Film.objects.filter(status="Released")
+    for name in ("status", "rating", "year"):
+        query = str(COUNTERS[name](qs).query)
+        assert "GROUP BY" in query
+    genre = str(COUNTERS["genre"](qs).query)
+    assert "GROUP BY" in genre and "manage_movies_film_genres" in genre
+
+
+@pytest.fixture
+def films():
+    cache.clear()
+    drama = Genre.objects.create(name="Drama")
+    action = Genre.objects.create(name="Action")
+    rows = [
+        ("Alien", date(1979, 5, 25), "Excellent", "Released", [drama, action]),
+        ("Aliens", date(1986, 7, 18), "Good", "Released", [action]),
+        ("Legend", date(1986, 4, 18), "Average", "Released", [drama]),
+        ("Sequel", date(2030, 1, 1), "Good", "Planned", [drama]),
+    ]
+    for title, released, rating, status, genres in rows:
+        film = Film.objects.create(
+            title=title,
+            description="",
+            release_date=released,
+            rating=rating,
+            status=status,
+        )
+        film.genres.set(genres)
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_facet_counts_over_the_filtered_films(films, django_assert_num_queries):
+    client = APIClient()
+    query = "/films/?status=Released&facets=status,rating,genre,year"
+    # Count and page of the list, then one grouped query per facet.
+    with django_assert_num_queries(2 + 4):
+        response = client.get(query)
+    assert response.status_code == 200
+    assert response.json()["count"] == 3
+    assert response.json()["facets"] == {
+        "status": {"Released": 3},
+        "rating": {"Average": 1, "Excellent": 1, "Good": 1},
+        "genre": {"Action": 2, "Drama": 2},
+        "year": {"1986": 2, "1979": 1},
+    }
+
+    # The same filters, differently spelled: facets come from the cache.
+    with django_assert_num_queries(2):
+        again = client.get("/films/?facets=year,genre,rating,status&status=released")
+    assert again.json()["facets"] == response.json()["facets"]
+
+
+@pytest.mark.django_db
+def test_unknown_facets_are_answered_with_400(films):
+    response = APIClient().get("/films/?facets=status,foo")
+    assert response.status_code == 400
+    assert "facets" in response.json()
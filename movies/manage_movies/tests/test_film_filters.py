@@ -0,0 +1,201 @@
+from datetime import date
+
+import pytest
+from manage_movies.models import Author, Film, Genre
+from manage_movies.views import compile_film_filters, filter_films
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+
+
+def sql(params):
+    return str(filter_films(Film.objects.all(), params).query)
+
+
+def test_multi_valued_choices():
+    query = sql({"rating": "good,Excellent", "status": "Released"})
+    assert "IN (Good, Excellent)" in query
+    assert "IN (Released)" in query
+
+
+def test_genres_and_authors_use_exists_subqueries():
+    query = sql({"genre": "3,Drama", "author": "7"})
+    assert query.count("EXISTS") == 2
+    assert "DISTINCT" not in query
+    assert "manage_movies_film_genres" in query
+    assert "manage_movies_film_authors" in query
+
+
+def test_ranges_and_ordering():
+    filters = compile_film_filters(
+        {"budget_min": "1000", "box_office_max": "5000", "ordering": "-release_date"}
+    )
+    assert len(filters.conditions) == 2
+    assert filters.ordering == ["-release_date", "id"]
+    assert 'ORDER BY "manage_movies_film"."release_date" DESC' in sql(
+        {"ordering": "-release_date"}
+    )
+
+
+def test_default_ordering_and_nulls():
+    # The snapshot's order, so pages do not shift when it goes stale.
+    assert compile_film_filters({}).ordering == ["id"]
+    assert 'ORDER BY "manage_movies_film"."id" ASC' in sql({})
+    assert '"budget" ASC NULLS LAST' in sql({"ordering": "budget"})
+    assert '"box_office" DESC NULLS FIRST' in sql({"ordering": "-box_office"})
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"rating": "Superb"},
+        {"author": "Kubrick"},
+        {"budget_min": "a lot"},
+        {"release_date_after": "yesterday"},
+        {"ordering": "password"},
+    ],
+)
+def test_rejects_invalid_parameters(params):
+    with pytest.raises(ValidationError) as error:
+        compile_film_filters(params)
+    assert set(error.value.detail) == set(params)
+
+
+@pytest.fixture
+def catalogue():
+    drama, action, comedy = (
+        Genre.objects.create(name=name) for name in ("Drama", "Action", "Comedy")
+    )
+    scott, cameron = (
+        Author.objects.create(name=name) for name in ("Ridley Scott", "James Cameron")
+    )
+
+    def film(title, released, genres, authors, **fields):
+        film = Film.objects.create(
+            title=title, description="", release_date=released, **fields
+        )
+        film.genres.set(genres)
+        film.authors.set(authors)
+        return film
+
+    return {
+        "alien": film(
+            "Alien",
+            date(1979, 5, 25),
+            [drama, action],
+            [scott],
+            budget=11_000_000,
+            box_office=104_000_000,
+            rating="Excellent",
+            status="Released",
+        ),
+        "aliens": film(
+            "Aliens",
+            date(1986, 7, 18),
+            [action],
+            [cameron, scott],
+            budget=18_500_000,
+            box_office=183_000_000,
+            rating="Good",
+            status="Released",
+        ),
+        "blade": film(
+            "Blade Runner",
+            date(1982, 6, 25),
+            [drama],
+            [scott],
+            budget=28_000_000,
+            box_office=41_000_000,
+            rating="Excellent",
+            status="Released",
+        ),
+        "sequel": film(
+            "Untitled Sequel",
+            date(2030, 1, 1),
+            [comedy],
+            [],
+            rating="Average",
+            status="Planned",
+        ),
+    }
+
+
+def titles(query):
+    response = APIClient().get(f"/films/?{query}")
+    assert response.status_code == 200
+    payload = response.json()
+    # The count agrees with the rows: no film is counted twice.
+    assert payload["count"] == len(payload["results"])
+    return [film["title"] for film in payload["results"]]
+
+
+@pytest.mark.django_db
+def test_genre_filter_by_id_and_name(catalogue):
+    drama = Genre.objects.get(name="Drama")
+    assert titles(f"genre={drama.pk}&ordering=title") == ["Alien", "Blade Runner"]
+    assert titles("genre=Drama&ordering=title") == ["Alien", "Blade Runner"]
+    # Alien matches both genres and is listed once.
+    assert titles(f"genre=Action,{drama.pk}&ordering=title") == [
+        "Alien",
+        "Aliens",
+        "Blade Runner",
+    ]
+    assert titles("genre=Western") == []
+
+
+@pytest.mark.django_db
+def test_author_filter(catalogue):
+    scott = Author.objects.get(name="Ridley Scott")
+    cameron = Author.objects.get(name="James Cameron")
+    assert titles(f"author={cameron.pk}") == ["Aliens"]
+    # Aliens has both authors and is listed once.
+    assert titles(f"author={scott.pk},{cameron.pk}&ordering=title") == [
+        "Alien",
+        "Aliens",
+        "Blade Runner",
+    ]
+
+
+@pytest.mark.django_db
+def test_choice_and_range_filters(catalogue):
+    assert titles("rating=excellent,average&ordering=title") == [
+        "Alien",
+        "Blade Runner",
+        "Untitled Sequel",
+    ]
+    assert titles("status=Planned") == ["Untitled Sequel"]
+    assert titles("budget_min=15000000&ordering=title") == ["Aliens", "Blade Runner"]
+    assert titles("budget_max=20000000&box_office_min=150000000") == ["Aliens"]
+    assert titles(
+        "release_date_after=1980-01-01&release_date_before=1990-12-31&ordering=title"
+    ) == ["Aliens", "Blade Runner"]
+    drama = Genre.objects.get(name="Drama")
+    assert titles(f"genre={drama.pk}&box_office_max=50000000") == ["Blade Runner"]
+
+
+@pytest.mark.django_db
+def test_ordering(catalogue):
+    assert titles("ordering=release_date") == [
+        "Alien",
+        "Blade Runner",
+        "Aliens",
+        "Untitled Sequel",
+    ]
+    assert titles("ordering=-title") == [
+        "Untitled Sequel",
+        "Blade Runner",
+        "Aliens",
+        "Alien",
+    ]
+    assert titles("ordering=-box_office&status=Released") == [
+        "Aliens",
+        "Alien",
+        "Blade Runner",
+    ]
+
+
+@pytest.mark.django_db
+def test_invalid_parameters_are_answered_with_400(catalogue):
+    for query, param in (("ordering=password", "ordering"), ("author=Scott", "author")):
+        response = APIClient().get(f"/films/?{query}")
+        assert response.status_code == 400
+        assert list(response.json()) == [param]
@@ -0,0 +1,96 @@
+import io
+from datetime import date
+
+import pytest
+from manage_movies.models import Film
+from manage_movies.parsers import NDJSONParser
+from manage_movies.serializers import FilmImportSerializer
+from manage_movies.services.film_import import import_films
+from rest_framework.exceptions import ParseError
+
+
+@pytest.mark.parametrize(
+    "reference, expected",
+    [
+        (42, ("tmdb_id", 42)),
+        ("  Jane Doe ", ("name", "Jane Doe")),
+        ({"tmdb_id": 7}, ("tmdb_id", 7)),
+        ({"name": "1917"}, ("name", "1917")),
+    ],
+    ids=["int_is_tmdb_id", "str_is_name", "explicit_tmdb_id", "explicit_name"],
+)
+def test_import_references(reference, expected):
+    """Test that author/genre references validate to (lookup, value) pairs."""
+    serializer = FilmImportSerializer(
+        data={"title": "Alien", "release_date": "1979-05-25", "authors": [reference]}
+    )
+    assert serializer.is_valid(), serializer.errors
+    assert serializer.validated_data["authors"] == [expected]
+
+
+@pytest.mark.parametrize(
+    "reference", ["", True, 4.2, {"tmdb_id": "7"}, {"id": 7}, None]
+)
+def test_import_invalid_references(reference):
+    """Test that malformed references are reported on the row."""
+    serializer = FilmImportSerializer(
+        data={"title": "Alien", "release_date": "1979-05-25", "genres": [reference]}
+    )
+    assert not serializer.is_valid()
+    assert "genres" in serializer.errors
+
+
+def test_import_defaults_keep_relations_untouched():
+    """Test model defaults and that omitted relations stay absent."""
+    serializer = FilmImportSerializer(
+        data={"title": "Alien", "release_date": "1979-05-25"}
+    )
+    assert serializer.is_valid(), serializer.errors
+    data = serializer.validated_data
+    assert data["rating"] == "Good"
+    assert data["status"] == "Planned"
+    assert "authors" not in data
+    assert "genres" not in data
+
+
+def test_ndjson_parser():
+    """Test that NDJSON bodies parse to a list, skipping blank lines."""
+    body = b'{"title": "Alien"}\n\n{"title": "Heat"}\n'
+    rows = NDJSONParser().parse(io.BytesIO(body))
+    assert rows == [{"title": "Alien"}, {"title": "Heat"}]
+
+
+def test_ndjson_parser_reports_line():
+    """Test that a malformed line raises a ParseError naming the line."""
+    with pytest.raises(ParseError, match="line 2"):
+        NDJSONParser().parse(io.BytesIO(b'{"title": "Alien"}\n{oops\n'))
+
+
+@pytest.mark.django_db
+def test_import_updates_only_provided_fields():
+    """Test that an update keeps the fields its row omits, tmdb_id 0 included."""
+    film = Film.objects.create(
+        title="Alien",
+        description="In space no one can hear you scream.",
+        release_date=date(1979, 5, 25),
+        rating=Film.RatingChoices.EXCELLENT,
+        status=Film.StatusChoices.RELEASED,
+        budget=11_000_000,
+        box_office=106_000_000,
+        tmdb_id=0,
+    )
+    result = import_films(
+        [
+            {"title": "Alien (1979)", "release_date": "1979-05-25", "tmdb_id": 0},
+            {"title": "Aliens", "release_date": "1986-07-18", "tmdb_id": 679},
+        ]
+    )
+
+    assert result == {"created": 1, "updated": 1, "errors": []}
+    film.refresh_from_db()
+    assert film.title == "Alien (1979)"
+    assert film.description == "In space no one can hear you scream."
+    assert film.rating == Film.RatingChoices.EXCELLENT
+    assert film.status == Film.StatusChoices.RELEASED
+    assert (film.budget, film.box_office) == (11_000_000, 106_000_000)
+    assert Film.objects.get(tmdb_id=679).rating == Film.RatingChoices.GOOD
@@ -0,0 +1,181 @@
+import io
+from datetime import date
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from manage_movies.management.commands import fill_db
+from manage_movies.models import Author, Film, MirroredImage
+from manage_movies.services.image_mirror import (
+    NAME_RE,
+    ImageMirror,
+    content_name,
+    image_url,
+)
+from manage_movies.services.tmdb_stub import (
+    IMAGE_VARIANTS,
+    TMDbStub,
+    image_base_url,
+    running_stub,
+)
+
+
+def test_names_follow_the_content():
+    name = content_name(b"poster", ".JPG")
+    assert name == content_name(b"poster", ".jpg")
+    assert name != content_name(b"backdrop", ".jpg")
+    assert name.startswith(f"tmdb/{name[5:7]}/{name[5:7]}")
+    assert NAME_RE.fullmatch(name)
+    assert not NAME_RE.fullmatch("tmdb/../settings.py")
+
+
+def test_image_urls():
+    name = content_name(b"poster", ".jpg")
+    assert image_url(name) == f"/images/{name}"
+    assert image_url("") is None
+
+
+@pytest.fixture
+def storage(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def image_base():
+    with running_stub(TMDbStub(movies=50)) as base_url:
+        yield image_base_url(base_url)
+
+
+def _stored_files(root):
+    return [path for path in (root / "tmdb").rglob("*") if path.is_file()]
+
+
+POSTERS = [f"/poster{i}.png" for i in range(1, 41)]
+
+
+@pytest.mark.django_db
+def test_identical_images_are_stored_once(storage, image_base):
+    mirror = ImageMirror(base_url=image_base, workers=4)
+    names = mirror.mirror(POSTERS + [None, "/poster1.png"], "w500")
+
+    assert set(names) == set(POSTERS)
+    assert all(NAME_RE.fullmatch(name) for name in names.values())
+    # The stub serves IMAGE_VARIANTS distinct images under every path.
+    assert len(set(names.values())) <= IMAGE_VARIANTS < len(POSTERS)
+    assert len(_stored_files(storage)) == len(set(names.values()))
+    assert mirror.stats["downloaded"] == len(POSTERS)
+    assert MirroredImage.objects.count() == len(POSTERS)
+    with default_storage.open(names["/poster1.png"]) as image:
+        assert content_name(image.read(), ".png") == names["/poster1.png"]
+
+
+@pytest.mark.django_db
+def test_mirrored_images_are_skipped(storage, image_base):
+    names = ImageMirror(base_url=image_base).mirror(POSTERS, "w500")
+
+    mirror = ImageMirror(base_url=image_base)
+    assert mirror.mirror(POSTERS, "w500") == names
+    assert mirror.stats == {
+        "downloaded": 0,
+        "not_modified": 0,
+        "skipped": len(POSTERS),
+        "failed": 0,
+    }
+
+
+@pytest.mark.django_db
+def test_refresh_revalidates_with_etags(storage, image_base):
+    names = ImageMirror(base_url=image_base).mirror(POSTERS, "w500")
+    fetched_at = MirroredImage.objects.get(source="w500/poster1.png").fetched_at
+
+    mirror = ImageMirror(base_url=image_base, refresh=True)
+    assert mirror.mirror(POSTERS, "w500") == names
+    assert mirror.stats["not_modified"] == len(POSTERS)
+    assert mirror.stats["downloaded"] == 0
+    image = MirroredImage.objects.get(source="w500/poster1.png")
+    assert image.etag and image.fetched_at > fetched_at
+
+
+@pytest.mark.django_db
+def test_failed_downloads_are_left_out(storage, image_base):
+    mirror = ImageMirror(base_url=image_base)
+    # The stub only serves PNG images.
+    names = mirror.mirror(["/poster1.png", "/poster2.jpg"], "w500")
+    assert list(names) == ["/poster1.png"]
+    assert mirror.stats["failed"] == 1
+    assert not MirroredImage.objects.filter(source="w500/poster2.jpg").exists()
+
+
+@pytest.mark.django_db
+def test_failed_refreshes_keep_the_mirrored_copy(storage, image_base):
+    names = ImageMirror(base_url=image_base).mirror(POSTERS[:3], "w500")
+
+    offline = ImageMirror(base_url="http://127.0.0.1:9", refresh=True, timeout=1)
+    assert offline.mirror(POSTERS[:3], "w500") == names
+    assert offline.stats["failed"] == 3
+
+
+@pytest.mark.django_db
+def test_missing_files_are_downloaded_again(storage, image_base):
+    names = ImageMirror(base_url=image_base).mirror(["/poster1.png"], "w500")
+    default_storage.delete(names["/poster1.png"])
+
+    mirror = ImageMirror(base_url=image_base)
+    assert mirror.mirror(["/poster1.png"], "w500") == names
+    assert mirror.stats["downloaded"] == 1
+    assert default_storage.exists(names["/poster1.png"])
+
+
+@pytest.mark.django_db
+def test_failed_refreshes_keep_film_and_author_images(storage, image_base, monkeypatch):
+    film = Film.objects.create(
+        title="Alien", description="", release_date=date(1979, 5, 25)
+    )
+    author = Author.objects.create(name="Ridley Scott")
+    images = ({film.pk: ("/poster1.png", "/backdrop1.png")}, {author.pk: "/p1.png"})
+    command = fill_db.Command(stdout=io.StringIO())
+    options = {"image_workers": 2, "refresh_images": False}
+    monkeypatch.setenv("TMDB_IMAGE_BASE_URL", image_base)
+    command.mirror_images(*images, options)
+    film.refresh_from_db()
+    author.refresh_from_db()
+    mirrored = (film.poster_path, film.backdrop_path, author.profile_path)
+    assert all(mirrored)
+
+    monkeypatch.setenv("TMDB_IMAGE_BASE_URL", "http://127.0.0.1:9")
+    command.mirror_images(*images, dict(options, refresh_images=True))
+    film.refresh_from_db()
+    author.refresh_from_db()
+    assert (film.poster_path, film.backdrop_path, author.profile_path) == mirrored
+
+
+@pytest.mark.django_db
+def test_served_images_are_cacheable(storage, client):
+    name = default_storage.save(content_name(b"poster", ".png"), ContentFile(b"poster"))
+
+    response = client.get(f"/images/{name}")
+    assert response.status_code == 200
+    assert b"".join(response.streaming_content) == b"poster"
+    assert response["Content-Type"] == "image/png"
+    assert response["Cache-Control"] == "public, max-age=31536000, immutable"
+    etag = response["ETag"]
+    assert etag == f'"{name.rsplit("/", 1)[-1].split(".")[0]}"'
+
+    response = client.get(f"/images/{name}", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "name",
+    [
+        "tmdb/../settings.py",
+        "spectator_avatars/ana.png",
+        content_name(b"never stored", ".png"),
+    ],
+)
+def test_unknown_images_are_not_found(storage, client, name):
+    default_storage.save("spectator_avatars/ana.png", ContentFile(b"avatar"))
+    assert client.get(f"/images/{name}").status_code == 404
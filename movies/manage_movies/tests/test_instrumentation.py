@@ -0,0 +1,65 @@
+from manage_movies.instrumentation import (
+    MetricsRegistry,
+    RequestMetrics,
+    _current,
+    record_query,
+    timed_serialization,
+)
+
+
+def test_keeps_the_slowest_queries():
+    metrics = RequestMetrics(slow_query_count=2)
+    for duration, sql in [(0.01, "a"), (0.05, "b"), (0.02, "c"), (0.03, "d")]:
+        metrics.record_query(sql, (), duration)
+
+    assert metrics.query_count == 4
+    assert round(metrics.db_time, 3) == 0.11
+    assert [sql for _, sql, _ in metrics.slowest_queries()] == ["b", "d"]
+
+
+def test_server_timing_header():
+    metrics = RequestMetrics()
+    metrics.record_query("SELECT 1", (), 0.0125)
+    metrics.serialize_time = 0.002
+
+    assert metrics.server_timing(0.05) == (
+        'db;dur=12.5;desc="1 queries", serialize;dur=2.0, total;dur=50.0'
+    )
+
+
+def test_recorders_only_count_inside_a_request():
+    def execute(sql, params, many, context):
+        return "rows"
+
+    assert record_query(execute, "SELECT 1", (), False, {}) == "rows"
+    with timed_serialization():
+        pass
+
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    try:
+        record_query(execute, "SELECT 1", (), False, {})
+        with timed_serialization():
+            pass
+    finally:
+        _current.reset(token)
+
+    assert metrics.query_count == 1
+    assert metrics.serialize_time > 0
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    metrics = RequestMetrics()
+    metrics.record_query("SELECT 1", (), 0.001)
+    registry.observe("film-list", "GET", 200, metrics, 0.02, 512)
+    registry.observe("film-list", "GET", 200, metrics, 0.3, 256)
+
+    text = registry.render()
+    labels = 'view="film-list",method="GET",status="200"'
+    assert f"http_requests_total{{{labels}}} 2" in text
+    assert f"db_queries_total{{{labels}}} 2" in text
+    assert f"response_bytes_total{{{labels}}} 768" in text
+    assert f'http_request_duration_seconds_bucket{{{labels},le="0.025"}} 1' in text
+    assert f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert "# TYPE http_request_duration_seconds histogram" in text
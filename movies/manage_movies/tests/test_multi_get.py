@@ -0,0 +1,93 @@
+from datetime import date
+
+import pytest
+from django.http import QueryDict
+from manage_movies.models import Author, Film, Genre
+from manage_movies.views import parse_ids
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+
+
+def test_ids_keep_requested_order_without_duplicates():
+    assert parse_ids(QueryDict("ids=3, 1,3,2,"), 10) == [3, 1, 2]
+    assert parse_ids(QueryDict("ids="), 10) == []
+    assert parse_ids(QueryDict("page=2"), 10) is None
+
+
+@pytest.mark.parametrize("query", ["ids=1,a", "ids=-1", "ids=1,2,3"])
+def test_invalid_or_too_many_ids(query):
+    with pytest.raises(ValidationError) as exc:
+        parse_ids(QueryDict(query), 2)
+    assert "ids" in exc.value.detail
+
+
+@pytest.fixture
+def films():
+    author = Author.objects.create(name="Ridley Scott")
+    genre = Genre.objects.create(name="Drama")
+    films = []
+    for i in range(6):
+        film = Film.objects.create(
+            title=f"Film {i}",
+            description="",
+            release_date=date(2000, 1, i + 1),
+            archived=i == 5,
+        )
+        film.authors.add(author)
+        film.genres.add(genre)
+        films.append(film)
+    return films
+
+
+@pytest.mark.django_db
+def test_films_in_requested_order_with_missing_ids(films):
+    live, archived = films[:5], films[5]
+    ids = [live[3].pk, 9999, live[0].pk, archived.pk, live[3].pk]
+    response = APIClient().get(f"/films/?ids={','.join(map(str, ids))}")
+    assert response.status_code == 200
+    payload = response.json()
+    assert [film["id"] for film in payload["results"]] == [live[3].pk, live[0].pk]
+    # Archived films are reported missing, like unknown ids.
+    assert payload["missing"] == [9999, archived.pk]
+    assert payload["results"][0]["title"] == "Film 3"
+    assert payload["results"][0]["genres"] == [Genre.objects.get().pk]
+
+
+@pytest.mark.django_db
+def test_authors_in_requested_order(films):
+    second = Author.objects.create(name="James Cameron")
+    first = Author.objects.get(name="Ridley Scott")
+    response = APIClient().get(f"/authors/?ids={second.pk},{first.pk},0")
+    payload = response.json()
+    assert [author["name"] for author in payload["results"]] == [
+        "James Cameron",
+        "Ridley Scott",
+    ]
+    assert payload["missing"] == [0]
+    # The archived film is left out of the author's films.
+    assert payload["results"][1]["films"] == [f"Film {i}" for i in range(5)]
+
+
+@pytest.mark.django_db
+def test_multi_get_takes_constant_queries(films, django_assert_num_queries):
+    client = APIClient()
+    # The films, then their authors and genres.
+    with django_assert_num_queries(3):
+        client.get(f"/films/?ids={films[0].pk}")
+    with django_assert_num_queries(3):
+        client.get(f"/films/?ids={','.join(str(film.pk) for film in films)}")
+    author = Author.objects.get()
+    # The authors, then their films.
+    with django_assert_num_queries(2):
+        client.get(f"/authors/?ids={author.pk},0")
+
+
+@pytest.mark.django_db
+def test_too_many_ids_are_answered_with_400(settings):
+    settings.MULTI_GET_MAX_IDS = 3
+    client = APIClient()
+    for endpoint in ("films", "authors"):
+        response = client.get(f"/{endpoint}/?ids=1,2,3,4")
+        assert response.status_code == 400
+        assert "ids" in response.json()
+        assert client.get(f"/{endpoint}/?ids=1,2,3").status_code == 200
@@ -0,0 +1,117 @@
+from datetime import date
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from manage_movies import paginators
+from manage_movies.models import Author, Film, Rating
+from manage_movies.paginators import EstimatedCountPaginator
+
+
+class FakeCursor:
+    """Cursor answering the pg_class estimate query with a fixed row count."""
+
+    def __init__(self, estimate):
+        self.estimate = estimate
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, sql, params):
+        self.executed.append((sql, params))
+
+    def fetchone(self):
+        return (self.estimate,)
+
+
+class FakeConnection:
+    vendor = "postgresql"
+
+    def __init__(self, estimate):
+        self.fake_cursor = FakeCursor(estimate)
+
+    def cursor(self):
+        return self.fake_cursor
+
+
+@pytest.fixture
+def films():
+    return [
+        Film.objects.create(
+            title=f"Film {i}", description="", release_date=date(2000, 1, 1)
+        )
+        for i in range(3)
+    ]
+
+
+@pytest.fixture
+def postgres(monkeypatch):
+    """Make the paginator see a PostgreSQL table estimated at 250,000 rows."""
+    connection = FakeConnection(250_000)
+    monkeypatch.setattr(paginators, "connections", {"default": connection})
+    return connection
+
+
+@pytest.mark.django_db
+def test_other_databases_count_exactly(films):
+    """Test that SQLite and other backends keep COUNT(*)."""
+    paginator = EstimatedCountPaginator(Film.all_objects.order_by("id"), 2)
+    assert paginator.estimated_count() is None
+    assert paginator.count == 3
+
+
+@pytest.mark.django_db
+def test_large_unfiltered_tables_use_the_estimate(films, postgres):
+    """Test that the planner's estimate replaces COUNT(*) on a large table."""
+    paginator = EstimatedCountPaginator(Film.all_objects.order_by("id"), 2)
+    assert paginator.count == 250_000
+    [(_, params)] = postgres.fake_cursor.executed
+    assert params == ["manage_movies_film"]
+
+
+@pytest.mark.django_db
+def test_filtered_querysets_count_exactly(films, postgres):
+    """Test that a filtered queryset is counted, the estimate not read."""
+    paginator = EstimatedCountPaginator(Film.objects.order_by("id"), 2)
+    assert paginator.count == 3
+    assert not postgres.fake_cursor.executed
+
+
+@pytest.mark.django_db
+def test_small_tables_count_exactly(films, postgres):
+    """Test that estimates below the threshold fall back to COUNT(*)."""
+    postgres.fake_cursor.estimate = 50
+    paginator = EstimatedCountPaginator(Film.all_objects.order_by("id"), 2)
+    assert paginator.count == 3
+
+
+@pytest.mark.django_db
+def test_film_changelist_loads(admin_client, films):
+    """Test that the film changelist pages with the estimating paginator."""
+    response = admin_client.get("/admin/manage_movies/film/")
+    assert response.status_code == 200
+    changelist = response.context["cl"]
+    assert isinstance(changelist.paginator, EstimatedCountPaginator)
+    assert changelist.result_count == 3
+
+
+@pytest.mark.django_db
+def test_rating_changelist_loads(admin_client, admin_user, films):
+    """Test that the rating changelist lists film and author targets."""
+    author = Author.objects.create(name="Jane")
+    for target in (films[0], author):
+        Rating.objects.create(
+            spectator=admin_user,
+            content_type=ContentType.objects.get_for_model(target),
+            object_id=target.pk,
+            score=4,
+        )
+    response = admin_client.get("/admin/manage_movies/rating/")
+    assert response.status_code == 200
+    changelist = response.context["cl"]
+    assert isinstance(changelist.paginator, EstimatedCountPaginator)
+    assert changelist.result_count == 2
+    assert b"Film 0" in response.content and b"Jane" in response.content
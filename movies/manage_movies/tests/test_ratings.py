@@ -0,0 +1,185 @@
+from datetime import date
+
+import pytest
+from accounts.models import Spectator
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from manage_movies.models import Author, Film, Rating
+from rest_framework.test import APIClient
+
+
+@pytest.fixture
+def spectator():
+    return Spectator.objects.create_user("ana", password="x")
+
+
+@pytest.fixture
+def client(spectator):
+    client = APIClient()
+    client.force_authenticate(spectator)
+    return client
+
+
+def rate(spectator, target, score=4):
+    return Rating.objects.create(
+        spectator=spectator,
+        content_type=ContentType.objects.get_for_model(target),
+        object_id=target.pk,
+        score=score,
+    )
+
+
+def rate_mixed_targets(spectator, count):
+    """Rate ``count`` films and ``count`` authors."""
+    for i in range(count):
+        film = Film.objects.create(
+            title=f"Film {i}", description="", release_date=date(2000, 1, i + 1)
+        )
+        rate(spectator, film)
+        rate(spectator, Author.objects.create(name=f"Author {i}"))
+
+
+@pytest.mark.django_db
+def test_targets_are_only_serialized_when_expanded(client, spectator):
+    rate_mixed_targets(spectator, 1)
+    results = client.get("/ratings/").json()["results"]
+    assert len(results) == 2
+    assert all("target" not in rating for rating in results)
+
+
+@pytest.mark.django_db
+def test_expanded_targets(client, spectator):
+    film = Film.objects.create(
+        title="Alien", description="", release_date=date(1979, 5, 25)
+    )
+    author = Author.objects.create(name="Ridley Scott")
+    rate(spectator, film)
+    rate(spectator, author)
+
+    results = client.get("/ratings/?expand=target").json()["results"]
+    targets = {rating["content_type"]: rating["target"] for rating in results}
+    assert targets == {
+        "film": {"id": film.pk, "title": "Alien", "release_date": "1979-05-25"},
+        "author": {"id": author.pk, "name": "Ridley Scott"},
+    }
+
+
+@pytest.mark.django_db
+def test_expanded_targets_take_one_query_per_content_type(
+    client, spectator, django_assert_num_queries
+):
+    # Warm the content type cache, as in a running worker.
+    ContentType.objects.get_for_models(Film, Author)
+    rate_mixed_targets(spectator, 1)
+    # Count, page, then the films and the authors of the page.
+    with django_assert_num_queries(4):
+        response = client.get("/ratings/?expand=target")
+    assert len(response.json()["results"]) == 2
+
+    rate_mixed_targets(spectator, 4)
+    with django_assert_num_queries(4):
+        response = client.get("/ratings/?expand=target")
+    assert len(response.json()["results"]) == 10
+
+
+@pytest.fixture
+def ratings(spectator):
+    """Two spectators rating the same film, one of them an author too."""
+    other = Spectator.objects.create_user("bob", password="x")
+    film = Film.objects.create(
+        title="Alien", description="", release_date=date(1979, 5, 25)
+    )
+    author = Author.objects.create(name="Ridley Scott")
+    return {
+        "mine": rate(spectator, film),
+        "other_film": rate(other, film, score=2),
+        "other_author": rate(other, author, score=5),
+    }
+
+
+def listed_ids(response):
+    assert response.status_code == 200
+    return {rating["id"] for rating in response.json()["results"]}
+
+
+@pytest.mark.django_db
+def test_rating_list_defaults_to_the_users_ratings(client, ratings):
+    assert listed_ids(client.get("/ratings/")) == {ratings["mine"].pk}
+    assert listed_ids(client.get("/ratings/?mine=1")) == {ratings["mine"].pk}
+    # Only staff can list every rating.
+    assert listed_ids(client.get("/ratings/?mine=0")) == {ratings["mine"].pk}
+
+
+@pytest.mark.django_db
+def test_staff_can_list_every_rating(client, spectator, ratings):
+    spectator.is_staff = True
+    spectator.save()
+    assert listed_ids(client.get("/ratings/?mine=0")) == {
+        rating.pk for rating in ratings.values()
+    }
+
+
+@pytest.mark.django_db
+def test_rating_list_of_one_target(client, ratings):
+    film = ratings["mine"].content_object
+    response = client.get(f"/ratings/?content_type=film&object_id={film.pk}")
+    assert listed_ids(response) == {ratings["mine"].pk, ratings["other_film"].pk}
+
+    author = ratings["other_author"].content_object
+    response = client.get(f"/ratings/?content_type=author&object_id={author.pk}")
+    assert listed_ids(response) == {ratings["other_author"].pk}
+
+
+@pytest.mark.django_db
+def test_rating_list_of_one_spectator(client, ratings):
+    other = ratings["other_film"].spectator
+    response = client.get(f"/ratings/?spectator={other.pk}")
+    assert listed_ids(response) == {
+        ratings["other_film"].pk,
+        ratings["other_author"].pk,
+    }
+    response = client.get(f"/ratings/?spectator={other.pk}&content_type=author")
+    assert listed_ids(response) == {ratings["other_author"].pk}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "query, param",
+    [
+        ("content_type=spectator&object_id=1", "content_type"),
+        ("content_type=film&object_id=one", "object_id"),
+        ("spectator=ana", "spectator"),
+        ("mine=maybe", "mine"),
+    ],
+)
+def test_invalid_rating_list_parameters(client, ratings, query, param):
+    response = client.get(f"/ratings/?{query}")
+    assert response.status_code == 400
+    assert param in response.json()
+
+
+@pytest.mark.django_db
+def test_other_spectators_ratings_cannot_be_changed(client, ratings):
+    response = client.patch(
+        f"/ratings/{ratings['other_film'].pk}/", {"score": 1}, format="json"
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_rating_list_indexes():
+    """Test that migration 0006 left one index per rating list slice."""
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, Rating._meta.db_table
+        )
+    assert constraints["rating_spectator_recent_idx"]["columns"] == [
+        "spectator_id",
+        "created_at",
+    ]
+    assert constraints["rating_target_recent_idx"]["columns"] == [
+        "content_type_id",
+        "object_id",
+        "created_at",
+    ]
+    assert "rating_target_idx" not in constraints
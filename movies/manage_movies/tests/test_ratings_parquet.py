@@ -0,0 +1,112 @@
+import io
+from datetime import date, datetime, timezone
+
+import pytest
+from accounts.models import Spectator
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from manage_movies.models import Film, Rating
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+from manage_movies.services.ratings_parquet import (  # noqa: E402
+    PartitionedParquetWriter,
+    new_run_id,
+    partition_key,
+    read_ratings,
+    read_watermark,
+    write_watermark,
+)
+
+
+def _rating(rating_id, content_type, created_at, score=4, updated_at=None):
+    """Build an exported rating row."""
+    return {
+        "id": rating_id,
+        "spectator_id": 1,
+        "content_type": content_type,
+        "object_id": 10,
+        "score": score,
+        "comment": "",
+        "created_at": created_at,
+        "updated_at": updated_at or created_at,
+        "target_name": "Alien",
+        "film_release_date": date(1979, 5, 25) if content_type == "film" else None,
+        "film_rating": "Good" if content_type == "film" else None,
+        "film_status": "Released" if content_type == "film" else None,
+    }
+
+
+def test_partition_key():
+    """Test that rows are partitioned by content type and creation month."""
+    row = _rating(1, "author", datetime(2024, 6, 30, 23, 59, tzinfo=timezone.utc))
+    assert partition_key(row) == ("author", "2024-06")
+
+
+def test_run_ids_are_unique_and_sort_by_time():
+    """Test that runs started within the same second get distinct file names."""
+    run_ids = [new_run_id() for _ in range(50)]
+    assert len(set(run_ids)) == 50
+    assert [run_id.split("-")[0] for run_id in run_ids] == sorted(
+        run_id.split("-")[0] for run_id in run_ids
+    )
+
+
+def test_writer_splits_batches_into_partitions(tmp_path):
+    """Test that batches land in one file per partition, one row group each."""
+    june = datetime(2024, 6, 1, tzinfo=timezone.utc)
+    july = datetime(2024, 7, 1, tzinfo=timezone.utc)
+    with PartitionedParquetWriter(tmp_path, "run1") as writer:
+        writer.write([_rating(1, "film", june), _rating(2, "author", june)])
+        writer.write([_rating(3, "film", june), _rating(4, "film", july)])
+    assert writer.rows_written == 4
+
+    june_films = tmp_path / "content_type=film" / "month=2024-06" / "part-run1.parquet"
+    assert pq.read_table(june_films).column("id").to_pylist() == [1, 3]
+    assert pq.ParquetFile(june_films).num_row_groups == 2
+    assert (tmp_path / "content_type=author" / "month=2024-06").is_dir()
+    assert (tmp_path / "content_type=film" / "month=2024-07").is_dir()
+
+
+def test_dataset_reads_back_without_duplicates(tmp_path):
+    """Test that the partitioned dataset reads back, latest export of each rating."""
+    june = datetime(2024, 6, 1, tzinfo=timezone.utc)
+    later = datetime(2024, 6, 3, tzinfo=timezone.utc)
+    with PartitionedParquetWriter(tmp_path, "run1") as writer:
+        writer.write([_rating(1, "film", june), _rating(2, "author", june)])
+    with PartitionedParquetWriter(tmp_path, "run2") as writer:
+        # Rating 1 updated since, rating 2 exported again by the overlap.
+        writer.write([_rating(1, "film", june, score=2, updated_at=later)])
+        writer.write([_rating(2, "author", june)])
+
+    table = read_ratings(tmp_path)
+    rows = {row["id"]: row for row in table.to_pylist()}
+    assert table.num_rows == 2
+    assert rows[1]["score"] == 2 and rows[1]["content_type"] == "film"
+    assert rows[2]["content_type"] == "author" and rows[2]["month"] == "2024-06"
+
+
+def test_watermark_roundtrip(tmp_path):
+    """Test that the incremental watermark is persisted between runs."""
+    assert read_watermark(tmp_path) is None
+    updated_at = datetime(2024, 6, 1, 12, 30, tzinfo=timezone.utc)
+    write_watermark(tmp_path, updated_at)
+    assert read_watermark(tmp_path) == updated_at
+
+
+@pytest.mark.django_db
+def test_runs_within_a_second_keep_each_others_rows(tmp_path):
+    """Test that a second export right after the first adds a file of its own."""
+    spectator = Spectator.objects.create_user("ana", password="x")
+    film = Film.objects.create(title="Alien", description="", release_date=date.today())
+    Rating.objects.create(
+        spectator=spectator,
+        content_type=ContentType.objects.get_for_model(Film),
+        object_id=film.pk,
+        score=4,
+    )
+    call_command("export_ratings_parquet", str(tmp_path), stdout=io.StringIO())
+    call_command("export_ratings_parquet", str(tmp_path), stdout=io.StringIO())
+
+    assert len(list(tmp_path.glob("content_type=film/month=*/part-*.parquet"))) == 2
+    assert read_ratings(tmp_path).num_rows == 1
@@ -0,0 +1,63 @@
+import io
+import json
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy
+from manage_movies.parsers import ORJSONParser
+from manage_movies.renderers import ORJSONRenderer
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+
+@pytest.fixture
+def payload():
+    """Provide a payload mixing the types the API renders."""
+    return {
+        "title": "Alien",
+        "release_date": date(1979, 5, 25),
+        "created_at": datetime(2024, 6, 22, 10, 30, tzinfo=timezone.utc),
+        "updated_at": datetime(2024, 6, 22, 10, 30, 5, 123456, tzinfo=timezone.utc),
+        "starts_at": time(20, 45, 1, 500000),
+        "budget": Decimal("11000000.50"),
+        "label": gettext_lazy("Released"),
+        "genres": [1, 2],
+    }
+
+
+def test_render_matches_stdlib_renderer(payload):
+    """Test that orjson output decodes to the same data as DRF's renderer."""
+    fast = json.loads(ORJSONRenderer().render(payload))
+    slow = json.loads(JSONRenderer().render(payload))
+    assert fast == slow
+    assert fast["budget"] == 11000000.5
+    assert fast["label"] == "Released"
+    assert fast["created_at"] == "2024-06-22T10:30:00Z"
+    assert fast["updated_at"] == "2024-06-22T10:30:05.123456Z"
+    assert fast["starts_at"] == "20:45:01.500000"
+
+
+def test_render_none_is_empty():
+    """Test that rendering None produces an empty body."""
+    assert ORJSONRenderer().render(None) == b""
+
+
+def test_render_indent(payload):
+    """Test that an indent requested through the media type is honoured."""
+    body = ORJSONRenderer().render(payload, "application/json; indent=4")
+    assert b"\n  " in body
+
+
+def test_parse_roundtrip(payload):
+    """Test that rendered payloads parse back with the orjson parser."""
+    body = ORJSONRenderer().render(payload)
+    parsed = ORJSONParser().parse(io.BytesIO(body))
+    assert parsed["title"] == "Alien"
+    assert parsed["genres"] == [1, 2]
+
+
+def test_parse_error():
+    """Test that invalid JSON raises a DRF ParseError."""
+    with pytest.raises(ParseError):
+        ORJSONParser().parse(io.BytesIO(b"{not json"))
@@ -0,0 +1,193 @@
+import datetime
+import time
+
+import pytest
+from django.http import QueryDict
+from django.utils import timezone
+from manage_movies.models import Author, Film, Genre
+from manage_movies.services import snapshot as snapshots
+from manage_movies.services.snapshot import Snapshot, pack
+from rest_framework.test import APIClient
+
+CREATED = timezone.make_aware(datetime.datetime(2024, 5, 1, 12))
+
+
+def film(pk, title_rank, released, budget=None, genres=(), authors=(), **extra):
+    return {
+        "id": pk,
+        "title_rank": title_rank,
+        "release_date": datetime.date(released, 1, 1),
+        "created_at": CREATED + datetime.timedelta(days=pk),
+        "rating": extra.get("rating", "Good"),
+        "status": extra.get("status", "Released"),
+        "tmdb_id": extra.get("tmdb_id"),
+        "budget": budget,
+        "box_office": None,
+        "genres": list(genres),
+        "authors": list(authors),
+        "list": {"id": pk, "title": f"Film {pk}"},
+        "detail": {"id": pk, "title": f"Film {pk}", "genres": list(genres)},
+    }
+
+
+@pytest.fixture
+def snapshot():
+    films = [
+        film(1, 2, 1999, budget=30, genres=[7], authors=[1], rating="Bad"),
+        film(2, 0, 2005, genres=[7, 8], authors=[2], tmdb_id=20),
+        film(3, 1, 2005, budget=10, authors=[1, 2], status="Planned"),
+        film(4, 3, 2012, budget=20, genres=[8], tmdb_id=40),
+    ]
+    return Snapshot(pack(films, {"Drama": 7, "Comedy": 8}, 1.0))
+
+
+def select(snapshot, query, ordering=()):
+    rows = snapshot.select(QueryDict(query), list(ordering))
+    return [film["id"] for film in snapshot.films(rows, ["id"])]
+
+
+def test_rejects_other_files():
+    with pytest.raises(ValueError):
+        Snapshot(b"not a snapshot, not at all")
+
+
+def test_details_and_payloads(snapshot):
+    assert snapshot.count == 4 and snapshot.created_at == 1.0
+    assert snapshot.film_detail(2) == {"id": 2, "title": "Film 2", "genres": [7, 8]}
+    assert snapshot.film_detail(5) is None
+    # Rows are positions, in id order.
+    assert snapshot.films([2], ["title"]) == [{"title": "Film 3"}]
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("", [1, 2, 3, 4]),
+        ("genre=Drama", [1, 2]),
+        ("genre=8,Horror", [2, 4]),
+        ("author=2", [2, 3]),
+        ("rating=bad,excellent", [1]),
+        ("status=PLANNED", [3]),
+        ("source=tmdb", [2, 4]),
+        ("source=admin&budget_min=15", [1]),
+        ("budget_max=20", [3, 4]),
+        ("release_date_after=2005-01-01&release_date_before=2010-01-01", [2, 3]),
+        ("created_at_after=2024-05-04", [3, 4]),
+    ],
+)
+def test_filters(snapshot, query, expected):
+    assert select(snapshot, query) == expected
+
+
+@pytest.mark.parametrize(
+    "ordering, expected",
+    [
+        (["title", "id"], [2, 3, 1, 4]),
+        (["-release_date", "id"], [4, 2, 3, 1]),
+        (["release_date", "-id"], [1, 3, 2, 4]),
+        # NULLs last ascending and first descending, as on PostgreSQL.
+        (["budget", "id"], [3, 4, 1, 2]),
+        (["-budget", "id"], [2, 1, 4, 3]),
+        (["-created_at"], [4, 3, 2, 1]),
+        (["budget", "-id"], [3, 4, 1, 2]),
+        (["-budget", "-id"], [2, 1, 4, 3]),
+        (["-title", "-release_date", "id"], [4, 1, 3, 2]),
+    ],
+)
+def test_ordering(snapshot, ordering, expected):
+    assert select(snapshot, "", ordering) == expected
+
+
+@pytest.mark.parametrize("threshold", [1, 1000], ids=["permutation", "sort"])
+@pytest.mark.parametrize(
+    "ordering, expected",
+    [
+        (["-budget", "id"], [2, 1, 4]),
+        (["release_date", "-id"], [1, 2, 4]),
+        (["-release_date", "-id"], [4, 2, 1]),
+    ],
+)
+def test_filtered_ordering(snapshot, monkeypatch, threshold, ordering, expected):
+    monkeypatch.setattr(snapshots, "SORT_THRESHOLD", threshold)
+    assert select(snapshot, "genre=Drama,Comedy", ordering) == expected
+
+
+def test_genre_and_author_indexes(snapshot):
+    assert snapshot.columns["genre_index_ids"].tolist() == [7, 8]
+    assert snapshot.columns["genre_index_rows"].tolist() == [0, 1, 1, 3]
+    assert snapshot._rows_with("author", {2, 9, None}) == {1, 2}
+
+
+def test_changes_from_other_processes_make_it_stale(tmp_path, settings, monkeypatch):
+    path = str(tmp_path / "catalogue.snap")
+    settings.CATALOGUE_SNAPSHOT = path
+    for name, value in (("_snapshot", None), ("_changed_at", 0.0)):
+        monkeypatch.setattr(snapshots, name, value)
+    with open(path, "wb") as file:
+        file.write(pack([film(1, 0, 1999)], {}, time.time()))
+    monkeypatch.setattr(snapshots, "_checked_at", 0.0)
+    assert snapshots.get_snapshot().count == 1
+    assert not snapshots.is_stale(path)
+
+    # Another process commits a write.
+    with open(f"{path}.changed", "w") as file:
+        file.write(repr(time.time() + 1))
+    monkeypatch.setattr(snapshots, "_checked_at", 0.0)
+    assert snapshots.get_snapshot() is None
+    assert snapshots.is_stale(path)
+
+
+@pytest.fixture
+def catalogue():
+    """Twelve films, a third of them without budget or box office."""
+    drama = Genre.objects.create(name="Drama")
+    author = Author.objects.create(name="Ridley Scott")
+    for i in range(12):
+        film = Film.objects.create(
+            title=f"Film {(i * 5) % 12:02}",
+            description="",
+            release_date=datetime.date(2000 + i % 4, 1, 1),
+            budget=None if i % 3 == 0 else (i % 4) * 1000,
+            box_office=None if i % 3 == 1 else (i % 5) * 1000,
+            status="Released" if i % 2 else "Planned",
+        )
+        film.genres.add(drama) if i % 2 else film.authors.add(author)
+    Film.objects.create(
+        title="Archived", description="", release_date=datetime.date(2000, 1, 1)
+    )
+    Film.objects.filter(title="Archived").update(archived=True)
+    return Film.all_objects.order_by("pk")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "query",
+    [
+        "",
+        "page=2",
+        "ordering=budget",
+        "ordering=-budget&page=2",
+        "ordering=box_office,-release_date",
+        "ordering=-box_office,title",
+        "ordering=-title",
+        "genre=Drama&ordering=-release_date",
+        "status=Planned&budget_min=1000&ordering=budget",
+        "fields=id,title&ordering=release_date,-id",
+    ],
+)
+def test_snapshot_answers_as_the_database(
+    catalogue, tmp_path, settings, monkeypatch, query
+):
+    """Test that list and detail responses do not depend on the snapshot."""
+    client = APIClient()
+    urls = [f"/films/?{query}"] + [f"/films/{film.pk}/" for film in catalogue]
+    from_database = [client.get(url).json() for url in urls]
+
+    path = str(tmp_path / "catalogue.snap")
+    assert snapshots.write_snapshot(path) == 12
+    settings.CATALOGUE_SNAPSHOT = path
+    for name, value in (("_snapshot", None), ("_changed_at", 0.0)):
+        monkeypatch.setattr(snapshots, name, value)
+    monkeypatch.setattr(snapshots, "_checked_at", 0.0)
+    assert snapshots.get_snapshot() is not None
+    assert [client.get(url).json() for url in urls] == from_database
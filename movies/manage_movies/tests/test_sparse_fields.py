@@ -0,0 +1,117 @@
+from datetime import date
+
+import pytest
+from manage_movies.models import Author, Film
+from manage_movies.serializers import (
+    AuthorDetailSerializer,
+    FilmDetailSerializer,
+    sparse_fields,
+)
+from manage_movies.views import shape_queryset
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+FIELDS = ["id", "title", "release_date", "status", "description"]
+
+
+def _request(method="get", query=""):
+    """Build a DRF request for the films endpoint with a query string."""
+    factory = APIRequestFactory()
+    return Request(getattr(factory, method)(f"/films/{query}"))
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("", FIELDS),
+        ("?fields=title,id", ["id", "title"]),
+        ("?fields=title, status", ["title", "status"]),
+        ("?exclude=description", ["id", "title", "release_date", "status"]),
+        ("?fields=id,title,description&exclude=description", ["id", "title"]),
+        ("?fields=unknown", FIELDS),
+    ],
+    ids=[
+        "no_params",
+        "fields_keep_declaration_order",
+        "fields_with_spaces",
+        "exclude",
+        "fields_and_exclude",
+        "unknown_falls_back_to_all",
+    ],
+)
+def test_sparse_fields(query, expected):
+    """Test field selection from ?fields= and ?exclude= parameters."""
+    assert sparse_fields(_request(query=query), FIELDS) == expected
+
+
+def test_sparse_fields_only_for_reads():
+    """Test that write requests always keep every field."""
+    assert sparse_fields(_request("post", "?fields=id"), FIELDS) == FIELDS
+    assert sparse_fields(None, FIELDS) == FIELDS
+
+
+@pytest.fixture
+def film():
+    author = Author.objects.create(name="Ridley Scott")
+    film = Film.objects.create(
+        title="Alien", description="In space", release_date=date(1979, 5, 25)
+    )
+    film.authors.add(author)
+    return film
+
+
+@pytest.mark.django_db
+def test_list_payloads_are_trimmed(film):
+    client = APIClient()
+    response = client.get("/films/?fields=title,id")
+    assert response.json()["results"] == [{"id": film.pk, "title": "Alien"}]
+
+    response = client.get("/authors/?exclude=biography,birth_date")
+    assert response.json()["results"] == [
+        {"id": film.authors.get().pk, "name": "Ridley Scott", "movies_list": ["Alien"]}
+    ]
+
+
+@pytest.mark.django_db
+def test_detail_payloads_are_trimmed(film):
+    client = APIClient()
+    response = client.get(f"/films/{film.pk}/?fields=title,release_date")
+    assert response.json() == {"title": "Alien", "release_date": "1979-05-25"}
+
+    author = film.authors.get()
+    response = client.get(f"/authors/{author.pk}/?exclude=films,biography")
+    assert "films" not in response.json()
+    assert "biography" not in response.json()
+    assert response.json()["name"] == "Ridley Scott"
+
+
+def test_shape_queryset_loads_selected_columns_only():
+    request = _request(query="?fields=id,title")
+    serializer = FilmDetailSerializer(context={"request": request})
+    qs = shape_queryset(Film.objects.all(), serializer)
+    assert qs.query.deferred_loading == ({"id", "title"}, False)
+    assert not qs._prefetch_related_lookups
+    assert not qs.query.select_related
+
+
+def test_shape_queryset_prefetches_selected_relations_only():
+    full = shape_queryset(
+        Author.objects.all(), AuthorDetailSerializer(context={"request": _request()})
+    )
+    assert [p.prefetch_through for p in full._prefetch_related_lookups] == ["films"]
+
+    request = _request(query="?exclude=films")
+    trimmed = shape_queryset(
+        Author.objects.all(), AuthorDetailSerializer(context={"request": request})
+    )
+    assert not trimmed._prefetch_related_lookups
+
+
+@pytest.mark.django_db
+def test_trimmed_details_skip_prefetches(film, django_assert_num_queries):
+    client = APIClient()
+    author = film.authors.get()
+    with django_assert_num_queries(2):
+        client.get(f"/authors/{author.pk}/")
+    with django_assert_num_queries(1):
+        client.get(f"/authors/{author.pk}/?fields=name")
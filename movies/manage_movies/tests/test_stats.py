@@ -0,0 +1,77 @@
+import datetime
+from types import SimpleNamespace
+
+import pytest
+from accounts.models import Spectator
+from django.db import connection
+from manage_movies.models import Film, FilmYearStats
+from manage_movies.services import stats
+from manage_movies.services.stats import STATS_VIEWS, refresh_stats
+from rest_framework.test import APIClient
+
+pytestmark = pytest.mark.django_db
+
+
+def _film(title, year, budget=None, box_office=None):
+    return Film.objects.create(
+        title=title,
+        description="",
+        release_date=datetime.date(year, 1, 1),
+        budget=budget,
+        box_office=box_office,
+    )
+
+
+def test_migration_creates_the_views():
+    """Test that migration 0004 created every statistics view."""
+    assert set(STATS_VIEWS) <= set(connection.introspection.table_names())
+
+
+def test_refresh_recomputes_the_views():
+    """Test that a refresh picks up films written since the last one."""
+    _film("Alien", 1979, budget=10, box_office=100)
+    _film("Apocalypse Now", 1979, budget=30, box_office=60)
+    _film("Heat", 1995)
+    assert not FilmYearStats.objects.exists()
+
+    refresh_stats()
+
+    rows = {row.year: row for row in FilmYearStats.objects.all()}
+    assert set(rows) == {1979, 1995}
+    assert rows[1979].film_count == 2
+    assert rows[1979].total_budget == 40
+    assert rows[1979].roi == pytest.approx(4.0)
+    assert rows[1995].roi is None
+
+
+def test_bulk_import_defers_the_refresh(
+    monkeypatch, django_capture_on_commit_callbacks
+):
+    """Test that /films/bulk/ refreshes statistics after commit, off the request."""
+    started = []
+
+    class Thread:
+        def __init__(self, target, daemon):
+            self.target = target
+
+        def start(self):
+            started.append(self.target)
+
+    monkeypatch.setattr(stats, "threading", SimpleNamespace(Thread=Thread))
+    monkeypatch.setattr(stats, "_refreshing", False)
+    client = APIClient()
+    client.force_authenticate(Spectator.objects.create_user("editor", password="x"))
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        response = client.post(
+            "/films/bulk/",
+            [{"title": "Alien", "release_date": "1979-05-25"}],
+            format="json",
+        )
+        assert response.status_code == 200
+        assert not FilmYearStats.objects.exists()
+        assert not started
+
+    assert stats._start_refresh in callbacks
+    stats._start_refresh()
+    assert started == [stats._refresh_in_background]
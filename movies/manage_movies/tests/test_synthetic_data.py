@@ -0,0 +1,97 @@
+import io
+import random
+from datetime import date
+
+import pytest
+from accounts.models import Spectator
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count, Sum
+from manage_movies.models import Film, FilmYearStats, Rating
+from manage_movies.services import synthetic_data
+from manage_movies.services.synthetic_data import (
+    _allocate,
+    _copy_value,
+    _distinct_films,
+    seed_catalogue,
+    skewed_index,
+)
+
+
+def test_skewed_index_favours_low_indexes():
+    rng = random.Random(0)
+    draws = [skewed_index(rng, 100) for _ in range(10_000)]
+    assert 0 <= min(draws) and max(draws) < 100
+    assert sum(draw < 10 for draw in draws) > sum(draw >= 90 for draw in draws) * 5
+
+
+def test_allocate_respects_total_and_cap():
+    counts = _allocate(random.Random(0), 1_000, 50, cap=60)
+    assert sum(counts) == 1_000
+    assert max(counts) == 60
+    assert _allocate(random.Random(0), 1_000, 3, cap=10) == [10, 10, 10]
+
+
+def test_distinct_films(monkeypatch):
+    monkeypatch.setattr(synthetic_data, "_film_ids", list(range(100, 200)))
+    rng = random.Random(0)
+    for count in (5, 60, 100):
+        films = list(_distinct_films(rng, count))
+        assert len(films) == len(set(films)) == count
+        assert set(films) <= set(range(100, 200))
+
+
+def test_copy_value_escapes_text_format():
+    assert _copy_value(None) == "\\N"
+    assert _copy_value(True) == "t"
+    assert _copy_value(date(2024, 6, 1)) == "2024-06-01"
+    assert _copy_value("a\tb\nc\\d") == "a\\tb\\nc\\\\d"
+
+
+@pytest.mark.django_db
+def test_seed_catalogue():
+    counts = seed_catalogue(
+        films=40, authors=5, spectators=10, favorites=30, ratings=50, seed=1
+    )
+    assert counts == {
+        "films": 40,
+        "authors": 5,
+        "spectators": 10,
+        "favorites": 30,
+        "ratings": 50,
+    }
+    assert Film.all_objects.count() == 40
+    assert Rating.objects.count() == 50
+    assert Film.favorited_by.through.objects.count() == 30
+    films = Film.all_objects.annotate(
+        directors=Count("authors", distinct=True),
+        genre_count=Count("genres", distinct=True),
+    )
+    assert all(1 <= film.directors <= 2 for film in films)
+    assert all(1 <= film.genre_count <= 3 for film in films)
+
+
+@pytest.mark.django_db
+def test_seed_catalogue_again_after_deletions():
+    seed_catalogue(films=10, authors=2, spectators=5, favorites=0, ratings=0)
+    Spectator.objects.order_by("pk")[0].delete()
+    Film.all_objects.order_by("pk")[0].delete()
+
+    seed_catalogue(films=10, authors=2, spectators=5, favorites=0, ratings=0)
+    assert Spectator.objects.count() == 9
+    assert Film.all_objects.count() == 19
+    usernames = list(Spectator.objects.values_list("username", flat=True))
+    assert len(set(usernames)) == len(usernames)
+
+
+@pytest.mark.django_db
+def test_generate_data_command():
+    out = io.StringIO()
+    call_command(
+        "generate_data", "--films=20", "--spectators=5", "--workers=1", stdout=out
+    )
+    assert "Generated 20 films, 2 authors, 5 spectators" in out.getvalue()
+    assert FilmYearStats.objects.aggregate(total=Sum("film_count"))["total"] == 20
+
+    with pytest.raises(CommandError):
+        call_command("generate_data", "--films=-1", stdout=out)
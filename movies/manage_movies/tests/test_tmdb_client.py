@@ -136,3 +136,12 @@ def test_fetch_movie_genres(monkeypatch, client):
 
     genres = client.fetch_movie_genres()
     assert genres == genres_mock["genres"]
+
+
+def test_base_url_is_configurable(monkeypatch):
+    """Test that the client can be pointed at another server."""
+    monkeypatch.setenv("TMDB_BASE_URL", "http://127.0.0.1:8765/3/")
+    assert TMDbClient(api_key="k").BASE_URL == "http://127.0.0.1:8765/3"
+    assert TMDbClient(api_key="k", base_url="http://stub").BASE_URL == "http://stub"
+    monkeypatch.delenv("TMDB_BASE_URL")
+    assert TMDbClient(api_key="k").BASE_URL == "https://api.themoviedb.org/3"
@@ -0,0 +1,92 @@
+import pytest
+import requests
+from manage_movies.services import tmdb_stub
+from manage_movies.services.tmdb_client import TMDbClient
+from manage_movies.services.tmdb_stub import (
+    DIRECTOR_ID_OFFSET,
+    IMAGE_VARIANTS,
+    TMDbStub,
+    TokenBucket,
+    running_stub,
+)
+
+
+def test_payloads_are_deterministic():
+    first, second = TMDbStub(movies=100), TMDbStub(movies=100)
+    assert first.movie_details(42) == second.movie_details(42)
+    assert first.credits(42) == second.credits(42)
+    assert TMDbStub(movies=100, seed=1).movie_details(42) != first.movie_details(42)
+
+
+def test_movie_lists_are_paginated():
+    stub = TMDbStub(movies=45)
+    status, page, _ = stub.route("/3/movie/popular", {"page": "3"})
+    assert status == 200
+    assert [movie["id"] for movie in page["results"]] == [41, 42, 43, 44, 45]
+    assert page["total_pages"] == 3
+
+    _, upcoming, _ = stub.route("/3/movie/upcoming", {})
+    assert upcoming["results"][0]["id"] == 45
+
+
+def test_unknown_resources_are_not_found():
+    stub = TMDbStub(movies=10, directors=2)
+    assert stub.route("/3/movie/11", {})[0] == 404
+    assert stub.route(f"/3/person/{DIRECTOR_ID_OFFSET + 2}", {})[0] == 404
+    assert stub.route("/3/tv/popular", {})[0] == 404
+
+
+def test_injects_errors_and_rate_limits():
+    failing = TMDbStub(movies=10, error_rate=1.0)
+    assert failing.handle("/3/movie/1", {})[0] == 500
+
+    throttled = TMDbStub(movies=10, rate_limit=1)
+    assert throttled.handle("/3/movie/1", {})[0] == 200
+    status, _, headers = throttled.handle("/3/movie/1", {})
+    assert status == 429
+    assert headers["Retry-After"] == "1"
+    assert throttled.stats == {"requests": 2, "errors": 0, "throttled": 1}
+
+
+def test_rates_below_one_request_per_second(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(tmdb_stub.time, "monotonic", lambda: now[0])
+    bucket = TokenBucket(0.5)
+    assert bucket.take()
+    assert not bucket.take()
+    assert bucket.retry_after() == 2
+
+    now[0] += 2
+    assert bucket.take()
+    # Bursts stay limited to one request.
+    now[0] += 60
+    assert bucket.take()
+    assert not bucket.take()
+
+
+def test_client_against_running_stub():
+    with running_stub(TMDbStub(movies=50)) as base_url:
+        client = TMDbClient(api_key="dummy_key", base_url=base_url)
+        assert len(client.fetch_movie_genres()) == 19
+        movies = client.fetch_popular_and_upcoming_movies()
+        assert len(movies) == 40
+
+        directors = client.fetch_movie_directors(movies[0]["id"])
+        person = client.fetch_director_details(directors[0]["id"])
+        assert person["name"].startswith("Stub director")
+        with pytest.raises(requests.HTTPError):
+            client.fetch_movie_details(51)
+
+
+def test_serves_images_with_etags():
+    stub = TMDbStub(movies=10)
+    assert stub.movie_summary(3)["poster_path"] == "/poster3.png"
+
+    status, body, headers = stub.route_image("/t/p/w500/poster3.png", {})
+    assert status == 200 and body.startswith(b"\x89PNG")
+    etag = headers["ETag"]
+    assert stub.route_image("/t/p/w500/poster3.png", {"If-None-Match": etag})[0] == 304
+    assert stub.route_image("/t/p/w500/poster3.txt", {})[0] == 404
+
+    bodies = {stub.image(f"poster{movie_id}.png") for movie_id in range(1, 100)}
+    assert len(bodies) <= IMAGE_VARIANTS
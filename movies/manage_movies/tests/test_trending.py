@@ -0,0 +1,89 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from accounts.models import Spectator
+from django.db import DatabaseError
+from manage_movies.models import Film, FilmTrendBucket, Rating
+from manage_movies.services import trending
+from manage_movies.services.trending import current_hour, decay_weights, record
+from rest_framework.test import APIClient
+
+
+@pytest.fixture
+def client():
+    client = APIClient()
+    client.force_authenticate(Spectator.objects.create_user("ana", password="x"))
+    return client
+
+
+def test_buckets_are_hours():
+    now = datetime(2025, 3, 1, 14, 59, 30, 12, tzinfo=timezone.utc)
+    assert current_hour(now) == datetime(2025, 3, 1, 14, tzinfo=timezone.utc)
+
+
+def test_weights_halve_every_half_life():
+    weights = decay_weights(half_life_hours=12, window_hours=48)
+    assert len(weights) == 48
+    assert weights[0] == 1
+    assert weights[12] == pytest.approx(0.5)
+    assert weights[36] == pytest.approx(0.125)
+    assert weights == sorted(weights, reverse=True)
+
+
+@pytest.mark.django_db
+def test_rating_a_missing_film_is_rejected(client):
+    response = client.post(
+        "/ratings/", {"content_type": "film", "object_id": 999, "score": 4}
+    )
+    assert response.status_code == 400
+    assert response.json() == {"object_id": ["No film with this id."]}
+    assert not Rating.objects.exists()
+
+
+@pytest.mark.django_db
+def test_new_ratings_are_counted_once_committed(
+    client, django_capture_on_commit_callbacks
+):
+    film = Film.objects.create(
+        title="Alien", description="", release_date=date(1979, 5, 25)
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(
+            "/ratings/", {"content_type": "film", "object_id": film.pk, "score": 4}
+        )
+        assert response.status_code == 201
+        assert not FilmTrendBucket.objects.exists()
+
+    assert FilmTrendBucket.objects.get(film=film).ratings == 1
+
+
+@pytest.mark.django_db
+def test_missing_films_get_no_bucket():
+    record([999], "ratings")
+    assert not FilmTrendBucket.objects.exists()
+
+
+@pytest.mark.django_db
+def test_counter_failures_do_not_fail_writes(
+    client, monkeypatch, caplog, django_capture_on_commit_callbacks
+):
+    def fail(*args, **kwargs):
+        raise DatabaseError("trending is down")
+
+    monkeypatch.setattr(trending, "record", fail)
+    film = Film.objects.create(
+        title="Alien", description="", release_date=date(1979, 5, 25)
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(
+            "/ratings/", {"content_type": "film", "object_id": film.pk, "score": 4}
+        )
+    assert response.status_code == 201
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(f"/favorites/{film.pk}/add/")
+    assert response.status_code == 200
+
+    assert Rating.objects.filter(object_id=film.pk).exists()
+    assert film.favorited_by.exists()
+    errors = [record for record in caplog.records if record.levelname == "ERROR"]
+    assert len(errors) == 2
@@ -1,6 +1,12 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 
-from .views import (AuthorViewSet, FavoriteViewSet, FilmViewSet, RatingViewSet,
+from .views import (AuthorAsyncDetailView, AuthorAsyncListView, AuthorViewSet,
+                    AutocompleteView, CatalogueExportView,
+                    DirectorStatsViewSet, FavoriteViewSet, FilmAsyncDetailView,
+                    FilmAsyncListView, FilmGenreStatsViewSet, FilmViewSet,
+                    FilmYearStatsViewSet, MetricsView, MirroredImageView,
+                    RatingDistributionStatsViewSet, RatingViewSet,
                     SpectatorViewSet)
 
 router = DefaultRouter()
@@ -9,5 +15,32 @@ router.register(r"films", FilmViewSet, basename="film")
 router.register(r"spectators", SpectatorViewSet, basename="spectator")
 router.register(r"favorites", FavoriteViewSet, basename="favorite")
 router.register(r"ratings", RatingViewSet, basename="rating")
+router.register(r"stats/years", FilmYearStatsViewSet, basename="stats-year")
+router.register(r"stats/genres", FilmGenreStatsViewSet, basename="stats-genre")
+router.register(r"stats/directors", DirectorStatsViewSet, basename="stats-director")
+router.register(
+    r"stats/ratings", RatingDistributionStatsViewSet, basename="stats-rating"
+)
 
-urlpatterns = router.urls
+urlpatterns = router.urls + [
+    path("async/films/", FilmAsyncListView.as_view(), name="film-async-list"),
+    path(
+        "async/films/<int:pk>/",
+        FilmAsyncDetailView.as_view(),
+        name="film-async-detail",
+    ),
+    path("async/authors/", AuthorAsyncListView.as_view(), name="author-async-list"),
+    path(
+        "async/authors/<int:pk>/",
+        AuthorAsyncDetailView.as_view(),
+        name="author-async-detail",
+    ),
+    path(
+        "export/<slug:table>.<slug:fmt>",
+        CatalogueExportView.as_view(),
+        name="catalogue-export",
+    ),
+    path("metrics", MetricsView.as_view(), name="metrics"),
+    path("autocomplete/", AutocompleteView.as_view(), name="autocomplete"),
+    path("images/<path:name>", MirroredImageView.as_view(), name="mirrored-image"),
+]
@@ -1,15 +1,338 @@
-from django.db.models import Count
+import mimetypes
+from secrets import compare_digest
+from typing import Any, List, NamedTuple
+
+from accounts import user_cache
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.contenttypes.prefetch import GenericPrefetch
+from django.core.exceptions import FieldDoesNotExist
+from django.core.files.storage import default_storage
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.db.models import Count, Exists, F, OuterRef, Prefetch, Q
+from django.http import (FileResponse, Http404, HttpResponse,
+                         HttpResponseNotModified, JsonResponse,
+                         StreamingHttpResponse)
 from django.utils.dateparse import parse_date
-from rest_framework import status, viewsets
+from django.utils.functional import cached_property
+from django.views import View
+from rest_framework import serializers, status, viewsets
 from rest_framework.decorators import action
-from rest_framework.permissions import (IsAuthenticated,
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import (IsAdminUser, IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework.views import APIView
 
-from .models import Author, Film, Rating, Spectator
+from .instrumentation import get_config, registry
+from .models import (Author, DirectorStats, Film, FilmGenreStats,
+                     FilmYearStats, Rating, RatingDistributionStats, Spectator)
+from .parsers import NDJSONParser, ORJSONParser
 from .serializers import (AuthorDetailSerializer, AuthorSerializer,
-                          FilmDetailSerializer, FilmSerializer,
-                          RatingSerializer, SpectatorSerializer)
+                          DirectorStatsSerializer, FilmDetailSerializer,
+                          FilmGenreStatsSerializer, FilmSerializer,
+                          FilmYearStatsSerializer,
+                          RatingDistributionStatsSerializer, RatingSerializer,
+                          SpectatorSerializer, sparse_fields)
+from .services.autocomplete import autocomplete
+from .services.avatars import schedule_avatar
+from .services.catalogue_export import EXPORT_COLUMNS, FORMATS, stream_export
+from .services.facets import film_facets, parse_facets
+from .services.film_import import import_films
+from .services.image_mirror import NAME_RE
+from .services.snapshot import get_snapshot
+from .services.stats import schedule_refresh
+from .services.trending import get_trending
+
+# Authors' film counts leave archived films out, like film lists do.
+LIVE_FILM_COUNT = Count("films", filter=Q(films__archived=False))
+
+
+def film_queryset(params):
+    """
+    Return the films to read from: live films only, unless
+    ``?include_archived=1`` asks for archived ones too.
+    """
+    if params.get("include_archived", "").lower() in ("true", "1"):
+        return Film.all_objects.all()
+    return Film.objects.all()
+
+
+FILM_ORDERING_FIELDS = (
+    "id",
+    "title",
+    "release_date",
+    "created_at",
+    "budget",
+    "box_office",
+)
+# NULL amounts sort last ascending and first descending on every backend,
+# as on PostgreSQL and in the catalogue snapshot.
+NULLABLE_ORDERING_FIELDS = ("budget", "box_office")
+
+
+class FilmFilters(NamedTuple):
+    """Validated film list parameters: filter conditions and ordering."""
+
+    conditions: List[Any]
+    ordering: List[str]
+
+
+def _csv_param(params, name):
+    """Comma-separated values of a query parameter, blanks dropped."""
+    return [value.strip() for value in params.get(name, "").split(",") if value.strip()]
+
+
+def _choice_param(params, name, choices):
+    """Values of a multi-valued choice parameter, matched case-insensitively."""
+    by_lower = {choice.lower(): choice for choice in choices}
+    values = []
+    for value in _csv_param(params, name):
+        if value.lower() not in by_lower:
+            raise ValidationError(
+                {name: f"Unknown value {value!r}, expected {', '.join(choices)}."}
+            )
+        values.append(by_lower[value.lower()])
+    return values
+
+
+def _int_param(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError({name: "Expected an integer."})
+
+
+def compile_film_filters(params):
+    """
+    Validate the film list query parameters (raising ValidationError) and
+    compile them into FilmFilters. Genre and author filters are EXISTS
+    subqueries over the through tables, so a film matching several values
+    is neither joined nor duplicated and no DISTINCT is needed.
+    """
+    conditions = []
+    date_filters = [
+        ("created_at_after", "created_at__date__gte"),
+        ("created_at_before", "created_at__date__lte"),
+        ("release_date_after", "release_date__gte"),
+        ("release_date_before", "release_date__lte"),
+    ]
+    for param, lookup in date_filters:
+        value = params.get(param)
+        if value:
+            parsed = parse_date(value)
+            if parsed is None:
+                raise ValidationError({param: "Expected a YYYY-MM-DD date."})
+            conditions.append(Q(**{lookup: parsed}))
+
+    ratings = _choice_param(params, "rating", Film.RatingChoices.values)
+    if ratings:
+        conditions.append(Q(rating__in=ratings))
+    statuses = _choice_param(params, "status", Film.StatusChoices.values)
+    if statuses:
+        conditions.append(Q(status__in=statuses))
+
+    source = params.get("source")
+    if source == "admin":
+        conditions.append(Q(tmdb_id__isnull=True))
+    elif source == "tmdb":
+        conditions.append(Q(tmdb_id__isnull=False))
+
+    genres = _csv_param(params, "genre")
+    if genres:
+        # Genres by id or by name.
+        ids = [int(genre) for genre in genres if genre.isdigit()]
+        names = [genre for genre in genres if not genre.isdigit()]
+        match = Q(genre_id__in=ids) if ids else Q()
+        if names:
+            match |= Q(genre__name__in=names)
+        conditions.append(
+            Exists(Film.genres.through.objects.filter(match, film_id=OuterRef("pk")))
+        )
+    authors = _csv_param(params, "author")
+    if authors:
+        if not all(author.isdigit() for author in authors):
+            raise ValidationError({"author": "Expected author ids."})
+        conditions.append(
+            Exists(
+                Film.authors.through.objects.filter(
+                    film_id=OuterRef("pk"), author_id__in=[int(a) for a in authors]
+                )
+            )
+        )
+
+    for field in ("budget", "box_office"):
+        for suffix, lookup in (("min", "gte"), ("max", "lte")):
+            value = _int_param(params, f"{field}_{suffix}")
+            if value is not None:
+                conditions.append(Q(**{f"{field}__{lookup}": value}))
+
+    ordering = _csv_param(params, "ordering")
+    for name in ordering:
+        if name.lstrip("-") not in FILM_ORDERING_FIELDS:
+            raise ValidationError(
+                {
+                    "ordering": f"Cannot order by {name!r}, expected one of "
+                    f"{', '.join(FILM_ORDERING_FIELDS)} (- for descending)."
+                }
+            )
+    if not ordering:
+        # The snapshot's order: pages must not shift when it goes stale.
+        ordering = ["id"]
+    elif not {"id", "-id"} & set(ordering):
+        # Ties broken by id, for stable pages.
+        ordering.append("id")
+    return FilmFilters(conditions, ordering)
+
+
+def _order_expression(name):
+    field = name.lstrip("-")
+    if field not in NULLABLE_ORDERING_FIELDS:
+        return name
+    if name.startswith("-"):
+        return F(field).desc(nulls_first=True)
+    return F(field).asc(nulls_last=True)
+
+
+def filter_films(qs, params, filters=None):
+    """
+    Apply the film list query parameters to a Film queryset. Pass the
+    FilmFilters already compiled for the request, if any.
+    """
+    conditions, ordering = filters or compile_film_filters(params)
+    if conditions:
+        qs = qs.filter(*conditions)
+    return qs.order_by(*map(_order_expression, ordering))
+
+
+def filter_authors(qs, params):
+    """Apply the author list query parameters to an annotated Author queryset."""
+    has = params.get("has_films")
+    if has is not None:
+        val = has.lower()
+        if val in ("true", "1"):
+            qs = qs.filter(film_count__gt=0)
+        elif val in ("false", "0"):
+            qs = qs.filter(film_count__exact=0)
+    source = params.get("source")
+    if source == "admin":
+        qs = qs.filter(tmdb_id__isnull=True)
+    elif source == "tmdb":
+        qs = qs.filter(tmdb_id__isnull=False)
+    return qs
+
+
+def filter_ratings(qs, params, user):
+    """
+    Scope a Rating queryset to one slice, each served by an index:
+    - ``?spectator={id}``: that spectator's ratings;
+    - ``?content_type=film|author&object_id={id}``: ratings of one target;
+    - otherwise the requesting user's ratings (``?mine=1``, the default).
+      Staff can pass ``?mine=0`` to list every rating.
+    Raises ValidationError on invalid parameters.
+    """
+    rated_models = {"film": Film, "author": Author}
+    content_type = params.get("content_type")
+    if content_type is not None:
+        if content_type not in rated_models:
+            raise ValidationError({"content_type": "Expected film or author."})
+        # get_for_model() is cached: no extra query and no join.
+        ct = ContentType.objects.get_for_model(rated_models[content_type])
+        qs = qs.filter(content_type=ct)
+    object_id = _int_param(params, "object_id")
+    if object_id is not None:
+        qs = qs.filter(object_id=object_id)
+    spectator = _int_param(params, "spectator")
+    if spectator is not None:
+        return qs.filter(spectator_id=spectator)
+
+    mine = params.get("mine", "1").lower()
+    if mine not in ("true", "1", "false", "0"):
+        raise ValidationError({"mine": "Expected 1 or 0."})
+    target = content_type is not None and object_id is not None
+    if target or (mine in ("false", "0") and user_cache.is_staff(user)):
+        return qs
+    return qs.filter(spectator_id=user.pk)
+
+
+def shape_queryset(qs, serializer, extra_columns=()):
+    """
+    Restrict a queryset to what a (possibly trimmed) serializer reads:
+    only() on its columns, select_related() on the foreign keys it follows
+    and prefetch_related() on its many-to-many fields, read through the
+    related model's ``objects`` manager (so archived films are skipped).
+    """
+    columns, related, prefetches = list(extra_columns), [], []
+    for field in serializer.fields.values():
+        name = field.source.split(".")[0]
+        try:
+            model_field = qs.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        if model_field.many_to_many or model_field.one_to_many:
+            prefetches.append(
+                Prefetch(name, queryset=model_field.related_model.objects.all())
+            )
+        elif model_field.concrete:
+            columns.append(name)
+            if model_field.many_to_one and not isinstance(
+                field, serializers.PrimaryKeyRelatedField
+            ):
+                related.append(name)
+    qs = qs.only(*columns)
+    if related:
+        qs = qs.select_related(*related)
+    if prefetches:
+        qs = qs.prefetch_related(*prefetches)
+    return qs
+
+
+def parse_ids(params, limit):
+    """
+    Distinct ids of ``?ids=``, in the requested order, or None without it.
+    Raises ValidationError on non-integer ids or more than ``limit`` of them.
+    """
+    if "ids" not in params:
+        return None
+    values = _csv_param(params, "ids")
+    if not all(value.isdigit() for value in values):
+        raise ValidationError({"ids": "Expected comma-separated ids."})
+    ids = list(dict.fromkeys(int(value) for value in values))
+    if len(ids) > limit:
+        raise ValidationError({"ids": f"At most {limit} ids per request."})
+    return ids
+
+
+class MultiGetMixin:
+    """
+    ``GET /<objects>/?ids=1,2,3`` on a list: the ``detail_serializer_class``
+    payload of each object, in the requested order, read in one shaped
+    query like a retrieve, and the ids matching no object under ``missing``.
+    """
+
+    detail_serializer_class = None
+
+    def multi_get(self, ids):
+        context = self.get_serializer_context()
+        serializer_class = self.detail_serializer_class
+        queryset = shape_queryset(
+            self.get_queryset(), serializer_class(context=context)
+        )
+        found = queryset.in_bulk(ids)
+        return Response(
+            {
+                "results": serializer_class(
+                    [found[pk] for pk in ids if pk in found],
+                    many=True,
+                    context=context,
+                ).data,
+                "missing": [pk for pk in ids if pk not in found],
+            }
+        )
 
 
 class SpectatorViewSet(viewsets.ModelViewSet):
@@ -22,8 +345,28 @@ class SpectatorViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     http_method_names = ["get", "post", "patch", "delete"]
 
+    def initialize_request(self, request, *args, **kwargs):
+        # Uploads are spooled to a temporary file that the storage moves in
+        # place, never held in memory.
+        request.upload_handlers = [TemporaryFileUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
+
+    def perform_create(self, serializer):
+        serializer.save()
+        schedule_avatar(serializer.instance)
+
+    def perform_update(self, serializer):
+        if "avatar" not in serializer.validated_data:
+            serializer.save()
+            return
+        # Thumbnails are rendered in the background, after the commit; those
+        # of the replaced avatar are deleted then.
+        replaced = list(serializer.instance.avatar_thumbnails.values())
+        serializer.save(avatar_thumbnails={})
+        schedule_avatar(serializer.instance, replaced)
 
-class FilmViewSet(viewsets.ModelViewSet):
+
+class FilmViewSet(MultiGetMixin, viewsets.ModelViewSet):
     """
     Viewset for managing films.
     """
@@ -31,57 +374,139 @@ class FilmViewSet(viewsets.ModelViewSet):
     queryset = Film.objects.all()
     permission_classes = [IsAuthenticatedOrReadOnly]
     http_method_names = ["get", "post", "patch", "delete"]
+    token_user_reads = True
+    detail_serializer_class = FilmDetailSerializer
 
     def get_serializer_class(self):
         if self.action == "retrieve":
             return FilmDetailSerializer
         return FilmSerializer
 
-    def get_queryset(self):
-        qs = super().get_queryset()
+    @cached_property
+    def film_filters(self):
+        """The request's film list parameters, validated and compiled once."""
+        return compile_film_filters(self.request.query_params)
+
+    def catalogue_snapshot(self):
+        """
+        The catalogue snapshot, when it can answer this read: it holds live
+        films only (see services.snapshot).
+        """
         params = self.request.query_params
+        if params.get("include_archived", "").lower() in ("true", "1"):
+            return None
+        return get_snapshot()
 
-        date_filters = [
-            ("created_at_after", "created_at__date__gte"),
-            ("created_at_before", "created_at__date__lte"),
-            ("release_date_after", "release_date__gte"),
-            ("release_date_before", "release_date__lte"),
-        ]
-        for param, lookup in date_filters:
-            value = params.get(param)
-            if value:
-                parsed = parse_date(value)
-                if parsed:
-                    qs = qs.filter(**{lookup: parsed})
-        rating = params.get("rating")
-        if rating in {choice.value for choice in Film.RatingChoices}:
-            qs = qs.filter(rating=rating)
-
-        status = params.get("status")
-        if status in {choice.value for choice in Film.StatusChoices}:
-            qs = qs.filter(status=status)
-        source = self.request.query_params.get("source")
-        if source == "admin":
-            qs = qs.filter(tmdb_id__isnull=True)
-        elif source == "tmdb":
-            qs = qs.filter(tmdb_id__isnull=False)
+    def get_queryset(self):
+        params = self.request.query_params
+        qs = filter_films(film_queryset(params), params, self.film_filters)
+        if self.action == "retrieve" and self.request.method == "GET":
+            qs = shape_queryset(qs, self.get_serializer())
         return qs
 
+    def list(self, request, *args, **kwargs):
+        """
+        List films from .values() rows through the serializer fast path.
+        ``?facets=status,rating,genre,year`` adds the counts of the matching
+        films per value of each facet to the page; ``?ids=`` multi-gets.
+        """
+        ids = parse_ids(request.query_params, settings.MULTI_GET_MAX_IDS)
+        if ids is not None:
+            return self.multi_get(ids)
+        try:
+            facets = parse_facets(request.query_params.get("facets", ""))
+        except ValueError as exc:
+            raise ValidationError({"facets": str(exc)}) from exc
+        fields = sparse_fields(request, FilmSerializer.values_fields)
+        snapshot = None if facets else self.catalogue_snapshot()
+        if snapshot is not None:
+            rows = snapshot.select(request.query_params, self.film_filters.ordering)
+            page = self.paginate_queryset(rows)
+            if page is None:
+                return Response(snapshot.films(rows, fields))
+            return self.get_paginated_response(snapshot.films(page, fields))
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset.values(*fields)
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return Response(FilmSerializer.from_values(rows, fields))
+        response = self.get_paginated_response(FilmSerializer.from_values(page, fields))
+        if facets:
+            response.data["facets"] = film_facets(
+                queryset, facets, request.query_params
+            )
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Serve the film from the catalogue snapshot when there is one (and no
+        list filter applies); the database answers anything it lacks.
+        """
+        pk = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        snapshot = self.catalogue_snapshot()
+        if snapshot is not None and pk.isdigit() and not self.film_filters.conditions:
+            payload = snapshot.film_detail(int(pk))
+            if payload is not None:
+                return Response(
+                    {name: payload[name] for name in sparse_fields(request, payload)}
+                )
+        return super().retrieve(request, *args, **kwargs)
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk",
+        parser_classes=[ORJSONParser, NDJSONParser],
+    )
+    def bulk(self, request):
+        """
+        Create or update (by tmdb_id) many films at once from a JSON array
+        or an NDJSON body. Invalid rows are reported without aborting the
+        batch.
+        """
+        if not isinstance(request.data, list):
+            return Response(
+                {"detail": "Expected a JSON array or an NDJSON body."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        result = import_films(request.data)
+        if result["created"] or result["updated"]:
+            schedule_refresh()
+        return Response(result, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"])
+    def trending(self, request):
+        """
+        Films with the most new ratings and favorites lately, recent hours
+        weighing more, from the list cached by services.trending.
+        """
+        films = get_trending()
+        limit = request.query_params.get("limit")
+        if limit is not None:
+            if not limit.isdigit():
+                return Response(
+                    {"detail": "limit must be a positive integer."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            films = films[: int(limit)]
+        return Response(films)
+
     @action(detail=True, methods=["post"], url_path="archive")
     def archive(self, request, pk=None):
         """
         Archive a film by setting its archived field to True.
         """
         try:
-            film = self.get_object()
+            film = Film.all_objects.get(pk=pk)
+            self.check_object_permissions(request, film)
             film.archived = True
-            film.save()
+            film.save(update_fields=["archived"])
             return Response({"detail": "Film archived successfully."}, status=200)
         except Film.DoesNotExist:
             return Response({"detail": "Film not found."}, status=404)
 
 
-class AuthorViewSet(viewsets.ModelViewSet):
+class AuthorViewSet(MultiGetMixin, viewsets.ModelViewSet):
     """
     Viewset for managing authors.
     """
@@ -89,6 +514,8 @@ class AuthorViewSet(viewsets.ModelViewSet):
     queryset = Author.objects.all()
     permission_classes = [IsAuthenticatedOrReadOnly]
     http_method_names = ["get", "post", "patch", "delete"]
+    token_user_reads = True
+    detail_serializer_class = AuthorDetailSerializer
 
     def get_serializer_class(self):
         if self.action == "retrieve":
@@ -103,21 +530,32 @@ class AuthorViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Retrieve authors with optional filtering by film count and source."""
-        qs = Author.objects.annotate(film_count=Count("films"))
-        has = self.request.query_params.get("has_films")
-        if has is not None:
-            val = has.lower()
-            if val in ("true", "1"):
-                qs = qs.filter(film_count__gt=0)
-            elif val in ("false", "0"):
-                qs = qs.filter(film_count__exact=0)
-        source = self.request.query_params.get("source")
-        if source == "admin":
-            qs = qs.filter(tmdb_id__isnull=True)
-        elif source == "tmdb":
-            qs = qs.filter(tmdb_id__isnull=False)
+        qs = filter_authors(
+            Author.objects.annotate(film_count=LIVE_FILM_COUNT),
+            self.request.query_params,
+        )
+        if self.action == "retrieve" and self.request.method == "GET":
+            qs = shape_queryset(qs, self.get_serializer())
         return qs
 
+    def list(self, request, *args, **kwargs):
+        """
+        List authors from .values() rows through the serializer fast path;
+        ``?ids=`` multi-gets.
+        """
+        ids = parse_ids(request.query_params, settings.MULTI_GET_MAX_IDS)
+        if ids is not None:
+            return self.multi_get(ids)
+        fields = sparse_fields(request, AuthorSerializer.Meta.fields)
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset.values(*AuthorSerializer.values_columns(fields))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(
+                AuthorSerializer.from_values(page, fields)
+            )
+        return Response(AuthorSerializer.from_values(rows, fields))
+
     def destroy(self, request, *args, **kwargs):
         """Override destroy to prevent deletion if the author has associated films."""
         author = self.get_object()
@@ -131,11 +569,13 @@ class AuthorViewSet(viewsets.ModelViewSet):
 
 class FavoriteViewSet(viewsets.ViewSet):
     permission_classes = [IsAuthenticated]
+    token_user_reads = True
 
     def list(self, request):
-        favorites = request.user.favorites.all()
-        serializer = FilmSerializer(favorites, many=True)
-        return Response(serializer.data)
+        favorites = Film.objects.filter(favorited_by=request.user.pk).values(
+            *FilmSerializer.values_fields
+        )
+        return Response(FilmSerializer.from_values(favorites))
 
     @action(detail=True, methods=["post"])
     def add(self, request, pk=None):
@@ -150,7 +590,7 @@ class FavoriteViewSet(viewsets.ViewSet):
     @action(detail=True, methods=["post"])
     def remove(self, request, pk=None):
         try:
-            film = Film.objects.get(pk=pk)
+            film = Film.all_objects.get(pk=pk)
             request.user.favorites.remove(film)
             return Response({"detail": "Movie deleted from favorites"}, status=200)
         except Film.DoesNotExist:
@@ -161,6 +601,32 @@ class RatingViewSet(viewsets.ModelViewSet):
     queryset = Rating.objects.all()
     serializer_class = RatingSerializer
     permission_classes = [IsAuthenticated]
+    token_user_reads = True
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.action == "list":
+            qs = filter_ratings(qs, self.request.query_params, self.request.user)
+        elif self.action in ("update", "partial_update", "destroy"):
+            qs = qs.filter(spectator_id=self.request.user.pk)
+        if self.request.method == "GET":
+            serializer = self.get_serializer()
+            if "target" in serializer.fields:
+                # One query per content type instead of one per rating.
+                qs = shape_queryset(
+                    qs, serializer, extra_columns=["content_type", "object_id"]
+                ).prefetch_related(
+                    GenericPrefetch(
+                        "content_object",
+                        [
+                            Film.all_objects.only("id", "title", "release_date"),
+                            Author.objects.only("id", "name"),
+                        ],
+                    )
+                )
+            else:
+                qs = shape_queryset(qs, serializer)
+        return qs
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -183,3 +649,239 @@ class RatingViewSet(viewsets.ModelViewSet):
         out_serializer = self.get_serializer(rating)
         status_code = status.HTTP_201_CREATED if created else status.HTTP_200_OK
         return Response(out_serializer.data, status=status_code)
+
+
+# ——— Statistics (precomputed, see services.stats) —————————————————————————
+
+
+class FilmYearStatsViewSet(viewsets.ReadOnlyModelViewSet):
+    """Box-office and budget totals and ROI per release year."""
+
+    queryset = FilmYearStats.objects.all()
+    serializer_class = FilmYearStatsSerializer
+    token_user_reads = True
+
+
+class FilmGenreStatsViewSet(viewsets.ReadOnlyModelViewSet):
+    """Box-office and budget totals and ROI per genre."""
+
+    queryset = FilmGenreStats.objects.all()
+    serializer_class = FilmGenreStatsSerializer
+    token_user_reads = True
+
+
+class DirectorStatsViewSet(viewsets.ReadOnlyModelViewSet):
+    """Box-office and budget totals and ROI per director."""
+
+    queryset = DirectorStats.objects.all()
+    serializer_class = DirectorStatsSerializer
+    token_user_reads = True
+
+
+class RatingDistributionStatsViewSet(viewsets.ReadOnlyModelViewSet):
+    """Film counts and spectator scores per film rating and status."""
+
+    queryset = RatingDistributionStats.objects.all()
+    serializer_class = RatingDistributionStatsSerializer
+    token_user_reads = True
+
+
+class CatalogueExportView(APIView):
+    """
+    Stream a whole catalogue table (films, authors, genres, ratings) as
+    NDJSON or CSV, in id order, optionally gzipped and resumable with
+    ?after=<last seen id>.
+    """
+
+    permission_classes = [IsAdminUser]
+    content_types = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+    def get(self, request, table, fmt):
+        if table not in EXPORT_COLUMNS or fmt not in FORMATS:
+            return Response(
+                {"detail": "Unknown export."}, status=status.HTTP_404_NOT_FOUND
+            )
+        after = request.query_params.get("after")
+        if after is not None:
+            try:
+                after = int(after)
+            except ValueError:
+                return Response(
+                    {"detail": "after must be an integer id."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        compress = request.query_params.get("gzip", "").lower() in ("true", "1")
+
+        filename = f"{table}.{fmt}"
+        content_type = self.content_types[fmt]
+        if compress:
+            filename += ".gz"
+            content_type = "application/gzip"
+        response = StreamingHttpResponse(
+            stream_export(table, fmt, after=after, compress=compress),
+            content_type=content_type,
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class MetricsView(View):
+    """
+    Per-view request metrics in the Prometheus text format. Only served
+    while instrumentation is enabled; guarded by METRICS_TOKEN when set.
+    """
+
+    def get(self, request):
+        config = get_config()
+        if not config["ENABLED"]:
+            return JsonResponse({"detail": "Not found."}, status=404)
+        token = config["METRICS_TOKEN"]
+        if token and not compare_digest(
+            request.headers.get("Authorization", ""), f"Bearer {token}"
+        ):
+            return JsonResponse({"detail": "Invalid metrics token."}, status=401)
+        return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4")
+
+
+class MirroredImageView(View):
+    """
+    Serve a mirrored TMDb image. Names are content hashes: a name always
+    designates the same bytes, so responses are cacheable forever.
+    """
+
+    cache_control = "public, max-age=31536000, immutable"
+
+    def get(self, request, name):
+        if not NAME_RE.fullmatch(name) or not default_storage.exists(name):
+            raise Http404("Unknown image.")
+        etag = f'"{name.rsplit("/", 1)[-1].split(".")[0]}"'
+        if request.headers.get("If-None-Match") == etag:
+            response = HttpResponseNotModified()
+        else:
+            response = FileResponse(
+                default_storage.open(name), content_type=mimetypes.guess_type(name)[0]
+            )
+        response["ETag"] = etag
+        response["Cache-Control"] = self.cache_control
+        return response
+
+
+class AutocompleteView(View):
+    """
+    Typeahead: ``?q=`` matches the start of any word of film titles and
+    author names, most popular first, ``?limit=`` results at most.
+    """
+
+    def get(self, request):
+        try:
+            limit = _int_param(request.GET, "limit")
+        except ValidationError as exc:
+            return JsonResponse(exc.detail, status=400)
+        if limit is not None and limit < 1:
+            return JsonResponse({"limit": "Expected a positive integer."}, status=400)
+        query = request.GET.get("q", "").strip()
+        return JsonResponse({"results": autocomplete(query, limit) if query else []})
+
+
+# ——— Async read path (ASGI) ——————————————————————————————————————————————————
+
+
+async def apaginate(request, queryset, serializer_class):
+    """
+    Paginate a queryset with the async ORM and return a DRF-shaped page.
+    Relations used by the serializer must be prefetched on the queryset.
+    """
+    page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+    try:
+        page = int(request.GET.get("page", 1))
+    except ValueError:
+        page = 0
+    if page < 1:
+        return JsonResponse({"detail": "Invalid page."}, status=404)
+
+    if not queryset.ordered:
+        queryset = queryset.order_by("pk")
+    count = await queryset.acount()
+    offset = (page - 1) * page_size
+    if offset and offset >= count:
+        return JsonResponse({"detail": "Invalid page."}, status=404)
+    end = offset + page_size
+    rows = [obj async for obj in queryset[offset:end]]
+
+    url = request.build_absolute_uri()
+    next_url = None
+    if end < count:
+        next_url = replace_query_param(url, "page", page + 1)
+    previous_url = None
+    if page == 2:
+        previous_url = remove_query_param(url, "page")
+    elif page > 2:
+        previous_url = replace_query_param(url, "page", page - 1)
+
+    return JsonResponse(
+        {
+            "count": count,
+            "next": next_url,
+            "previous": previous_url,
+            "results": serializer_class(rows, many=True).data,
+        }
+    )
+
+
+async def aretrieve(queryset, pk, serializer_class):
+    """Fetch a single object with the async ORM and serialize it."""
+    try:
+        obj = await queryset.aget(pk=pk)
+    except queryset.model.DoesNotExist:
+        return JsonResponse(
+            {"detail": f"No {queryset.model.__name__} matches the given query."},
+            status=404,
+        )
+    return JsonResponse(serializer_class(obj).data)
+
+
+class FilmAsyncListView(View):
+    """
+    Async read-only film listing, same filters and payload as GET /films/.
+    """
+
+    async def get(self, request):
+        try:
+            qs = filter_films(film_queryset(request.GET), request.GET)
+        except ValidationError as exc:
+            return JsonResponse(exc.detail, status=400)
+        return await apaginate(request, qs, FilmSerializer)
+
+
+class FilmAsyncDetailView(View):
+    """
+    Async read-only film detail, same payload as GET /films/{id}/.
+    """
+
+    async def get(self, request, pk):
+        qs = film_queryset(request.GET).prefetch_related("authors", "genres")
+        return await aretrieve(qs, pk, FilmDetailSerializer)
+
+
+class AuthorAsyncListView(View):
+    """
+    Async read-only author listing, same filters and payload as GET /authors/.
+    """
+
+    async def get(self, request):
+        qs = filter_authors(
+            Author.objects.annotate(film_count=LIVE_FILM_COUNT), request.GET
+        ).prefetch_related(Prefetch("films", queryset=Film.objects.all()))
+        return await apaginate(request, qs, AuthorSerializer)
+
+
+class AuthorAsyncDetailView(View):
+    """
+    Async read-only author detail, same payload as GET /authors/{id}/.
+    """
+
+    async def get(self, request, pk):
+        qs = Author.objects.prefetch_related(
+            Prefetch("films", queryset=Film.objects.all())
+        )
+        return await aretrieve(qs, pk, AuthorDetailSerializer)
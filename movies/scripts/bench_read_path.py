@@ -0,0 +1,87 @@
+"""
+Throughput benchmark for the read path (sync WSGI vs async ASGI).
+
+Start the same project twice with the same number of workers, e.g.:
+
+    gunicorn cinema.wsgi:application --workers 4 --bind 127.0.0.1:8001
+    uvicorn cinema.asgi:application --workers 4 --port 8002
+
+then compare the sync and async endpoints:
+
+    python scripts/bench_read_path.py http://127.0.0.1:8001/films/
+    python scripts/bench_read_path.py http://127.0.0.1:8002/async/films/
+
+Results are printed as a single JSON object so runs can be diffed.
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+def run_client(url, deadline, latencies, errors, lock):
+    """Issue requests on one keep-alive session until the deadline."""
+    session = requests.Session()
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            resp = session.get(url, timeout=30)
+            ok = resp.status_code == 200
+        except requests.RequestException:
+            ok = False
+        elapsed = time.perf_counter() - start
+        with lock:
+            if ok:
+                latencies.append(elapsed)
+            else:
+                errors.append(elapsed)
+
+
+def percentile_ms(values, pct):
+    """Return the pct-th percentile of a sorted list of seconds, in ms."""
+    if not values:
+        return None
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return round(values[index] * 1000, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("url", help="endpoint to benchmark")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds")
+    args = parser.parse_args()
+
+    latencies, errors, lock = [], [], threading.Lock()
+    deadline = time.perf_counter() + args.duration
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for _ in range(args.concurrency):
+            pool.submit(run_client, args.url, deadline, latencies, errors, lock)
+
+    latencies.sort()
+    result = {
+        "url": args.url,
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": round(len(latencies) / args.duration, 2),
+        "latency_ms": {
+            "mean": (
+                round(statistics.fmean(latencies) * 1000, 2) if latencies else None
+            ),
+            "p50": percentile_ms(latencies, 50),
+            "p95": percentile_ms(latencies, 95),
+            "p99": percentile_ms(latencies, 99),
+        },
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""
+Benchmark suite for the API hot paths and TMDb ingestion.
+
+Creates a throwaway test database, seeds it with a synthetic catalogue at
+the requested scale, then times each case in-process with Django's test
+client (no network, no web server):
+
+    python scripts/bench_suite.py --scale 10k --output bench-10k.json
+    python scripts/bench_suite.py --scale 100k --keepdb --compare bench-10k.json
+
+Results are written as JSON (per case: latency percentiles and query
+count, plus the git commit and scale) so runs can be compared across
+commits. ``--keepdb`` keeps the seeded database between runs; the
+fill_db case empties the catalogue, so skip it with ``--skip-fill-db``
+to reuse the seed.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from io import StringIO
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "cinema.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from accounts.models import Spectator  # noqa: E402
+from django.conf import settings  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.runner import DiscoverRunner  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from manage_movies.models import Film, Rating  # noqa: E402
+from manage_movies.services import synthetic_data  # noqa: E402
+from manage_movies.services.tmdb_stub import TMDbStub, running_stub  # noqa: E402
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+READ_CASES = [
+    ("films_list", "/films/"),
+    ("films_rating", "/films/?rating=Good"),
+    ("films_ratings", "/films/?rating=Good,Excellent"),
+    ("films_genre", "/films/?genre=Drama"),
+    ("films_genre_budget", "/films/?genre=Action,Drama&budget_min=1000000"),
+    ("films_ordered", "/films/?ordering=-release_date"),
+    ("films_status", "/films/?status=Released"),
+    ("films_source", "/films/?source=admin"),
+    ("films_released_after", "/films/?release_date_after=2000-01-01"),
+    ("films_created_after", "/films/?created_at_after=2000-01-01"),
+    ("films_middle_page", "/films/?page={middle_page}"),
+    ("film_detail", "/films/{film_id}/"),
+    ("authors_has_films", "/authors/?has_films=true"),
+    ("authors_without_films", "/authors/?has_films=false"),
+    ("favorites_list", "/favorites/"),
+    ("ratings_list", "/ratings/"),
+]
+
+
+# ——— Measurements ————————————————————————————————————————————————————————————
+
+
+def percentile(values, pct):
+    """Return the pct-th percentile of a sorted list."""
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def summarize(durations, queries):
+    """Summarize a list of durations (seconds) in milliseconds."""
+    durations = sorted(durations)
+    return {
+        "iterations": len(durations),
+        "queries": queries,
+        "mean_ms": round(statistics.fmean(durations) * 1000, 3),
+        "min_ms": round(durations[0] * 1000, 3),
+        "p50_ms": round(percentile(durations, 50) * 1000, 3),
+        "p95_ms": round(percentile(durations, 95) * 1000, 3),
+    }
+
+
+def measure(call, iterations, warmup):
+    """Time ``call(i)``; queries are counted on the first timed call."""
+    for i in range(warmup):
+        call(i)
+    with CaptureQueriesContext(connection) as captured:
+        call(warmup)
+    queries = len(captured)
+    durations = []
+    for i in range(warmup + 1, warmup + 1 + iterations):
+        start = time.perf_counter()
+        call(i)
+        durations.append(time.perf_counter() - start)
+    return summarize(durations, queries)
+
+
+def get(client, path):
+    """Return a callable GETting ``path`` and checking the status."""
+
+    def call(_):
+        response = client.get(path)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {path}: {response.status_code}")
+
+    return call
+
+
+def bench_reads(client, spectator, args):
+    """Time every read case."""
+    client.force_login(spectator)
+    page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+    values = {
+        "film_id": Film.objects.values_list("id", flat=True).first(),
+        "middle_page": max(1, Film.objects.count() // page_size // 2),
+    }
+    results = {}
+    for name, path in READ_CASES:
+        results[name] = measure(
+            get(client, path.format(**values)), args.iterations, args.warmup
+        )
+        print(f"{name}: {results[name]['p50_ms']} ms", file=sys.stderr)
+    return results
+
+
+def bench_rating_create(client, spectator, args):
+    """Time POST /ratings/, each call rating a film not rated before."""
+    Rating.objects.filter(spectator=spectator).delete()
+    total = args.iterations + args.warmup + 1
+    film_ids = list(Film.objects.order_by("-id").values_list("id", flat=True)[:total])
+    client.force_login(spectator)
+
+    def call(i):
+        response = client.post(
+            "/ratings/",
+            {"content_type": "film", "object_id": film_ids[i], "score": 4},
+            content_type="application/json",
+        )
+        if response.status_code not in (200, 201):
+            raise RuntimeError(f"POST /ratings/: {response.status_code}")
+
+    return measure(call, args.iterations, args.warmup)
+
+
+def bench_fill_db(args):
+    """Time fill_db against the local TMDb stub, films created per second."""
+    stub = TMDbStub(latency_ms=args.tmdb_latency_ms)
+    with running_stub(stub) as base_url:
+        os.environ["TMDB_BASE_URL"] = base_url
+        try:
+            start = time.perf_counter()
+            call_command("fill_db", skip_images=True, stdout=StringIO())
+            elapsed = time.perf_counter() - start
+        finally:
+            del os.environ["TMDB_BASE_URL"]
+    films = Film.all_objects.count()
+    return {
+        "iterations": 1,
+        "films": films,
+        "total_ms": round(elapsed * 1000, 3),
+        "films_per_s": round(films / elapsed, 2) if elapsed else None,
+    }
+
+
+# ——— Runner ——————————————————————————————————————————————————————————————————
+
+
+def git_commit():
+    """Return the current git commit, if any."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=BASE_DIR,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    """Print the p50 change of every case against a previous run."""
+    baseline = json.loads(Path(baseline_path).read_text())["results"]
+    print(f"{'case':<26}{'base p50':>12}{'p50':>12}{'change':>10}", file=sys.stderr)
+    for name, result in results.items():
+        before, after = baseline.get(name, {}).get("p50_ms"), result.get("p50_ms")
+        if before is None or after is None:
+            continue
+        change = f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+        print(f"{name:<26}{before:>12}{after:>12}{change:>10}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", choices=SCALES, default="10k")
+    parser.add_argument("--films", type=int, help="number of films, overrides --scale")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keepdb", action="store_true")
+    parser.add_argument("--skip-fill-db", action="store_true")
+    parser.add_argument(
+        "--tmdb-latency-ms", type=float, default=0, help="latency of the TMDb stub"
+    )
+    parser.add_argument("--output", help="write the JSON results to this file")
+    parser.add_argument("--compare", help="previous JSON results to compare with")
+    args = parser.parse_args()
+
+    setup_test_environment()
+    runner = DiscoverRunner(keepdb=args.keepdb, verbosity=0)
+    old_config = runner.setup_databases()
+    try:
+        films = args.films or SCALES[args.scale]
+        seeded = Film.all_objects.count()
+        if seeded < films:
+            start = time.perf_counter()
+            counts = synthetic_data.seed_catalogue(films - seeded, seed=args.seed)
+            elapsed = time.perf_counter() - start
+            print(f"seeded {counts} in {elapsed:.1f} s", file=sys.stderr)
+        spectator = Spectator.objects.filter(favorites__isnull=False).first()
+        client = Client()
+
+        results = bench_reads(client, spectator, args)
+        results["rating_create"] = bench_rating_create(client, spectator, args)
+        if not args.skip_fill_db:
+            results["fill_db"] = bench_fill_db(args)
+    finally:
+        if not args.keepdb:
+            runner.teardown_databases(old_config)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "scale": None if args.films else args.scale,
+            "films": films,
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "iterations": args.iterations,
+            "date": datetime.now(timezone.utc).isoformat(),
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    print(output)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()